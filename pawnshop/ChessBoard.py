@@ -1,18 +1,32 @@
 # ChessBoard.py
 
-import json
-import os
-from copy import deepcopy, copy
+from copy import copy
 from functools import wraps
 from typing import Union, List, Dict, Generator
 
 from .ChessVector import ChessVector
+from .Bitboards import Bitboards, iterSquares
+from .Geometry import Geometry, getGeometry
+from .MoveCache import MoveCache
+from .Zobrist import pieceKey, turnKey
 from .Pieces import *
 from .Moves import *
-from .configurations import ClassicConfig, FourPlayerConfig
-from .Utils import countAlpha, getResourcePath
+from .Variant import Variant, getVariant, _defaultConfig
+from .Utils import countAlpha
 from .Exceptions import *
 
+# Directions of lines through a king, used to find pinned pieces
+_lines = ((-1, 0), (1, 0), (0, 1), (0, -1), (-1, -1), (-1, 1), (1, 1), (1, -1))
+
+# Order of piece symbols in material signatures
+_signatureOrder = {symbol: i for i, symbol in enumerate("KQRBNP")}
+
+# Piece types whose attacks are known to follow their sliding flag
+_builtinPieces = (Pawn, Knight, Bishop, Rook, Queen, King)
+
+# Position vectors of every board size, by row
+_vectorRows = {}
+
 
 def _defaultColors(func):
     @wraps(func)
@@ -26,61 +40,152 @@ def _defaultColors(func):
     return wrapper
 
 
+def _pieceState(item) -> Union[tuple, None]:
+    """Snapshot the mutable move flags of a square item
+
+    :param item: Piece, Empty or Disabled object
+    :returns: (firstMove, passed, rank) of pieces, None for other items
+    :rtype: ``tuple`` or None
+    """
+    if isinstance(item, Piece):
+        return (item.firstMove, getattr(item, "passed", None), getattr(item, "rank", None))
+    return None
+
+
+def _restoreState(item, vec: ChessVector, state: Union[tuple, None]) -> None:
+    """Restore a snapshot taken by _pieceState()
+
+    :param item: Piece, Empty or Disabled object
+    :param vec: Position the item is restored to
+    :param state: Snapshot of the item flags
+    """
+    item.vector = vec
+    if state is not None:
+        item.firstMove, passed, rank = state
+        if passed is not None:
+            item.passed = passed
+        if rank is not None:
+            item.rank = rank
+
+
+class MoveRecord():
+    """Undo record of a move made with Board.makeMove()
+
+    Stores everything needed to take the move back:
+    the captured piece, the flags of every moved piece,
+    promotion, castling rook swap and eliminated colors.
+    The changes are stored as an ordered log of square operations.
+
+    :param piece: Moved piece
+    :param startVec: Starting position of moved piece
+    :param targetVec: Destination of moved piece
+    :param promote: Promotion type of move
+    :param turn: Current turn before the move
+    :param clocks: Halfmove clock and move number before the move
+    """
+
+    def __init__(self, piece: Piece, startVec: ChessVector, targetVec: ChessVector, promote, turn: str, clocks: tuple):
+        self.piece = piece
+        self.startVec = startVec
+        self.targetVec = targetVec
+        self.promote = promote
+        self.turn = turn
+        self.clocks = clocks
+        self.captured = None
+        self.passed = []
+        self.changes = []
+
+
 class Board():
     """Board object for storing and moving pieces
 
-    :param config: Board configuration (defaults to emtpy board)
+    :param config: Board configuration or Variant (defaults to emtpy board)
+    :param bitboards: Flag True to generate standard moves with bitboards (default is False)
+    :param moveCache: Number of move lists to cache by position, see getMoveCache() (default is 0, no cache)
     """
 
-    def __init__(self, config={}):
+    def __init__(self, config={}, bitboards=False, moveCache=0):
 
         self._board = []
-        with open(getResourcePath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "configurations/DefaultConfig.JSON")), "r") as default:
-            dConfig = json.load(default)
-
-            self._rows = config.get("rows") or dConfig.get("rows")
-            self._cols = config.get("cols") or dConfig.get("cols")
-            self._pieces = config.get("pieces") or dConfig.get("pieces")
-            self._moves = config.get("moves") or dConfig.get("moves")
-            self._promoteTo = config.get("promoteTo") or dConfig.get("promoteTo")
-            self._promoteFrom = config.get("promoteFrom") or dConfig.get("promoteFrom")
-            self._promoteAt = config.get("promoteAt") or dConfig.get("promteAt")
-            self._turnorder = config.get("turnorder") or dConfig.get("turnorder")
-
-            try:
-                self.currentTurn = self._turnorder[0]
-            except IndexError:
-                self.currentTurn = None
-            self._board = [[Empty(ChessVector((row, col))) for col in range(self._cols)] for row in range(self._rows)]
-
-            for color, pieceList in self._pieces.items():
-                for piece in pieceList:
-                    self[piece.vector] = piece
-
-            for vec in config.get("disabled") or dConfig.get("disabled"):
-                self[vec] = Disabled(vec)
+        self._bitboards = None
+        self._moveCache = MoveCache(moveCache) if moveCache else None
+        self._attacks = None
+        self._hash = 0
+        self._checksHash = None
+        self._matesHash = None
+        self._undoStack = []
+        self._record = None
+        if isinstance(config, Variant):
+            config = config.newConfig()
+        self._variant = config.get("variant")
+        dConfig = _defaultConfig()
+
+        self._rows = config.get("rows") or dConfig.get("rows")
+        self._cols = config.get("cols") or dConfig.get("cols")
+        self._pieces = config.get("pieces") or dConfig.get("pieces")
+        self._moves = config.get("moves") or dConfig.get("moves")
+        self._promoteTo = config.get("promoteTo") or dConfig.get("promoteTo")
+        self._promoteFrom = config.get("promoteFrom") or dConfig.get("promoteFrom")
+        self._promoteAt = config.get("promoteAt") or dConfig.get("promteAt")
+        self._turnorder = config.get("turnorder") or dConfig.get("turnorder")
+
+        try:
+            self.currentTurn = self._turnorder[0]
+        except IndexError:
+            self.currentTurn = None
+        vectorRows = _vectorRows.get((self._rows, self._cols))
+        if vectorRows is None:
+            vectorRows = [[ChessVector((row, col)) for col in range(self._cols)] for row in range(self._rows)]
+            _vectorRows[(self._rows, self._cols)] = vectorRows
+        self._board = [[Empty(vec) for vec in row] for row in vectorRows]
+
+        # Pieces of config are already listed, so they are placed without __setitem__
+        for color, pieceList in self._pieces.items():
+            for piece in pieceList:
+                self._board[piece.vector.row][piece.vector.col] = piece
+
+        disabled = config.get("disabled") or dConfig.get("disabled")
+        for vec in disabled:
+            self._board[vec.row][vec.col] = Disabled(vec)
+
+        if self._variant is not None:
+            self._geometry = self._variant.geometry
+        else:
+            self._geometry = getGeometry(self._rows, self._cols, disabled)
+
+        if bitboards:
+            self._bitboards = Bitboards(self._rows, self._cols, disabled)
+            for piece in self.iterPieces():
+                self._bitboards.place(piece, piece.vector)
+
+        self._buildHash()
+        self._buildMaterial()
 
         self._checks = {key: False for key in self._pieces.keys()}
         self._checkmates = copy(self._checks)
-        self._kings = {key: [piece for piece in self._pieces[key] if isinstance(piece, King)] for key in self._pieces.keys()}
+        self._kings = {color: [piece for pieceType, pieces in index.items() if issubclass(pieceType, King) for piece in pieces]
+                       for color, index in self._pieceIndex.items()}
         self._history = []
-
-        self.checkForCheck()
+        self._halfmoveClock = 0
+        self._moveNumber = 1
 
     def __eq__(self, other):
-        for p1, p2 in zip(self, other):
-            if type(p1) == type(p2):
-                continue
-            else:
-                break
-
-        else:
-            return True
-        return False
+        if not isinstance(other, Board):
+            return NotImplemented
+        return (self._rows, self._cols) == (other._rows, other._cols) and hash(self) == hash(other)
 
     def __ne__(self, other):
         return not self == other
 
+    def __hash__(self):
+        """Zobrist hash of position
+
+        Covers pieces, colors, positions, current turn,
+        castling eligibility and en-passant state.
+        The hash is maintained incrementally as the board changes.
+        """
+        return self._hash ^ turnKey(self.currentTurn)
+
     def __iter__(self):
         """Iterates through all positions in board
 
@@ -133,6 +238,13 @@ class Board():
             item1 = self._board[vec.row][vec.col]
             item2 = item[i]
 
+            if self._record is not None:
+                self._record.changes.append(("set", vec, item1))
+                if isinstance(item1, Piece) and item1 is not self._record.piece:
+                    self._record.captured = item1
+
+            affected = self._liftAttacks(vec)
+
             if not isinstance(item2, Disabled):
 
                 if not isinstance(item1, Empty):
@@ -146,8 +258,15 @@ class Board():
                         self._addPiece(item2, vec)
 
             self._board[vec.row][vec.col] = item2
+            self._placeAttacks(affected, vec)
 
     def __getitem__(self, index):
+        if isinstance(index, ChessVector):
+            item = self._board[index.row][index.col]
+            if isinstance(item, Disabled):
+                raise DisabledError(index.getStr(self))
+            return item
+
         res = []
 
         try:
@@ -181,6 +300,34 @@ class Board():
         """
         return self._cols
 
+    def getVariant(self) -> Union[Variant, None]:
+        """Get the variant board was created from
+
+        :returns: Variant of board, None if board was created from a plain configuration
+        :rtype: ``Variant`` or None
+        """
+        return self._variant
+
+    def getGeometry(self) -> Geometry:
+        """Get the precomputed geometry of board
+
+        :returns: Shared geometry of board size and disabled positions
+        :rtype: ``Geometry``
+        """
+        return self._geometry
+
+    def getMoveCache(self) -> Union[MoveCache, None]:
+        """Get the move list cache of board
+
+        Piece.getMoves() results are cached by position hash,
+        position of piece and the ignoreCheck flag.
+        Use getStats() of the cache for hit and miss counts.
+
+        :returns: Move cache of board, None if caching is disabled
+        :rtype: ``MoveCache`` or None
+        """
+        return self._moveCache
+
     def getHistory(self) -> list:
         """Get history list of board
 
@@ -190,6 +337,26 @@ class Board():
         return self._history
 
 
+    def getClocks(self) -> tuple:
+        """Get move clocks of board
+
+        The halfmove clock counts moves since the last capture or pawn move,
+        the move number is advanced after the last color of turnorder moves.
+
+        :returns: Halfmove clock and move number
+        :rtype: ``tuple``
+        """
+        return (self._halfmoveClock, self._moveNumber)
+
+    def setClocks(self, halfmoveClock: int, moveNumber: int) -> None:
+        """Set move clocks of board, see getClocks()
+
+        :param halfmoveClock: Moves since the last capture or pawn move
+        :param moveNumber: Number of current move
+        """
+        self._halfmoveClock = halfmoveClock
+        self._moveNumber = moveNumber
+
     def getTurnorder(self) -> list:
         """Get turnorder list of board
 
@@ -209,6 +376,8 @@ class Board():
         :returns: If colors are in check or not
         :rtype: ``bool`` or ``dict``
         """
+        if self._checksHash != self._hash:
+            self.checkForCheck(checkForMate=False)
         return {col: self._checks[col] for col in colors}
 
     @_defaultColors
@@ -222,6 +391,8 @@ class Board():
         :returns: If colors are in checkmate or not
         :rtype: ``bool`` or ``dict``
         """
+        if self._matesHash != self._hash:
+            self.checkForCheck()
         return {col: self._checkmates[col] for col in colors}
 
     @_defaultColors
@@ -315,14 +486,84 @@ class Board():
     def eval(self, *colors: str) -> Dict[str, int]:
         """Evaluate board
 
-        Returns the sum of all pieces' values of colors in board
+        Returns the sum of all pieces' values of colors in board,
+        read from incrementally maintained counters.
 
         :param *colors: Colors to evaluate (defaults to all colors of board)
 
         :returns: Colors with corresponding sum of pieces
         :rtype: ``dict``
         """
-        return {col: sum(list(map(lambda p: p.value, list(self.iterPieces(col))))) for col in colors}
+        return {col: self._material[col] for col in colors}
+
+    @_defaultColors
+    def getPieceCounts(self, *colors: str) -> Union[Dict[str, int], Dict[str, Dict[str, int]]]:
+        """Get number of pieces of every type
+
+        If more than one color is given, this returns a ``dict``
+        with the counts corresponding to each color.
+
+        :param *colors: Colors to get counts of (defaults to all colors of board)
+        :returns: Piece symbols with corresponding number of pieces
+        :rtype: ``dict``
+        """
+        return {col: dict(self._pieceCounts[col]) for col in colors}
+
+    def getPiecesOfType(self, color: str, pieceType: type) -> List[Piece]:
+        """Get pieces of color that are instances of type
+
+        Looked up in an index of pieces by color and type
+        that is maintained as pieces are added and removed.
+
+        :param color: Color of pieces
+        :param pieceType: Type of pieces, subclasses included
+        :returns: Pieces of color and type
+        :rtype: ``list``
+        """
+        index = self._pieceIndex.get(color, {})
+        if not pieceType.__subclasses__():
+            return list(index.get(pieceType, ()))
+        return [piece for pType, pieces in index.items() if issubclass(pType, pieceType) for piece in pieces]
+
+    def getMaterialSignature(self) -> str:
+        """Get material signature of board
+
+        Pieces of every color in turnorder, separated by "v",
+        such as "KQPvKR". Pieces are ordered K, Q, R, B, N, P,
+        followed by other symbols in alphabetical order.
+
+        :returns: Material signature
+        :rtype: ``str``
+        """
+        signature = []
+        for color in self._turnorder:
+            counts = self._pieceCounts[color]
+            symbols = sorted(counts, key=lambda symbol: (_signatureOrder.get(symbol, len(_signatureOrder)), symbol))
+            signature.append("".join(symbol * counts[symbol] for symbol in symbols))
+        return "v".join(signature)
+
+    def isInsufficientMaterial(self) -> bool:
+        """Check if no color has material left to checkmate
+
+        True if only kings remain, besides either a single knight or bishop
+        or any number of bishops all on squares of the same color.
+
+        :returns: True if material is insufficient, else False
+        :rtype: ``bool``
+        """
+        minors = {"N": 0, "B": 0}
+        for counts in self._pieceCounts.values():
+            for symbol, count in counts.items():
+                if symbol in minors:
+                    minors[symbol] += count
+                elif symbol != "K":
+                    return False
+
+        if minors["N"] + minors["B"] <= 1:
+            return True
+        elif minors["N"]:
+            return False
+        return len({(p.vector.row + p.vector.col) % 2 for p in self.iterPieces() if isinstance(p, Bishop)}) == 1
 
     def removeColor(self, color: str) -> None:
         """Remove color from board
@@ -331,7 +572,6 @@ class Board():
         """
         vectors = list(map(lambda p: p.vector, list(self.iterPieces(color))))
         self[vectors] = [Empty(vector) for vector in vectors]
-        self.checkForCheck()
 
     def swapPositions(self, vec1: ChessVector, vec2: ChessVector) -> None:
         """Swap position of two pieces
@@ -339,9 +579,43 @@ class Board():
         :param vec1: Starting position of first piece
         :param vec2: Starting position of second piece
         """
-        self._board[vec1.row][vec1.col].move(vec2)
-        self._board[vec2.row][vec2.col].move(vec1)
-        self._board[vec1.row][vec1.col], self._board[vec2.row][vec2.col] = self._board[vec2.row][vec2.col], self._board[vec1.row][vec1.col]
+        item1 = self._board[vec1.row][vec1.col]
+        item2 = self._board[vec2.row][vec2.col]
+
+        if self._record is not None:
+            self._record.changes.append(("swap", vec1, vec2, _pieceState(item1), _pieceState(item2)))
+
+        self._hashItems(item1, vec1, item2, vec2)
+        item1.move(vec2)
+        item2.move(vec1)
+        self._hashItems(item1, vec2, item2, vec1)
+        self._swapSquares(vec1, vec2)
+
+    def _hashItems(self, *itemsAndVecs) -> None:
+        """Toggle Zobrist keys of (item, position) pairs, non-pieces are skipped"""
+        for i in range(0, len(itemsAndVecs), 2):
+            item, vec = itemsAndVecs[i:i + 2]
+            if isinstance(item, Piece):
+                self._hash ^= pieceKey(item, vec)
+
+    def _buildHash(self) -> None:
+        self._hash = 0
+        for piece in self.iterPieces():
+            self._hash ^= pieceKey(piece, piece.vector)
+
+    def _swapSquares(self, vec1: ChessVector, vec2: ChessVector) -> None:
+        affected = self._liftAttacks(vec1, vec2)
+        item1 = self._board[vec1.row][vec1.col]
+        item2 = self._board[vec2.row][vec2.col]
+        self._board[vec1.row][vec1.col], self._board[vec2.row][vec2.col] = item2, item1
+
+        if self._bitboards is not None:
+            if isinstance(item1, Piece):
+                self._bitboards.move(item1, vec1, vec2)
+            if isinstance(item2, Piece):
+                self._bitboards.move(item2, vec2, vec1)
+
+        self._placeAttacks(affected, vec1, vec2)
 
     def isEmpty(self, vec: ChessVector) -> bool:
         """Check if position is empty
@@ -352,23 +626,42 @@ class Board():
         """
         return isinstance(self[vec], Empty)
 
+    def _isCapture(self, piece: Piece, targetVec: ChessVector) -> bool:
+        """Check if destination holds an enemy piece of piece"""
+        target = self[targetVec]
+        return isinstance(target, Piece) and target.color != piece.color
+
     def isThreatened(self, vec: ChessVector, alliedColor: str) -> bool:
         """Check if position is threatened by enemy pieces
 
+        Looks up the incrementally maintained attack maps of the board,
+        which are built on first use.
+
         :param vector: Position to check for threats
         :param alliedColor: Color to exclude from enemy pieces
         :returns: True if position is threatened, else False
         :rtype: ``bool``
         """
-        hostilePieces = [piece for col in self.getColors() if col != alliedColor for piece in self.iterPieces(col)]
-
-        for hp in hostilePieces:
-            hostile = hp.getMoves(self, ignoreCheck=True)
-            if vec in hostile:
+        if self._attacks is None:
+            self._buildAttacks()
+        idx = vec.row * self._cols + vec.col
+        for color, attacks in self._attacks.items():
+            if color != alliedColor and attacks[idx]:
                 return True
         else:
             return False
 
+    def getAttackers(self, vec: ChessVector) -> List[Piece]:
+        """Get all pieces threatening position
+
+        :param vec: Position to get attackers of
+        :returns: List of pieces threatening position
+        :rtype: ``list``
+        """
+        if self._attacks is None:
+            self._buildAttacks()
+        return list(self._attackers[vec.row * self._cols + vec.col])
+
     def checkForCheck(self, checkForMate=True) -> None:
         """Check for any checks in board
 
@@ -376,6 +669,12 @@ class Board():
         method checks if any allied pieces can move to
         interfere with the threatened check.
 
+        Results are cached by position hash,
+        getChecks() and getCheckmates() call this only
+        when the position has changed since the last call.
+        Colors out of check are not in checkmate, so if no color is in check
+        the checkmates are cached as well, even if checkForMate is False.
+
         :param checkForMate: Flag False to ignore checkmate (default is True)
         :returns: None, stores result in attributes ``checks`` and ``checkmates``
         """
@@ -389,33 +688,25 @@ class Board():
             else:
                 self._checks[color] = False
 
-            if self._checks[color] and checkForMate:
-
-                alliedPiecesPos = map(lambda p: p.vector, list(self.iterPieces(color)))
-
-                for alliedPos in list(alliedPiecesPos):
-                    for move in self[alliedPos].getMoves(self, ignoreCheck=True):
-                        testBoard = deepcopy(self)
-                        for pieceType in [None, *self._promoteTo[color]]:
-                            try:
-                                testBoard.movePiece(alliedPos, move, ignoreMate=True,
-                                                    checkForMate=False, promote=pieceType,
-                                                    printout=False, checkMove=False, ignoreOrder=True)
-                            except PromotionError:
-                                continue
-                            else:
-                                break
-
-                        if testBoard._checks[color]:
-                            continue
-                        else:
-                            self._checkmates[color] = False
-                            break
-                    else:
-                        continue
-                    break
-                else:
-                    self._checkmates[color] = True
+            if checkForMate:
+                self._checkmates[color] = self._checks[color] and next(self.iterEvasions(color), None) is None
+
+        self._checksHash = self._hash
+        if checkForMate:
+            self._matesHash = self._hash
+        elif not any(self._checks.values()):
+            for color in self._checkmates:
+                self._checkmates[color] = False
+            self._matesHash = self._hash
+
+    def _advanceClocks(self, piece: Piece, capture: bool) -> None:
+        """Advance the move clocks by a move of piece, call before advancing the turn"""
+        if capture or isinstance(piece, Pawn):
+            self._halfmoveClock = 0
+        else:
+            self._halfmoveClock += 1
+        if self._turnorder and self.currentTurn == self._turnorder[-1]:
+            self._moveNumber += 1
 
     def advanceTurn(self) -> None:
         """Advance the turn according to turnorder
@@ -440,10 +731,11 @@ class Board():
 
         :**Flags:
             :ignoreOrder (False): Ignore the turnorder
-            :ignoreMate (False): Ignore if any pieces are in checkmate
+            :ignoreMate (False): Ignore if any pieces are in checkmate,
+                only tested with checkMove or if checkmates are already known for the position
             :ignoreCheck (False): Ignore if any pieces are in check
             :checkForCheck (True): Check for any checks after move
-            :checkForMate (True): Check for any checkmates after move
+            :checkForMate (True): Check for any checkmates after move, only searched if a color is in check
             :checkMove (True): Check if piece is able to move to destination
             :printout (True): Print the results of the move; checks, checkmates and move notation
             :promote (None): Piece type to promote to
@@ -457,71 +749,612 @@ class Board():
         if not ignoreOrder and self.currentTurn != startPiece.color:
             raise TurnError
 
-        if self._checkmates[startPiece.color] and not ignoreMate:
+        if not ignoreMate and (checkMove or self._matesHash == self._hash) and self.getCheckmates(startPiece.color):
             raise CheckMate
 
         if checkMove and not targetVec.matches(startPiece.getMoves(self, ignoreCheck=ignoreCheck, ignoreMate=ignoreMate)):
             raise IllegalMove(startVec.getStr(self), targetVec.getStr(self))
 
+        capture = self._isCapture(startPiece, targetVec)
+
         for move in self._moves[startPiece.color]:
             if move.pieceCondition(startPiece):
                 if targetVec in move.getDestinations(startPiece, self):
                     notation = move.action(startPiece, targetVec, self, promote)
-                    if checkForCheck:
-                        self.checkForCheck(checkForMate=checkForMate)
                     break
 
         else:
             raise IllegalMove(startVec.getStr(self), targetVec.getStr(self))
 
-        for color in self._checks.keys():
-            if self._checkmates[color]:
-                if printout:
-                    print(f"{color} in Checkmate!")
-                if not "#" in notation:
-                    notation += "#"
-
-            elif self._checks[color]:
-                if printout:
-                    print(f"{color} in Check!")
-                if not "+" in notation:
-                    notation += "+"
-
         for piece in self.iterPieces():
 
             if not piece is startPiece:
-                piece.postAction(self)
+                if getattr(piece, "passed", False):
+                    self._hash ^= pieceKey(piece, piece.vector)
+                    piece.postAction(self)
+                    self._hash ^= pieceKey(piece, piece.vector)
+                else:
+                    piece.postAction(self)
+
+        if checkForCheck:
+            checks = self.getChecks(*self.getColors())
+            # Checkmates are only searched for if a color is in check
+            checkmates = self.getCheckmates(*self.getColors()) if checkForMate and any(checks.values()) else {}
+
+            for color in checks.keys():
+                if checkmates.get(color):
+                    if printout:
+                        print(f"{color} in Checkmate!")
+                    if not "#" in notation:
+                        notation += "#"
+
+                elif checks[color]:
+                    if printout:
+                        print(f"{color} in Check!")
+                    if not "+" in notation:
+                        notation += "+"
 
         self._history.append(notation)
         if printout:
             print(notation)
 
+        self._advanceClocks(startPiece, capture)
         self.advanceTurn()
         return notation
 
+    def makeMove(self, startVec: ChessVector, targetVec: ChessVector,
+                 promote=None, move=None) -> MoveRecord:
+        """Make a move that can be taken back with unmakeMove()
+
+        The move is performed without any validation, notation or printout.
+        The turn is advanced and the undo record is pushed to the undo stack.
+
+        :param startVec: Position of moving piece
+        :param targetVec: Destination of moving piece
+        :param promote: Piece type to promote to (default is None)
+        :param move: Move type to perform (default is first move type reaching destination)
+        :returns: Undo record of move
+        :rtype: ``MoveRecord``
+        """
+        if self.isEmpty(startVec):
+            raise EmptyError(startVec.getStr(self))
+
+        startPiece = self[startVec]
+
+        if move is None:
+            for move in self._moves[startPiece.color]:
+                if move.pieceCondition(startPiece) and targetVec in move.getDestinations(startPiece, self):
+                    break
+            else:
+                raise IllegalMove(startVec.getStr(self), targetVec.getStr(self))
+
+        record = MoveRecord(startPiece, startVec, targetVec, promote, self.currentTurn,
+                            (self._halfmoveClock, self._moveNumber))
+        capture = self._isCapture(startPiece, targetVec)
+
+        self._record = record
+        try:
+            move.action(startPiece, targetVec, self, promote, notate=False)
+        except Exception:
+            self._record = None
+            self._undo(record)
+            raise
+        self._record = None
+
+        for piece in self.iterPieces():
+            if not piece is startPiece:
+                if getattr(piece, "passed", False):
+                    record.passed.append(piece)
+                    self._hash ^= pieceKey(piece, piece.vector)
+                    piece.postAction(self)
+                    self._hash ^= pieceKey(piece, piece.vector)
+                else:
+                    piece.postAction(self)
+
+        self._advanceClocks(startPiece, capture)
+        self.advanceTurn()
+        self._undoStack.append(record)
+        return record
+
+    def unmakeMove(self) -> MoveRecord:
+        """Take back the last move made with makeMove()
+
+        :returns: Undo record of the move taken back
+        :rtype: ``MoveRecord``
+        """
+        record = self._undoStack.pop()
+        self._undo(record)
+        self.currentTurn = record.turn
+        self._halfmoveClock, self._moveNumber = record.clocks
+        return record
+
+    def isLegal(self, startVec: ChessVector, targetVec: ChessVector, move=None, simulate=True) -> bool:
+        """Check if move leaves the allied kings out of check
+
+        The destination is assumed to be reachable by the piece,
+        only the safety of the allied kings is tested.
+        With simulate False, standard moves are tested against the
+        checks and pins of the attack maps like in iterLegalMoves(),
+        other moves are still made and unmade.
+
+        :param startVec: Position of moving piece
+        :param targetVec: Destination of moving piece
+        :param move: Move type to perform (default is first move type reaching destination)
+        :param simulate: Flag False to avoid making the move where possible (default is True)
+        :returns: True if move is legal, else False
+        :rtype: ``bool``
+        """
+        piece = self[startVec]
+        color = piece.color
+        king = None if simulate or move is not Standard else self._soleKing(color)
+        if king is not None:
+            checkers = [p for p in self.getAttackers(king.vector) if p.color != color]
+            if piece is king:
+                return self._isKingSafe(king, targetVec, checkers)
+            if len(checkers) > 1:
+                return False
+            target = targetVec.tuple()
+            if checkers and target not in self._findEvasions(king, checkers[0]):
+                return False
+            pins = self._findPins(king)
+            return piece not in pins or target in pins[piece]
+
+        promoteTo = self._promoteTo.get(color)
+        try:
+            self.makeMove(startVec, targetVec, promote=promoteTo[0] if promoteTo else None,
+                          move=move)
+        except PromotionError:
+            return False
+
+        try:
+            for king in self._kings.get(color, []):
+                if self.isThreatened(king.vector, color):
+                    return False
+            return True
+        finally:
+            self.unmakeMove()
+
+    def legalMoves(self, color: str = None, pieceType: type = None) -> List[tuple]:
+        """Get all legal moves of color
+
+        See iterLegalMoves().
+
+        :param color: Color to get moves of (default is current turn)
+        :param pieceType: Only get moves of pieces of this type (default is all)
+        :returns: List of (piece, startVec, targetVec, promotion) tuples
+        :rtype: ``list``
+        """
+        return list(self.iterLegalMoves(color, pieceType))
+
+    def iterLegalMoves(self, color: str = None, pieceType: type = None) -> Generator[tuple, None, None]:
+        """Iterate through all legal moves of color in one pass
+
+        Checks and pins against the king of color are found up front
+        from the attack maps, so standard moves of pieces other than the king
+        need no simulation. King moves, en-passant, castling and
+        moves of custom pieces are tested by making and unmaking them.
+        Promotions are expanded into one move per promotion type,
+        promotion is None for other moves.
+        With the bitboard backend, the standard destinations of those pieces
+        are masked by the checks and pins as bitboards,
+        so only legal destinations are converted to vectors.
+        The board must not be changed while iterating.
+
+        :param color: Color to get moves of (default is current turn)
+        :param pieceType: Only get moves of pieces of this type (default is all)
+        :yields: (piece, startVec, targetVec, promotion) of every legal move
+        :ytype: ``generator``
+        """
+        color = color or self.currentTurn
+        king = self._soleKing(color)
+        bitboards = self._bitboards
+        promoteFrom = tuple(self._promoteFrom.get(color, ()))
+
+        if king is not None:
+            pins = self._findPins(king)
+            checkers = [piece for piece in self.getAttackers(king.vector) if piece.color != color]
+            if len(checkers) == 1:
+                evasions = self._findEvasions(king, checkers[0])
+            else:
+                evasions = None
+            if bitboards is not None:
+                evasionMask = bitboards.toMask(evasions) if evasions is not None else -1
+                vectors = self._geometry.vectors
+
+        for piece in list(self.iterPieces(color)):
+            if pieceType is not None and not isinstance(piece, pieceType):
+                continue
+            fast = king is not None and piece is not king
+            if fast and len(checkers) > 1:
+                continue
+            promotes = isinstance(piece, promoteFrom)
+            # Pawns advance at most two positions, so farther pawns cannot promote
+            if promotes and bitboards is not None and type(piece) is Pawn:
+                promotes = piece.rank + 2 >= self._promoteAt[color]
+
+            startVec = piece.vector
+            for move in self._moves[color]:
+                if not move.pieceCondition(piece):
+                    continue
+                if fast and move is Standard and bitboards is not None and type(piece) in _builtinPieces:
+                    targets = bitboards.getStandardTargets(piece) & evasionMask
+                    if piece in pins:
+                        targets &= bitboards.toMask(pins[piece])
+                    for sq in iterSquares(targets):
+                        targetVec = vectors[sq]
+                        if promotes and Standard.promotes(piece, targetVec, self):
+                            for promote in self._promoteTo[color]:
+                                yield (piece, startVec, targetVec, promote)
+                        else:
+                            yield (piece, startVec, targetVec, None)
+                    continue
+
+                for targetVec in move.getDestinations(piece, self):
+                    if fast and move is Standard:
+                        target = targetVec.tuple()
+                        if evasions is not None and target not in evasions:
+                            continue
+                        if piece in pins and target not in pins[piece]:
+                            continue
+                    elif piece is king and move is Standard:
+                        if not self._isKingSafe(king, targetVec, checkers):
+                            continue
+                    elif not self.isLegal(startVec, targetVec, move=move):
+                        continue
+
+                    if promotes and move is Standard and Standard.promotes(piece, targetVec, self):
+                        for promote in self._promoteTo[color]:
+                            yield (piece, startVec, targetVec, promote)
+                    else:
+                        yield (piece, startVec, targetVec, None)
+
+    def iterMovesTo(self, targetVec: ChessVector, color: str = None,
+                    pieceType: type = Piece) -> Generator[tuple, None, None]:
+        """Iterate through the legal moves of color to destination
+
+        Pieces are looked up in the piece index of board, and built-in pieces
+        that do not threaten the destination are skipped, except for pawn pushes
+        and castling kings.
+        Only the remaining moves are tested with isLegal(), without simulating
+        standard moves, so finding the few moves to one destination is cheap.
+        The board must not be changed while iterating.
+
+        :param targetVec: Destination of moves
+        :param color: Color to get moves of (default is current turn)
+        :param pieceType: Only get moves of pieces of this type (default is all)
+        :yields: (piece, startVec, move) of every legal move, move is the first move type reaching destination
+        :ytype: ``generator``
+        """
+        color = color or self.currentTurn
+        attackers = self.getAttackers(targetVec)
+        for piece in self.getPiecesOfType(color, pieceType):
+            startVec = piece.vector
+            if type(piece) in _builtinPieces and piece not in attackers and not isinstance(piece, King):
+                if not isinstance(piece, Pawn) or (startVec.row != targetVec.row and startVec.col != targetVec.col):
+                    continue
+
+            for move in self._moves[color]:
+                if move.pieceCondition(piece) and targetVec in move.getDestinations(piece, self):
+                    if self.isLegal(startVec, targetVec, move=move, simulate=False):
+                        yield (piece, startVec, move)
+                    break
+
+    def iterEvasions(self, color: str = None) -> Generator[tuple, None, None]:
+        """Iterate through the legal moves of a color in check
+
+        Generates king escapes, captures of the checking piece and
+        interpositions on the checking line directly, instead of testing
+        every move of every piece. In double check only the king may move.
+        Special moves, such as en-passant, are tested by making and unmaking them.
+        If color is not in check, all legal moves are iterated.
+        The board must not be changed while iterating.
+
+        :param color: Color to get moves of (default is current turn)
+        :yields: (piece, startVec, targetVec, promotion) of every legal move
+        :ytype: ``generator``
+        """
+        color = color or self.currentTurn
+        king = self._soleKing(color)
+        if king is None:
+            yield from self.iterLegalMoves(color)
+            return
+
+        checkers = [piece for piece in self.getAttackers(king.vector) if piece.color != color]
+        if not checkers:
+            yield from self.iterLegalMoves(color)
+            return
+
+        for targetVec in king.getStandardMoves(self):
+            if self._isKingSafe(king, targetVec, checkers):
+                yield (king, king.vector, targetVec, None)
+
+        if len(checkers) > 1:
+            return
+
+        checker = checkers[0]
+        pins = self._findPins(king)
+
+        def evade(piece, targetVec):
+            if piece in pins and targetVec.tuple() not in pins[piece]:
+                return
+            if Standard.promotes(piece, targetVec, self):
+                for promote in self._promoteTo[color]:
+                    yield (piece, piece.vector, targetVec, promote)
+            else:
+                yield (piece, piece.vector, targetVec, None)
+
+        for piece in self.getAttackers(checker.vector):
+            if piece.color == color and piece is not king:
+                yield from evade(piece, checker.vector)
+
+        blocks = self._findEvasions(king, checker) - {checker.vector.tuple()}
+        for row, col in blocks:
+            for piece in self._attackers[row * self._cols + col]:
+                if piece.color == color and piece is not king and not isinstance(piece, Pawn):
+                    yield from evade(piece, ChessVector((row, col)))
+
+        for pawn in self.iterPieces(color):
+            if isinstance(pawn, Pawn):
+                targetVec = pawn.vector + pawn.forwardVec
+                if pawn.canWalk(targetVec, self):
+                    if targetVec.tuple() in blocks:
+                        yield from evade(pawn, targetVec)
+                    targetVec += pawn.forwardVec
+                    if pawn.firstMove and pawn.canWalk(targetVec, self) and targetVec.tuple() in blocks:
+                        yield from evade(pawn, targetVec)
+
+        for move in self._moves[color]:
+            if move is Standard:
+                continue
+            for piece in list(self.iterPieces(color)):
+                if move.pieceCondition(piece):
+                    for targetVec in move.getDestinations(piece, self):
+                        if self.isLegal(piece.vector, targetVec, move=move):
+                            yield (piece, piece.vector, targetVec, None)
+
+    def _soleKing(self, color: str) -> Union[King, None]:
+        """Get the king of color if checks and pins can be found from the attack maps
+
+        This requires a single king of color and only built-in piece types in board.
+        """
+        kings = self._kings.get(color, [])
+        if len(kings) != 1 or not all(type(piece) in _builtinPieces for piece in self.iterPieces()):
+            return None
+        return kings[0]
+
+    def _isKingSafe(self, king: King, targetVec: ChessVector, checkers: List[Piece]) -> bool:
+        """Check if standard king move leaves king out of check
+
+        The destination must not be threatened, nor be
+        behind the king on the line of a sliding checker,
+        which the attack maps do not see through the king.
+
+        :param king: King to move
+        :param targetVec: Destination of king
+        :param checkers: Pieces checking king
+        :returns: True if king is safe at destination, else False
+        :rtype: ``bool``
+        """
+        if self.isThreatened(targetVec, king.color):
+            return False
+        for checker in checkers:
+            if checker.sliding:
+                dRow = (king.vector.row > checker.vector.row) - (king.vector.row < checker.vector.row)
+                dCol = (king.vector.col > checker.vector.col) - (king.vector.col < checker.vector.col)
+                if (targetVec.row, targetVec.col) == (king.vector.row + dRow, king.vector.col + dCol):
+                    return False
+        return True
+
+    def _findPins(self, king: King) -> Dict[Piece, set]:
+        """Find allied pieces pinned to king
+
+        :param king: King to find pins against
+        :returns: Pinned pieces with the (row, col) positions they may move to
+        :rtype: ``dict``
+        """
+        if self._attacks is None:
+            self._buildAttacks()
+        pins = {}
+        for dRow, dCol in _lines:
+            row, col = king.vector.row + dRow, king.vector.col + dCol
+            line = set()
+            pinned = None
+            while 0 <= row < self._rows and 0 <= col < self._cols:
+                item = self._board[row][col]
+                if isinstance(item, Disabled):
+                    break
+                line.add((row, col))
+                if isinstance(item, Piece):
+                    if pinned is None:
+                        if item.color != king.color:
+                            break
+                        pinned = item
+                    else:
+                        pinnedIdx = pinned.vector.row * self._cols + pinned.vector.col
+                        if item.color != king.color and item.sliding and item in self._attackers[pinnedIdx]:
+                            pins[pinned] = line
+                        break
+                row, col = row + dRow, col + dCol
+        return pins
+
+    def _findEvasions(self, king: King, checker: Piece) -> set:
+        """Find positions blocking or capturing a single checking piece
+
+        :param king: King in check
+        :param checker: Piece checking king
+        :returns: (row, col) positions other allied pieces may move to
+        :rtype: ``set``
+        """
+        evasions = {checker.vector.tuple()}
+        if checker.sliding:
+            dRow = (checker.vector.row > king.vector.row) - (checker.vector.row < king.vector.row)
+            dCol = (checker.vector.col > king.vector.col) - (checker.vector.col < king.vector.col)
+            row, col = king.vector.row + dRow, king.vector.col + dCol
+            while (row, col) != checker.vector.tuple():
+                evasions.add((row, col))
+                row, col = row + dRow, col + dCol
+        return evasions
+
+    def _undo(self, record: MoveRecord) -> None:
+        for piece in record.passed:
+            self._hash ^= pieceKey(piece, piece.vector)
+            piece.passed = True
+            self._hash ^= pieceKey(piece, piece.vector)
+
+        for change in reversed(record.changes):
+            if change[0] == "set":
+                _, vec, item = change
+                self[vec] = item
+            elif change[0] == "swap":
+                _, vec1, vec2, state1, state2 = change
+                item1 = self._board[vec2.row][vec2.col]
+                item2 = self._board[vec1.row][vec1.col]
+                self._hashItems(item1, vec2, item2, vec1)
+                _restoreState(item1, vec1, state1)
+                _restoreState(item2, vec2, state2)
+                self._hashItems(item1, vec1, item2, vec2)
+                self._swapSquares(vec1, vec2)
+            elif change[0] == "color":
+                _, color, promoteTo, promoteFrom, promoteAt, turnIdx = change
+                self._pieces[color] = []
+                self._kings[color] = []
+                self._material[color] = 0
+                self._pieceCounts[color] = {}
+                self._pieceIndex[color] = {}
+                self._promoteTo[color] = promoteTo
+                self._promoteFrom[color] = promoteFrom
+                self._promoteAt[color] = promoteAt
+                self._checks[color] = False
+                self._checkmates[color] = False
+                self._turnorder.insert(turnIdx, color)
+
+    def _buildAttacks(self) -> None:
+        """Build the attack maps, done on first use and kept up to date by moves"""
+        self._attacks = {color: [0] * (self._rows * self._cols) for color in self.getColors()}
+        self._attackers = [set() for _ in range(self._rows * self._cols)]
+        self._attacking = {}
+        for piece in self.iterPieces():
+            self._projectAttacks(piece)
+
+    def _liftAttacks(self, *vecs: ChessVector) -> set:
+        """Retract the attacks changed by mutating positions
+
+        Call before changing positions, the returned pieces must be passed
+        on to _placeAttacks() after the change.
+        Only pieces on the positions and sliding pieces threatening them are affected.
+        """
+        if self._attacks is None:
+            return set()
+
+        affected = set()
+        for vec in vecs:
+            affected.update(p for p in self._attackers[vec.row * self._cols + vec.col] if p.sliding)
+            item = self._board[vec.row][vec.col]
+            if isinstance(item, Piece):
+                affected.add(item)
+
+        for piece in affected:
+            self._retractAttacks(piece)
+        return affected
+
+    def _placeAttacks(self, affected: set, *vecs: ChessVector) -> None:
+        if self._attacks is None:
+            return
+
+        for vec in vecs:
+            item = self._board[vec.row][vec.col]
+            if isinstance(item, Piece):
+                affected.add(item)
+
+        for piece in affected:
+            vec = piece.vector
+            if vec is not None and self._board[vec.row][vec.col] is piece:
+                self._projectAttacks(piece)
+
+    def _projectAttacks(self, piece: Piece) -> None:
+        if piece.color not in self._attacks:
+            self._attacks[piece.color] = [0] * (self._rows * self._cols)
+        attacks = self._attacks[piece.color]
+        indices = [vec.row * self._cols + vec.col for vec in piece.getAttacking(self)]
+        for idx in indices:
+            attacks[idx] += 1
+            self._attackers[idx].add(piece)
+        self._attacking[piece] = indices
+
+    def _retractAttacks(self, piece: Piece) -> None:
+        attacks = self._attacks[piece.color]
+        for idx in self._attacking.pop(piece, ()):
+            attacks[idx] -= 1
+            self._attackers[idx].discard(piece)
+
+    def _buildMaterial(self) -> None:
+        self._material = {color: 0 for color in self.getColors()}
+        self._pieceCounts = {color: {} for color in self.getColors()}
+        self._pieceIndex = {color: {} for color in self.getColors()}
+        for piece in self.iterPieces():
+            self._countPiece(piece, 1)
+
+    def _countPiece(self, piece: Piece, n: int) -> None:
+        self._material[piece.color] += n * piece.value
+        counts = self._pieceCounts[piece.color]
+        counts[piece.symbol] = counts.get(piece.symbol, 0) + n
+        if not counts[piece.symbol]:
+            del counts[piece.symbol]
+
+        index = self._pieceIndex[piece.color]
+        if n > 0:
+            index.setdefault(type(piece), []).append(piece)
+        else:
+            index[type(piece)].remove(piece)
+            if not index[type(piece)]:
+                del index[type(piece)]
+
     def _addPiece(self, piece: Piece, vec: ChessVector) -> None:
         if not piece.color in self.getColors():
             self._pieces[piece.color] = []
             self._kings[piece.color] = []
             self._checks[piece.color] = False
             self._checkmates[piece.color] = False
+            self._material[piece.color] = 0
+            self._pieceCounts[piece.color] = {}
+            self._pieceIndex[piece.color] = {}
 
         self._pieces[piece.color].append(piece)
+        self._countPiece(piece, 1)
 
         if isinstance(piece, King):
             self._kings[piece.color].append(piece)
 
+        if self._bitboards is not None:
+            self._bitboards.place(piece, vec)
+
+        self._hash ^= pieceKey(piece, vec)
         piece.vector = vec
 
     def _removePiece(self, piece: Piece) -> None:
 
+        if self._bitboards is not None:
+            self._bitboards.remove(piece, piece.vector)
+
+        self._hash ^= pieceKey(piece, piece.vector)
+
         self._pieces[piece.color].remove(piece)
+        self._countPiece(piece, -1)
 
         if isinstance(piece, King) and piece in self._kings[piece.color]:
             self._kings[piece.color].remove(piece)
 
         if not self._pieces[piece.color]:
+            if self._record is not None:
+                self._record.changes.append(("color", piece.color,
+                                             self._promoteTo.get(piece.color),
+                                             self._promoteFrom.get(piece.color),
+                                             self._promoteAt.get(piece.color),
+                                             self._turnorder.index(piece.color)))
             del self._pieces[piece.color]
+            del self._material[piece.color]
+            del self._pieceCounts[piece.color]
+            del self._pieceIndex[piece.color]
             del self._promoteTo[piece.color]
             del self._promoteFrom[piece.color]
             del self._promoteAt[piece.color]
@@ -534,21 +1367,25 @@ class Board():
         piece.vector = None
 
 
-def initClassic() -> Board:
+def initClassic(bitboards=False, moveCache=0) -> Board:
     """Initialize a chessBoard setup for 2 players, classic setup
 
+    :param bitboards: Flag True to use the bitboard backend (default is False)
+    :param moveCache: Number of move lists to cache (default is 0, no cache)
     :returns: Classic chessboard
     :rtype: ``Board``
     """
-    board = Board(deepcopy(ClassicConfig.CONFIG))
+    board = Board(getVariant("classic"), bitboards=bitboards, moveCache=moveCache)
     return board
 
 
-def init4P() -> Board:
+def init4P(bitboards=False, moveCache=0) -> Board:
     """Initialize a chessboard setup for four players
 
+    :param bitboards: Flag True to use the bitboard backend (default is False)
+    :param moveCache: Number of move lists to cache (default is 0, no cache)
     :returns 4 player chessboard
     :rtype: ``Board``
     """
-    board = Board(deepcopy(FourPlayerConfig.CONFIG))
+    board = Board(getVariant("fourplayer"), bitboards=bitboards, moveCache=moveCache)
     return board
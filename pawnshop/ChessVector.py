@@ -1,13 +1,42 @@
 # ChessVector.py
 
 from typing import Union, Tuple, List, TYPE_CHECKING
-from .Utils import toAlpha, inverseIdx, countAlpha
+from .Utils import toAlpha, fromAlpha, inverseIdx
 # import pawnshop.ChessBoard
 
 if TYPE_CHECKING:
     from pawnshop.ChessBoard import Board
 
 
+# Only positions with rows and columns within this bound are pooled,
+# which covers every square and offset of boards up to 64x64,
+# so the pool holds at most 127 * 127 vectors
+POOLBOUND = 64
+
+_pool = {}
+
+
+def _intern(row: int, col: int) -> "ChessVector":
+    """Get the pooled vector of position
+
+    Positions out of POOLBOUND get a new vector that is not pooled.
+
+    :param row: Row of position
+    :param col: Column of position
+    :returns: The one vector instance of position
+    :rtype: ``ChessVector``
+    """
+    try:
+        return _pool[(row, col)]
+    except KeyError:
+        vec = object.__new__(ChessVector)
+        object.__setattr__(vec, "row", row)
+        object.__setattr__(vec, "col", col)
+        if -POOLBOUND < row < POOLBOUND and -POOLBOUND < col < POOLBOUND:
+            _pool[(row, col)] = vec
+        return vec
+
+
 class ChessVector(object):
     """ChessVector object
 
@@ -16,91 +45,91 @@ class ChessVector(object):
     If a string notation format is given, the board must also be given
     The vector supports common operations such as addition, multiplication with other vectors
 
+    Vectors are immutable and interned, there is only one instance of every position
+    with row and column within POOLBOUND, which covers boards up to 64x64.
+    Equal vectors within the bound are therefore identical and can be compared with ``is``,
+    and vectors are hashable so they can be used in sets and as dictionary keys.
+
     :param position: Tuple or string notation position on chessboard
     :param board: Board to use when determining position given by string notation (default is None)
     """
 
-    def __init__(self, position: Union[Tuple[int, int], str], board=None):
-        self._row = 0
-        self._col = 0
+    __slots__ = ("row", "col")
 
+    def __new__(cls, position: Union[Tuple[int, int], str], board=None):
         if isinstance(position, tuple):
+            vec = _pool.get(position)
+            if vec is not None:
+                return vec
             row, col = position
-            self.row = int(row)
-            self.col = int(col)
+            return _intern(int(row), int(col))
         elif isinstance(position, str) and not board is None:
             position = position.lower()
-            for char in position:
+            vec = board.getGeometry().squareVectors.get(position)
+            if vec is not None:
+                return vec
+            for i, char in enumerate(position):
                 if char.isdigit():
-                    i = position.find(char)
                     if i == 0:
                         raise ValueError("Position does not include column!")
-                    alpha = position[:i]
-                    num = position[i::]
-                    row = board.getRows() - int(num)
-                    for n, a in countAlpha():
-                        if a == alpha:
-                            col = n
-                            break
-                    else:
-                        continue
                     break
             else:
                 raise ValueError("position does not include row!")
-            self.row = row
-            self.col = col
+            return _intern(board.getRows() - int(position[i:]), fromAlpha(position[:i]))
         else:
             raise ValueError("Position is not a string or a tuple!")
 
-    @property
-    def col(self):
-        return self._col
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable!")
 
-    @col.setter
-    def col(self, newCol):
-        self._col = newCol
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable!")
 
-    @property
-    def row(self):
-        return self._row
+    def __reduce__(self):
+        return (ChessVector, ((self.row, self.col),))
 
-    @row.setter
-    def row(self, newRow):
-        self._row = newRow
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __hash__(self):
+        return hash((self.row, self.col))
 
     def __sub__(self, other):
         if isinstance(other, ChessVector):
-            return ChessVector((self.row - other.row, self.col - other.col))
+            return _intern(self.row - other.row, self.col - other.col)
         else:
             return ChessVector((self.row - other, self.col - other))
 
     def __rsub__(self, other):
         if isinstance(other, ChessVector):
-            return ChessVector((other.row - self.row, other.col - self.col))
+            return _intern(other.row - self.row, other.col - self.col)
         else:
             raise ValueError(f"Cannot subtract {type(self)} from non-{type(self)}!")
 
     def __add__(self, other):
         if isinstance(other, ChessVector):
-            return ChessVector((self.row + other.row, self.col + other.col))
+            return _intern(self.row + other.row, self.col + other.col)
         else:
             return ChessVector((self.row + other, self.col + other))
 
     def __radd__(self, other):
         if isinstance(other, ChessVector):
-            return ChessVector((other.row + self.row, other.col + self.col))
+            return _intern(other.row + self.row, other.col + self.col)
         else:
             raise ValueError(f"Cannot add {type(self)} to non-{type(self)}!")
 
     def __mul__(self, other):
         if isinstance(other, ChessVector):
-            return ChessVector((self.row * other.row, self.col * other.col))
+            return _intern(self.row * other.row, self.col * other.col)
         else:
             return ChessVector((self.row * other, self.col * other))
 
     def __rmul__(self, other):
         if isinstance(other, ChessVector):
-            return ChessVector((other.row * self.row, other.col * self.col))
+            return _intern(other.row * self.row, other.col * self.col)
         else:
             raise ValueError(f"Cannot multiply non-{type(self)} by {type(self)}!")
 
@@ -117,19 +146,20 @@ class ChessVector(object):
             raise ValueError(f"Cannot divide non-{type(self)} by {type(self)}!")
 
     def __neg__(self):
-        return ChessVector((-self.row, -self.col))
+        return _intern(-self.row, -self.col)
 
     def __pos__(self):
-        return ChessVector((+self.row, +self.col))
+        return _intern(+self.row, +self.col)
 
     def __eq__(self, other):
         if isinstance(other, ChessVector):
-            return self.row == other.row and self.col == other.col
-        else:
-            raise ValueError(f"Cannot compare {type(self)} with {type(other)}!")
+            return self is other or self.row == other.row and self.col == other.col
+        return NotImplemented
 
     def __ne__(self, other):
-        return not self == other
+        if isinstance(other, ChessVector):
+            return not self == other
+        return NotImplemented
 
     def __lt__(self, other):
         if isinstance(other, ChessVector):
@@ -158,7 +188,7 @@ class ChessVector(object):
         :returns: (row, col) tuple
         :rType: ´´tuple´´
         """
-        return (self._row, self._col)
+        return (self.row, self.col)
 
     def getStr(self, board: "Board") -> str:
         """Return string notation format of vector
@@ -167,31 +197,32 @@ class ChessVector(object):
         :returns: string notation of vector position
         :rType: ´´str´´
         """
-        notation = ""
-        notation += toAlpha(self.col)
-        notation += inverseIdx(self.row, board)
-        return notation
+        geometry = board.getGeometry()
+        if 0 <= self.row < geometry.rows and 0 <= self.col < geometry.cols:
+            return geometry.squareNames[self.row * geometry.cols + self.col]
+        return toAlpha(self.col) + inverseIdx(self.row, board)
 
     def matches(self, otherVecs: List["ChessVector"]) -> bool:
         """Check if vector matches any of other vectors
 
-        :param otherVecs: List of other vectors
+        Since vectors are interned, this is mostly an identity test for lists
+        and a hash lookup for sets.
+
+        :param otherVecs: List or set of other vectors
         :returns: If match is found or not
         :rType: ´´bool´´
         """
-        for vec in otherVecs:
-            if self.row == vec.row and self.col == vec.col:
-                return True
-        else:
-            return False
+        return self in otherVecs
 
     def copy(self) -> "ChessVector":
-        """Create a new copy of this vector
+        """Get a copy of this vector
+
+        Vectors are immutable and interned, so the copy is this vector itself.
 
-        :returns: Copy of this vector
+        :returns: This vector
         :rType: ´´ChessVector´´
         """
-        return ChessVector((self.row, self.col))
+        return self
 
 
 if __name__ == "__main__":
@@ -0,0 +1,337 @@
+# Compact.py
+
+from typing import List, Dict, Tuple, Union, Generator
+from .ChessBoard import Board
+from .ChessVector import ChessVector
+from .Geometry import Geometry, getGeometry
+from .Pieces import *
+from .Exceptions import DisabledError
+
+# Square codes: bits 0-2 piece type, bits 3-4 color index, bit 5 first move, bit 6 passed
+# The piece type of a code is code & TYPEMASK, the color index code >> COLORSHIFT & 0b11
+EMPTY = 0
+DISABLED = 7
+TYPEMASK = 0b111
+COLORSHIFT = 3
+_FIRSTMOVE = 1 << 5
+_PASSED = 1 << 6
+_MAXCOLORS = 4
+
+# Piece type of every type code, and type code of every piece type
+PIECETYPES = (None, Pawn, Knight, Bishop, Rook, Queen, King)
+TYPECODES = {pType: code for code, pType in enumerate(PIECETYPES) if pType is not None}
+_templates = [pType and pType("white") for pType in PIECETYPES]
+
+# Forward coordinate of pawns, a pawn's rank minus this is constant for its color
+_forward = {
+    "up": lambda row, col: -row,
+    "down": lambda row, col: row,
+    "right": lambda row, col: col,
+    "left": lambda row, col: -col
+}
+
+# Read-only tuples shared by every compact board of the same rules
+_shared = {}
+
+
+def _share(value: tuple) -> tuple:
+    return _shared.setdefault(value, value)
+
+
+def encode(piece: Union[Piece, Empty, Disabled], colors: Tuple[str]) -> int:
+    """Encode square item as integer code
+
+    :param piece: Piece, Empty or Disabled object
+    :param colors: Colors of board, the index of color is encoded
+    :returns: Code of item
+    :rtype: ``int``
+    :raises ValueError: If piece type is not one of the standard types
+    """
+    if isinstance(piece, Empty):
+        return EMPTY
+    if isinstance(piece, Disabled):
+        return DISABLED
+    try:
+        code = TYPECODES[type(piece)]
+    except KeyError:
+        raise ValueError(f"Cannot encode {type(piece)}")
+    code |= colors.index(piece.color) << COLORSHIFT
+    if piece.firstMove:
+        code |= _FIRSTMOVE
+    if getattr(piece, "passed", False):
+        code |= _PASSED
+    return code
+
+
+class PieceView():
+    """Lightweight view of a piece in compact board
+
+    Created on demand by CompactBoard, holds no state of its own.
+    Use toPiece() to get a full piece object.
+
+    :param board: Compact board of piece
+    :param sq: Square index of piece
+    """
+
+    __slots__ = ("_board", "_sq")
+
+    def __init__(self, board: "CompactBoard", sq: int):
+        self._board = board
+        self._sq = sq
+
+    def __str__(self):
+        return self.color[0] + self.symbol
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self}, {self.vector})"
+
+    @property
+    def code(self) -> int:
+        return self._board._codes[self._sq]
+
+    @property
+    def pieceType(self) -> type:
+        return PIECETYPES[self.code & TYPEMASK]
+
+    @property
+    def color(self) -> str:
+        return self._board._colors[self.code >> COLORSHIFT & 0b11]
+
+    @property
+    def symbol(self) -> str:
+        return _templates[self.code & TYPEMASK].symbol
+
+    @property
+    def value(self) -> int:
+        return _templates[self.code & TYPEMASK].value
+
+    @property
+    def firstMove(self) -> bool:
+        return bool(self.code & _FIRSTMOVE)
+
+    @property
+    def passed(self) -> bool:
+        return bool(self.code & _PASSED)
+
+    @property
+    def vector(self) -> ChessVector:
+        return ChessVector(divmod(self._sq, self._board._cols))
+
+    @property
+    def direction(self) -> Union[str, None]:
+        if self.pieceType is not Pawn:
+            return None
+        return dict(self._board._pawns)[self.color][0]
+
+    @property
+    def rank(self) -> Union[int, None]:
+        if self.pieceType is not Pawn:
+            return None
+        direction, base = dict(self._board._pawns)[self.color]
+        return base + _forward[direction](*divmod(self._sq, self._board._cols))
+
+    def toPiece(self) -> Piece:
+        """Create a full piece object of view
+
+        :returns: New piece at position of view
+        :rtype: ``Piece``
+        """
+        if self.pieceType is Pawn:
+            piece = Pawn(self.color, self.direction, self.rank)
+            piece.passed = self.passed
+        else:
+            piece = self.pieceType(self.color)
+        piece.firstMove = self.firstMove
+        piece.vector = self.vector
+        return piece
+
+
+class CompactBoard():
+    """Compact storage of a board position
+
+    Squares are stored as one byte codes in a ``bytearray``,
+    colors, turnorder and move rules are tuples shared between
+    every compact board of the same rules.
+    Only the standard piece types and up to four colors can be stored.
+    Pieces are read through PieceView objects created on demand,
+    use toBoard() to get a full board to make moves in.
+    The history and move clocks are stored, the undo stack of the board is not.
+
+    :param board: Board to store
+    """
+
+    __slots__ = ("_rows", "_cols", "_codes", "_colors", "_turnorder", "currentTurn",
+                 "_pawns", "_rules", "_history", "_clocks")
+
+    def __init__(self, board: Board):
+        colors = tuple(board.getColors())
+        if len(colors) > _MAXCOLORS:
+            raise ValueError(f"Cannot store more than {_MAXCOLORS} colors")
+
+        self._rows = board.getRows()
+        self._cols = board.getCols()
+        self._colors = _share(colors)
+        self._turnorder = _share(tuple(board.getTurnorder()))
+        self.currentTurn = board.currentTurn
+        self._codes = bytearray(encode(item, colors) for item in board)
+
+        pawns = {}
+        for pawn in board.iterPieces():
+            if isinstance(pawn, Pawn):
+                pawnInfo = (pawn.direction, pawn.rank - _forward[pawn.direction](pawn.vector.row, pawn.vector.col))
+                if pawns.setdefault(pawn.color, pawnInfo) != pawnInfo:
+                    raise ValueError(f"Pawns of {pawn.color} do not share direction and starting rank")
+        self._pawns = _share(tuple(sorted(pawns.items())))
+
+        self._rules = _share(tuple(
+            (color,
+             _share(tuple(board.getMoves(color))),
+             _share(tuple(board.getPromoteTo(color))),
+             _share(tuple(board.getPromoteFrom(color))),
+             board.getPromoteAt(color))
+            for color in colors))
+        self._history = tuple(board.getHistory())
+        self._clocks = board.getClocks()
+
+    def __eq__(self, other):
+        if not isinstance(other, CompactBoard):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def __getitem__(self, vec: ChessVector) -> Union[PieceView, None]:
+        """Get piece at position
+
+        :param vec: Position to get
+        :returns: View of piece, None if position is empty
+        :rtype: ``PieceView`` or None
+        :raises DisabledError: If position is disabled
+        """
+        sq = vec.row * self._cols + vec.col
+        code = self._codes[sq]
+        if code == EMPTY:
+            return None
+        if code == DISABLED:
+            raise DisabledError(vec.getStr(self))
+        return PieceView(self, sq)
+
+    def _key(self) -> tuple:
+        return (self._rows, self._cols, bytes(self._codes), self._colors, self.currentTurn, self._pawns, self._rules)
+
+    def getRows(self) -> int:
+        """Get rows in board
+
+        :returns: Number of rows in board
+        :rtype: ``int``
+        """
+        return self._rows
+
+    def getCols(self) -> int:
+        """Get columns in board
+
+        :returns: Number of columns in board
+        :rtype: ``int``
+        """
+        return self._cols
+
+    def getGeometry(self) -> Geometry:
+        """Get the precomputed geometry of board
+
+        :returns: Shared geometry of board size and disabled positions
+        :rtype: ``Geometry``
+        """
+        return getGeometry(self._rows, self._cols, self._disabled())
+
+    def getColors(self) -> Tuple[str]:
+        """Get all colors of board
+
+        :returns: Colors in board
+        :rtype: ``tuple``
+        """
+        return self._colors
+
+    def getTurnorder(self) -> Tuple[str]:
+        """Get turnorder of board
+
+        :returns: Turnorder of board
+        :rtype: ``tuple``
+        """
+        return self._turnorder
+
+    def getHistory(self) -> Tuple[str]:
+        """Get history of board
+
+        :returns: History of board
+        :rtype: ``tuple``
+        """
+        return self._history
+
+    def getClocks(self) -> Tuple[int, int]:
+        """Get move clocks of board, see Board.getClocks()
+
+        :returns: Halfmove clock and move number
+        :rtype: ``tuple``
+        """
+        return self._clocks
+
+    def getCodes(self) -> bytearray:
+        """Get square codes of board
+
+        :returns: One code per square, indexed row * cols + col
+        :rtype: ``bytearray``
+        """
+        return self._codes
+
+    def iterPieces(self, *colors: str) -> Generator[PieceView, None, None]:
+        """Iterate through pieces of board
+
+        :param *colors: Colors of pieces to iterate through (default is all colors)
+        :yields: View of every piece in board
+        :ytype: ``generator``
+        """
+        indices = {self._colors.index(color) for color in colors or self._colors}
+        for sq, code in enumerate(self._codes):
+            if code != EMPTY and code != DISABLED and code >> COLORSHIFT & 0b11 in indices:
+                yield PieceView(self, sq)
+
+    def _disabled(self) -> List[ChessVector]:
+        return [ChessVector(divmod(sq, self._cols)) for sq, code in enumerate(self._codes) if code == DISABLED]
+
+    def toBoard(self, bitboards=False) -> Board:
+        """Create a full board of position
+
+        :param bitboards: Flag True to generate standard moves with bitboards (default is False)
+        :returns: New board
+        :rtype: ``Board``
+        """
+        pieces = {color: [] for color in self._colors}
+        for view in self.iterPieces():
+            pieces[view.color].append(view.toPiece())
+
+        config = {
+            "rows": self._rows,
+            "cols": self._cols,
+            "pieces": pieces,
+            "moves": {color: list(moves) for color, moves, _, _, _ in self._rules},
+            "promoteTo": {color: list(promoteTo) for color, _, promoteTo, _, _ in self._rules},
+            "promoteFrom": {color: list(promoteFrom) for color, _, _, promoteFrom, _ in self._rules},
+            "promoteAt": {color: promoteAt for color, _, _, _, promoteAt in self._rules},
+            "turnorder": list(self._turnorder),
+            "disabled": self._disabled()
+        }
+        board = Board(config, bitboards=bitboards)
+        board.currentTurn = self.currentTurn
+        board.getHistory().extend(self._history)
+        board.setClocks(*self._clocks)
+        return board
+
+
+if __name__ == "__main__":
+
+    # Do some testing
+    pass
@@ -0,0 +1,184 @@
+# Evaluation.py
+
+"""Batch evaluation of positions with NumPy
+
+Requires the optional numpy dependency, ``pip install pawnshop[numpy]``.
+Positions are stacked as an int8 array of shape (N, rows, cols)
+holding the square codes of pawnshop.Compact.
+"""
+
+from typing import Dict, Iterable, Sequence, Tuple, Union
+from .ChessBoard import Board
+from .Compact import CompactBoard, encode, TYPECODES, COLORSHIFT, TYPEMASK
+from .Pieces import *
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Material values in pawns, the king is left out as it is never captured
+DEFAULT_VALUES = {
+    Pawn: 1,
+    Knight: 3,
+    Bishop: 3,
+    Rook: 5,
+    Queen: 9,
+    King: 0
+}
+
+
+def _requireNumpy() -> None:
+    if np is None:
+        raise ImportError("Batch evaluation requires numpy, install with pip install pawnshop[numpy]")
+
+
+def stack(boards: Iterable[Union[Board, CompactBoard]], colors: Sequence[str]) -> "np.ndarray":
+    """Stack positions into one array of square codes
+
+    All boards must be of the same size.
+    Color indices of the codes follow colors,
+    pieces of colors not in colors are not allowed.
+
+    :param boards: Boards or compact boards to stack
+    :param colors: Colors in order of their color index
+    :returns: Array of shape (N, rows, cols) and dtype int8
+    :rtype: ``numpy.ndarray``
+    """
+    _requireNumpy()
+    colors = tuple(colors)
+    rows = cols = None
+    rawCodes = []
+    for board in boards:
+        if rows is None:
+            rows, cols = board.getRows(), board.getCols()
+        elif (rows, cols) != (board.getRows(), board.getCols()):
+            raise ValueError("Boards are not of the same size")
+
+        if isinstance(board, CompactBoard):
+            codes = bytes(board.getCodes())
+            if tuple(board.getColors()) != colors:
+                codes = codes.translate(_colorTranslation(tuple(board.getColors()), colors))
+        else:
+            codes = bytes(encode(item, colors) for item in board)
+        rawCodes.append(codes)
+
+    if rows is None:
+        raise ValueError("No boards to stack")
+    return np.frombuffer(b"".join(rawCodes), dtype=np.int8).reshape(len(rawCodes), rows, cols)
+
+
+def _colorTranslation(fromColors: Tuple[str], toColors: Tuple[str]) -> bytes:
+    table = bytearray(range(256))
+    for code in range(128):
+        pieceType = code & TYPEMASK
+        idx = code >> COLORSHIFT & 0b11
+        if pieceType and pieceType != TYPEMASK and idx < len(fromColors):
+            table[code] = code & ~(0b11 << COLORSHIFT) | toColors.index(fromColors[idx]) << COLORSHIFT
+    return bytes(table)
+
+
+class Evaluator():
+    """Vectorized material and piece-square table evaluator
+
+    Scores every color of a stack of positions in one call.
+    Piece-square tables are given from the perspective of a color
+    whose pawns move up, and are turned to the pawn direction of
+    every color: mirrored for "down", rotated for "left" and "right".
+    Rotated tables require a square board.
+
+    :param colors: Colors in order of their color index
+    :param directions: Pawn direction of every color (default is "up" for all)
+    :param values: Material value of piece types (default is DEFAULT_VALUES)
+    :param tables: Piece-square table of piece types, shape (rows, cols) (default is none)
+    :param rows: Rows of boards, required with tables
+    :param cols: Columns of boards, required with tables
+    """
+
+    def __init__(self, colors: Sequence[str], directions: Dict[str, str] = None,
+                 values: Dict[type, float] = None, tables: Dict[type, Sequence] = None,
+                 rows: int = None, cols: int = None):
+        _requireNumpy()
+        self.colors = tuple(colors)
+        self.directions = {color: (directions or {}).get(color, "up") for color in self.colors}
+        self.values = dict(DEFAULT_VALUES if values is None else values)
+        self.tables = dict(tables or {})
+
+        if self.tables and (rows is None or cols is None):
+            raise ValueError("rows and cols are required with piece-square tables")
+        shape = (rows or 1, cols or 1)
+
+        # Weight of every (color index, piece type) key on every square
+        self._weights = np.zeros((4 << COLORSHIFT,) + shape, dtype=np.float64)
+        for idx, color in enumerate(self.colors):
+            for pieceType, typeCode in TYPECODES.items():
+                weights = np.full(shape, self.values.get(pieceType, 0), dtype=np.float64)
+                if pieceType in self.tables:
+                    weights += self._orient(np.asarray(self.tables[pieceType], dtype=np.float64),
+                                            self.directions[color])
+                self._weights[idx << COLORSHIFT | typeCode] = weights
+
+    @classmethod
+    def forBoard(cls, board: Board, **kwargs) -> "Evaluator":
+        """Create evaluator with the colors and pawn directions of board
+
+        :param board: Board to get colors, pawn directions and size from
+        :param **kwargs: Keyword arguments of Evaluator
+        :returns: Evaluator of board
+        :rtype: ``Evaluator``
+        """
+        directions = {}
+        for piece in board.iterPieces():
+            if isinstance(piece, Pawn):
+                directions.setdefault(piece.color, piece.direction)
+        kwargs.setdefault("rows", board.getRows())
+        kwargs.setdefault("cols", board.getCols())
+        return cls(tuple(board.getColors()), directions, **kwargs)
+
+    @staticmethod
+    def _orient(table: "np.ndarray", direction: str) -> "np.ndarray":
+        if direction == "up":
+            return table
+        elif direction == "down":
+            return table[::-1, :]
+        elif table.shape[0] != table.shape[1]:
+            raise ValueError(f"Cannot turn piece-square table of shape {table.shape} to {direction}")
+        elif direction == "right":
+            return np.rot90(table, k=-1)
+        elif direction == "left":
+            return np.rot90(table, k=1)
+        raise ValueError(f"Unknown pawn direction {direction}")
+
+    def evaluate(self, positions: "np.ndarray") -> "np.ndarray":
+        """Score every color of a stack of positions
+
+        :param positions: Square codes of shape (N, rows, cols), see stack()
+        :returns: Scores of shape (N, colors), columns in order of colors
+        :rtype: ``numpy.ndarray``
+        """
+        positions = np.asarray(positions)
+        codes = positions.astype(np.intp) & ((0b11 << COLORSHIFT) | TYPEMASK)
+        if self._weights.shape[1:] == (1, 1):
+            squares = self._weights[codes, 0, 0]
+        else:
+            rows, cols = positions.shape[1:]
+            squares = self._weights[codes, np.arange(rows)[:, None], np.arange(cols)]
+
+        colorIdx = codes >> COLORSHIFT
+        return np.stack([np.where(colorIdx == idx, squares, 0).sum(axis=(1, 2))
+                         for idx in range(len(self.colors))], axis=1)
+
+    def evaluateBoards(self, boards: Iterable[Union[Board, CompactBoard]]) -> "np.ndarray":
+        """Stack and score boards
+
+        :param boards: Boards or compact boards to score
+        :returns: Scores of shape (N, colors), columns in order of colors
+        :rtype: ``numpy.ndarray``
+        """
+        return self.evaluate(stack(boards, self.colors))
+
+
+if __name__ == "__main__":
+
+    # Do some testing
+    pass
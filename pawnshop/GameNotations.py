@@ -1,17 +1,20 @@
 # GameNotations.py
 
+import io
 import re
-from copy import deepcopy
+from typing import BinaryIO, Dict, Generator, Iterable, List, TextIO, Tuple, Union
 
 from .ChessBoard import (
     initClassic,
     Board
 )
-from .configurations import ClassicConfig
+from .Variant import getVariant
 from .ChessVector import ChessVector
+from .Exceptions import IllegalMove
 from .Pieces import *
-from .Utils import toAlpha
+from .Utils import toAlpha, fromAlpha, inverseIdx
 from .Moves import (
+    Standard,
     CastleK,
     CastleQ
 )
@@ -36,140 +39,492 @@ OPTIONALTAGS = [
     "FEN"
 ]
 ALLTAGS = [*STANDARDTAGS, *OPTIONALTAGS]
+RESULTS = ("1-0", "0-1", "1/2-1/2", "*")
+
+_SANPattern = re.compile(
+    r"(?P<castleQ>[O0]-[O0]-[O0])|(?P<castleK>[O0]-[O0])"
+    r"|(?P<piece>[KQRBN]?)(?P<fromCol>[a-wyz]+)?(?P<fromRank>\d+)?x?(?P<col>[a-z]+)(?P<rank>\d+)(?:=?(?P<promote>[QRBN]))?")
+_FENColors = {"w": "white", "b": "black"}
+_FENTurns = {color: char for char, color in _FENColors.items()}
+# Direction, rank of row and starting row of pawns
+_FENPawns = {
+    "white": ("up", lambda row: 8 - row, 6),
+    "black": ("down", lambda row: row + 1, 1)
+}
+# Color, king position and rook position of castling rights
+_FENCastling = {
+    "K": ("white", (7, 4), (7, 7)),
+    "Q": ("white", (7, 4), (7, 0)),
+    "k": ("black", (0, 4), (0, 7)),
+    "q": ("black", (0, 4), (0, 0))
+}
+_tagPattern = re.compile(r"\[\s*(?P<tag>\w+)\s+\"(?P<value>(?:[^\"\\]|\\.)*)\"\s*\]")
+_movetextPattern = re.compile(r"\{[^}]*\}|;[^\n]*|\$\d+|\d+\.+|[()]|[^\s(){};]+")
 
 
 def board2PGN(board: Board, **tags) -> str:
     """Get Portable Game Notation from board
 
+    Moves are numbered per round of the turnorder,
+    the Result tag is also written after the last move.
+
     :param board: Board to get notation from
     :param **tags: Tags added to the notation
     :returns: PGN string
     :rtype: ``str``
 
-    :**tags: Tags found in STANDARDTAGS and OPTIONALTAGS
+    :**tags: Tags found in STANDARDTAGS and OPTIONALTAGS are written first,
+        in that order and case, other tags follow as given
     """
-    PGNString = ""
-    tags = {t.lower(): v for t, v in tags.items()}
+    return "".join(_PGNParts(board, tags))
+
 
-    for TAG in ALLTAGS:
-        if TAG.lower() in tags:
-            PGNString += f"[{TAG} \"{str(tags[TAG.lower()])}\"]\n"
-    i = 0
-    while i * 2 < len(board.history):
-        i += 1
-        PGNString += str(i) + ". " + " ".join(board.history[(i - 1) * 2:i * 2:1]) + "\n"
+def writePGN(file: TextIO, games: Iterable[Union[Board, Tuple[Board, Dict[str, str]]]],
+             bufferSize: int = 1 << 16, **tags) -> int:
+    """Write the Portable Game Notation of many games to file
 
-    return PGNString
+    Notations are collected in a buffer which is written to file
+    in one call whenever it holds bufferSize characters,
+    so no string is built for a game and file is written in large blocks.
+    Games are separated by an empty line and can be read back with iterPGN().
+
+    :param file: Text file to write to
+    :param games: Boards, or (board, tags) tuples to add tags per game
+    :param bufferSize: Characters collected before writing to file (default is 65536)
+    :param **tags: Tags added to the notation of every game, see board2PGN()
+    :returns: Number of games written
+    :rtype: ``int``
+    """
+    buffer = []
+    size = 0
+    count = 0
+    for game in games:
+        if isinstance(game, tuple):
+            board, gameTags = game
+            gameTags = {**tags, **gameTags}
+        else:
+            board, gameTags = game, tags
+        for part in _PGNParts(board, gameTags):
+            buffer.append(part)
+            size += len(part)
+        buffer.append("\n")
+        size += 1
+        count += 1
+        if size >= bufferSize:
+            file.write("".join(buffer))
+            buffer, size = [], 0
+    if buffer:
+        file.write("".join(buffer))
+    return count
+
+
+def _PGNParts(board: Board, tags: Dict[str, str]) -> Generator[str, None, None]:
+    values = {t.lower(): v for t, v in tags.items()}
+    ordered = [(TAG, values[TAG.lower()]) for TAG in ALLTAGS if TAG.lower() in values]
+    # Other tags follow the known tags, as given
+    known = {TAG.lower() for TAG in ALLTAGS}
+    ordered += [(tag, value) for tag, value in tags.items() if tag.lower() not in known]
+    for TAG, value in ordered:
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"')
+        yield f"[{TAG} \"{value}\"]\n"
+    # The tag section is separated from the movetext by a blank line
+    if ordered:
+        yield "\n"
+    yield from _numberedMoves(board.getHistory(), len(board.getTurnorder()) or 1, " ", "\n")
+    if "result" in values:
+        yield str(values["result"]) + "\n"
+
+
+def _numberedMoves(history: List[str], players: int, sep: str, end: str) -> Generator[str, None, None]:
+    """Yield every round of history, numbered and followed by end"""
+    for i in range(0, len(history), players):
+        yield f"{i // players + 1}. {sep.join(history[i:i + players])}{end}"
 
 
 def PGN2Board(PGNString: str) -> Board:
     """Get Board object from Portable Game Notation
 
+    Only the first game of the string is read, see iterPGN() for multiple games.
+
     :param PGNString: PGN string
     :returns: Board object from PGN
     :rtype: ``Board``
     """
-    notations = re.finditer(r"\s*(?P<castleQ>O-O-O)|(?P<castleK>O-O)|(?P<piece>[A-Z]*)(?P<pcol>[a-h]?)(?P<capture>[x]?)(?P<col>[a-h]+)(?P<rank>\d+)=?(?P<promote>[A-Z]?)\+*\#?", PGNString)
-
-    board = initClassic()
-    for i, notation in enumerate(notations):
-        color = ["white", "black"][i % 2 == 1]
-        if (not notation.group("castleK") is None) or (not notation.group("castleQ") is None):
-            for king in board.kings[color]:
-                for move in board.moves[color]:
-                    if ((not notation.group("castleK") is None) and move is CastleK) or ((not notation.group("castleQ") is None) and move is CastleQ):
-                        board.movePiece(king.vector, move.getDestinations(king, board).pop(), checkMove=False, ignoreMate=True, checkForCheck=False, printOut=False, ignoreOrder=True)
-                        break
-                else:
-                    continue
-                break
+    for game in iterPGN(io.StringIO(PGNString)):
+        return game.toBoard()
+    return initClassic()
+
+
+def SAN2Move(board: Board, notation: str) -> Tuple[ChessVector, ChessVector, Union[type, None]]:
+    """Get move of Standard Algebraic Notation in board
+
+    The notation is read as a move of the current turn.
+    Candidate moves are found with Board.iterMovesTo(), which looks up pieces
+    in the piece index of board and only tests the legality of moves of pieces
+    able to reach the destination.
+
+    :param board: Board to find move in
+    :param notation: Notation of move, such as "Nbd2", "exd8=Q+" or "O-O"
+    :returns: Start, destination and promotion of move
+    :rtype: ``tuple``
+    :raises IllegalMove: If notation does not match exactly one legal move
+    """
+    color = board.currentTurn
+    match = _SANPattern.fullmatch(notation.rstrip("+#!?"))
+    if match is None:
+        raise IllegalMove(notation, color, msg="{0} is not a legal move of {1}!")
+
+    candidates = []
+    if match.group("castleK") or match.group("castleQ"):
+        castle = CastleK if match.group("castleK") else CastleQ
+        if castle in board.getMoves(color):
+            for king in board.getPiecesOfType(color, King):
+                if castle.pieceCondition(king):
+                    for targetVec in castle.getDestinations(king, board):
+                        if board.isLegal(king.vector, targetVec, move=castle):
+                            candidates.append((king.vector, targetVec, None))
+    else:
+        # Columns and ranks wider than board are rejected before they are converted
+        colWidth, rankWidth = len(toAlpha(board.getCols() - 1)), len(str(board.getRows()))
+        if any(len(match.group(group) or "") > colWidth for group in ("col", "fromCol")) \
+                or any(len(match.group(group) or "") > rankWidth for group in ("rank", "fromRank")):
+            raise IllegalMove(notation, color, msg="{0} is not a legal move of {1}!")
+
+        pieceType = pieceNotations[match.group("piece") or "P"]
+        targetVec = ChessVector(match.group("col") + match.group("rank"), board)
+        if not (0 <= targetVec.row < board.getRows() and 0 <= targetVec.col < board.getCols()):
+            raise IllegalMove(notation, color, msg="{0} is not a legal move of {1}!")
+        fromCol = fromAlpha(match.group("fromCol")) if match.group("fromCol") else None
+        fromRank = match.group("fromRank")
+        if fromCol is not None and fromCol >= board.getCols() \
+                or fromRank is not None and not 1 <= int(fromRank) <= board.getRows():
+            raise IllegalMove(notation, color, msg="{0} is not a legal move of {1}!")
+        promote = pieceNotations[match.group("promote")] if match.group("promote") else None
+
+        for piece, startVec, move in board.iterMovesTo(targetVec, color, pieceType):
+            if fromCol is not None and startVec.col != fromCol:
+                continue
+            if fromRank is not None and inverseIdx(startVec.row, board) != fromRank:
+                continue
+            promotes = move is Standard and Standard.promotes(piece, targetVec, board)
+            if promotes != (promote is not None) or promotes and promote not in board.getPromoteTo(color):
+                continue
+            candidates.append((startVec, targetVec, promote))
+
+    if len(candidates) != 1:
+        raise IllegalMove(notation, color, msg="{0} is not a legal move of {1}!")
+    return candidates[0]
+
+
+class PGNGame():
+    """Game read from Portable Game Notation
+
+    Holds the tags and moves of the game as read,
+    no board is built until toBoard() is called.
+
+    :param tags: Tags of game
+    :param moves: Moves in Standard Algebraic Notation
+    :param result: Result token after the moves, None if missing
+    """
+
+    def __init__(self, tags: Dict[str, str], moves: List[str], result: Union[str, None]):
+        self.tags = tags
+        self.moves = moves
+        self.result = result
+
+    def __repr__(self):
+        return f"PGNGame({self.tags.get('White', '?')} - {self.tags.get('Black', '?')}, {len(self.moves)} moves)"
+
+    def startBoard(self) -> Board:
+        """Get board of the starting position of game
+
+        The position of the FEN tag is used if present,
+        unless the SetUp tag is "0".
+
+        :returns: Classic board, or board of the FEN tag
+        :rtype: ``Board``
+        :raises ValueError: If the FEN tag is not a valid notation
+        """
+        if "FEN" in self.tags and self.tags.get("SetUp") != "0":
+            return FEN2Board(self.tags["FEN"])
+        return initClassic()
+
+    def toBoard(self) -> Board:
+        """Replay game from its starting position, see startBoard()
+
+        :returns: Board after the last move
+        :rtype: ``Board``
+        :raises IllegalMove: If a move is not legal
+        """
+        board = self.startBoard()
+        for notation in self.moves:
+            startVec, targetVec, promote = SAN2Move(board, notation)
+            board.movePiece(startVec, targetVec, checkMove=False, ignoreMate=True,
+                            checkForCheck=False, printout=False, promote=promote)
+        return board
+
+
+def iterPGN(file: Union[TextIO, str]) -> Generator[PGNGame, None, None]:
+    """Iterate through the games of a PGN file
+
+    The file is read line by line and only one game is kept in memory,
+    so archives of any size are read in constant memory.
+    Games are split where tags follow movetext or after a result token.
+    Comments, variations, move numbers and NAGs are skipped.
+
+    :param file: Text file or path of file to read
+    :yields: Every game in file
+    :ytype: ``generator``
+    """
+    if isinstance(file, str):
+        with open(file, "r", encoding="utf-8", errors="replace") as opened:
+            yield from iterPGN(opened)
+        return
+
+    for _, _, tags, movetext in splitPGN(file):
+        yield _parseGame(tags, movetext)
+
+
+def splitPGN(file: Union[TextIO, BinaryIO]) -> Generator[Tuple[int, int, Dict[str, str], List[str]], None, None]:
+    """Split PGN file into games without parsing their moves
+
+    Offsets are in bytes for binary files and characters for text files,
+    see iterPGN() for where games are split.
+
+    :param file: Text or binary file to read
+    :yields: Start and end offset, tags and movetext lines of every game
+    :ytype: ``generator``
+    """
+    tags = {}
+    movetext = []
+    inComment = False
+    start = offset = 0
+    for line in file:
+        size = len(line)
+        if isinstance(line, bytes):
+            line = line.decode("utf-8", errors="replace")
+        stripped = line.strip()
+        if stripped.startswith("[") and not inComment:
+            if movetext:
+                yield start, offset, tags, movetext
+                tags, movetext = {}, []
+                start = offset
+            for match in _tagPattern.finditer(stripped):
+                tags[match.group("tag")] = match.group("value").replace('\\"', '"').replace("\\\\", "\\")
+        elif stripped and not stripped.startswith("%"):
+            movetext.append(stripped)
+            inComment = _inComment(stripped, inComment)
+            if stripped.split()[-1] in RESULTS and not inComment:
+                yield start, offset + size, tags, movetext
+                tags, movetext = {}, []
+                start = offset + size
+        offset += size
+
+    if tags or movetext:
+        yield start, offset, tags, movetext
+
+
+def _inComment(line: str, inComment: bool) -> bool:
+    """Check if movetext ends inside a brace comment after line
+
+    Only line is scanned, inComment is the state before it.
+    Comments do not nest, so the last brace decides.
+    """
+    opening, closing = line.rfind("{"), line.rfind("}")
+    if opening == closing:
+        return inComment
+    return opening > closing
+
+
+def _parseGame(tags: Dict[str, str], movetext: List[str]) -> PGNGame:
+    moves = []
+    result = None
+    depth = 0
+    for token in _movetextPattern.findall("\n".join(movetext)):
+        if token == "(":
+            depth += 1
+        elif token == ")":
+            depth = max(depth - 1, 0)
+        elif depth or token[0] in "{;$" or token[0].isdigit() and token.rstrip(".").isdigit():
+            continue
+        elif token in RESULTS:
+            result = token
         else:
-            for piece in board.pieces[color]:
-                vector = ChessVector(notation.group("col") + notation.group("rank"), board)
-                if vector.matches(piece.getMoves(board)):
-                    pType = pieceNotations[notation.group("piece")]
-                    if isinstance(piece, pType):
-                        if notation.group("pcol") == "" or notation.group("pcol") == toAlpha(piece.vector.col):
-                            board.movePiece(piece.vector, vector, checkMove=False, promote=pieceNotations[notation.group("promote")], ignoreMate=True, checkForCheck=False, printOut=False, ignoreOrder=True)
-                            break
-                        else:
-                            continue
-                    else:
-                        continue
-
-    board.checkForCheck()
-    return board
+            moves.append(token)
+    return PGNGame(tags, moves, result)
 
 
-def FEN2Board(FENString: str) -> Board:
+def FEN2Board(FENString: str, bitboards=False, moveCache=0) -> Board:
     """Get Board object from Forsyth-Edwards-Notation
 
+    Pieces are created in place and the board is built in one pass,
+    with the rules of the classic variant.
+    The current turn, castling rights (firstMove of kings and rooks)
+    and en-passant target (passed pawn) are restored,
+    pawns on their starting row may move two positions.
+    Missing fields default to white to move with no castling or en-passant.
+    The halfmove clock and move number are restored, see Board.getClocks().
+
     :param FENString: Forsyth-Edwards-Notation
+    :param bitboards: Flag True to use the bitboard backend (default is False)
+    :param moveCache: Number of move lists to cache by position (default is 0, no cache)
     :returns: Board object from FEN
     :rtype: ``Board``
+    :raises ValueError: If FENString is not a valid notation
     """
-    board = Board()
-    config = deepcopy(ClassicConfig.CONFIG)
-    del config["pieces"]
-    board.setup(config)
-
-    fieldFinder = re.finditer(r"[^ ]+", FENString)
-    rowFinder = re.finditer(r"([^/]+)", next(fieldFinder).group())
-
-    for rowi, row in enumerate(rowFinder):
-        coli = 0
-        for chari, char in enumerate(row.group(0)):
-            if char.isnumeric():
-                for coli in range(coli, coli + int(char)):
-                    vector = ChessVector((rowi, coli), board)
-                    board[vector] = Empty(vector)
-                    coli += 1
+    fields = FENString.split()
+    if not 1 <= len(fields) <= 6:
+        raise ValueError(f"Invalid FEN {FENString}")
+    placement, turn, castling, enPassant, halfmove, fullmove = fields + ["w", "-", "-", "0", "1"][len(fields) - 1:]
+    if turn not in _FENColors or not halfmove.isdigit() or not fullmove.isdigit():
+        raise ValueError(f"Invalid FEN {FENString}")
+
+    rows = placement.split("/")
+    if len(rows) != 8:
+        raise ValueError(f"Invalid FEN {FENString}")
+    pieces = {"black": [], "white": []}
+    squares = {}
+    for row, rowString in enumerate(rows):
+        col = 0
+        for char in rowString:
+            if char.isdigit():
+                col += int(char)
+                continue
+            pieceType = pieceNotations.get(char.upper())
+            if pieceType is None or col > 7:
+                raise ValueError(f"Invalid FEN {FENString}")
+            color = "white" if char.isupper() else "black"
+            if pieceType is Pawn:
+                direction, rank, home = _FENPawns[color]
+                piece = Pawn(color, direction, rank(row))
+                piece.firstMove = row == home
             else:
-                vector = ChessVector((rowi, coli), board)
-
-                if char.isupper():
-                    board[vector] = pieceNotations[char]("white", direction="up")
-                elif char.islower():
-                    board[vector] = pieceNotations[char.upper()]("black", direction="down")
-                coli += 1
-
-    # No other fields are critical, might implement more later
+                piece = pieceType(color)
+            piece.vector = ChessVector((row, col))
+            pieces[color].append(piece)
+            squares[(row, col)] = piece
+            col += 1
+        if col != 8:
+            raise ValueError(f"Invalid FEN {FENString}")
+
+    # Kings and rooks may only castle as given by the castling field
+    for piece in squares.values():
+        if isinstance(piece, (King, Rook)):
+            piece.firstMove = False
+    for char in castling if castling != "-" else "":
+        if char not in _FENCastling:
+            raise ValueError(f"Invalid FEN {FENString}")
+        color, kingSquare, rookSquare = _FENCastling[char]
+        king, rook = squares.get(kingSquare), squares.get(rookSquare)
+        if isinstance(king, King) and isinstance(rook, Rook) and king.color == rook.color == color:
+            king.firstMove = rook.firstMove = True
+
+    if enPassant != "-":
+        match = re.fullmatch(r"([a-h])([36])", enPassant)
+        if match is None:
+            raise ValueError(f"Invalid FEN {FENString}")
+        row = 8 - int(match.group(2))
+        row += -1 if row == 5 else 1
+        pawn = squares.get((row, fromAlpha(match.group(1))))
+        if not isinstance(pawn, Pawn):
+            raise ValueError(f"Invalid FEN {FENString}")
+        pawn.passed = True
+
+    board = Board(getVariant("classic").newConfig(pieces), bitboards=bitboards, moveCache=moveCache)
+    board.currentTurn = _FENColors[turn]
+    board.setClocks(int(halfmove), int(fullmove))
     return board
 
 
-def board2FEN(board: Board) -> str:
+def board2FEN(board: Board, fields: int = 6) -> str:
     """Get Forsyth-Edward-Notation from board
 
-    The notation does not account for:
-    current turn, castling potential, en-passant or move count
-    - only the position is notated (I am lazy)
+    All six fields are notated by default; position, current turn,
+    castling rights (firstMove of kings and rooks), en-passant target
+    (square passed by a passed pawn) and move clocks, see Board.getClocks().
+    The notation of classic boards can be read back with FEN2Board().
+    Colors other than white and black are notated by name,
+    castling rights are only notated on 8x8 boards.
+
+    Earlier versions only notated the position,
+    pass fields=1 to get that notation.
 
     :param board: Board to get FEN from
+    :param fields: Number of leading fields to notate, 1 to 6 (default is 6)
     :returns: FEN string
     :rtype: ``str``
+    :raises ValueError: If fields is not 1 to 6
+    """
+    if not 1 <= fields <= 6:
+        raise ValueError(f"FEN has 1 to 6 fields, not {fields}")
+    placement = "/".join(_FENRows(board))
+    if fields == 1:
+        return placement
+
+    turn = _FENTurns.get(board.currentTurn, board.currentTurn or "-")
+
+    castling = ""
+    if (board.getRows(), board.getCols()) == (8, 8):
+        for char, (color, kingSquare, rookSquare) in _FENCastling.items():
+            king, rook = board._board[kingSquare[0]][kingSquare[1]], board._board[rookSquare[0]][rookSquare[1]]
+            if isinstance(king, King) and isinstance(rook, Rook) and king.color == rook.color == color \
+                    and king.firstMove and rook.firstMove:
+                castling += char
+
+    enPassant = "-"
+    for piece in board.iterPieces():
+        if isinstance(piece, Pawn) and piece.passed:
+            enPassant = (piece.vector - piece.forwardVec).getStr(board)
+            break
+
+    halfmove, fullmove = board.getClocks()
+    return " ".join([placement, turn, castling or "-", enPassant, str(halfmove), str(fullmove)][:fields])
+
+
+def writeFEN(file: TextIO, boards: Iterable[Board], bufferSize: int = 1 << 16, fields: int = 6) -> int:
+    """Write the Forsyth-Edwards-Notation of many boards to file, one per line
+
+    Lines are collected in a buffer which is written to file
+    in one call whenever it holds bufferSize characters.
+
+    :param file: Text file to write to
+    :param boards: Boards to write, see board2FEN()
+    :param bufferSize: Characters collected before writing to file (default is 65536)
+    :param fields: Number of leading fields to notate, see board2FEN() (default is 6)
+    :returns: Number of boards written
+    :rtype: ``int``
     """
-    FENString = ""
-    for rowi, row in enumerate(board._board):
+    buffer = []
+    size = 0
+    count = 0
+    for board in boards:
+        line = board2FEN(board, fields) + "\n"
+        buffer.append(line)
+        size += len(line)
+        count += 1
+        if size >= bufferSize:
+            file.write("".join(buffer))
+            buffer, size = [], 0
+    if buffer:
+        file.write("".join(buffer))
+    return count
+
+
+def _FENRows(board: Board) -> Generator[str, None, None]:
+    for row in board._board:
+        parts = []
         empty = 0
-        for coli, piece in enumerate(row):
-            if isinstance(piece, Empty) or isinstance(piece, Disabled):
+        for piece in row:
+            if isinstance(piece, (Empty, Disabled)):
                 empty += 1
-            else:
-                if empty:
-                    FENString += str(empty)
-                if piece.color == "white":
-                    ps = piece.symbol.upper()
-                elif piece.color == "black":
-                    ps = piece.symbol.lower()
-                FENString += ps
+                continue
+            if empty:
+                parts.append(str(empty))
                 empty = 0
-
+            parts.append(piece.symbol.upper() if piece.color == "white" else piece.symbol.lower())
         if empty:
-            FENString += str(empty)
-        if not rowi == board.getRows() - 1:
-            FENString += "/"
-
-    return FENString
+            parts.append(str(empty))
+        yield "".join(parts)
 
 
 def readable(historyList: List[str], players=2) -> str:
@@ -180,12 +535,7 @@ def readable(historyList: List[str], players=2) -> str:
     :returns: Readable string of history
     :rtype: ``str``
     """
-    finalString = ""
-    i = 0
-    while i * players < len(historyList):
-        i += 1
-        finalString += str(i) + ". " + " - ".join(historyList[(i - 1) * players:i * players:1]) + "\n"
-    return finalString.strip()
+    return "".join(_numberedMoves(historyList, players, " - ", "\n")).strip()
 
 
 if __name__ == "__main__":
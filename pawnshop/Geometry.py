@@ -0,0 +1,189 @@
+# Geometry.py
+
+from typing import Iterable
+from .ChessVector import ChessVector
+from .Utils import toAlpha
+
+_orthogonal = ((-1, 0), (1, 0), (0, 1), (0, -1))
+_diagonal = ((-1, -1), (-1, 1), (1, 1), (1, -1))
+_knightOffsets = ((1, 2), (1, -2), (-1, 2), (-1, -2), (2, 1), (2, -1), (-2, 1), (-2, -1))
+_kingOffsets = ((-1, 0), (-1, -1), (-1, 1), (1, 0), (1, 1), (1, -1), (0, 1), (0, -1))
+
+_geometries = {}
+
+
+class Geometry():
+    """Precomputed masks and tables of a board geometry
+
+    Squares are indexed row * cols + col, bit 0 is the top left corner.
+    Bitboards are arbitrary precision integers of rows * cols bits.
+    Disabled positions are never set in any mask or table,
+    sliding rays end before the first disabled position.
+    Use getGeometry() to get the shared instance of a geometry.
+
+    Every table exists both as bitboards (knightTable, kingTable, rayTable)
+    and as tuples of vectors (knightTargets, kingTargets, rayTargets),
+    rays are ordered from the nearest position outwards.
+    rayTable is keyed by (row, col) offset, rayTargets by offset vector.
+    squareNames and squareVectors convert between squares and string
+    notation, such as "e4", in both directions,
+    vectors holds the vector of every square index.
+
+    :param rows: Rows of board
+    :param cols: Columns of board
+    :param disabled: Disabled positions of board
+    """
+
+    def __init__(self, rows: int, cols: int, disabled: Iterable[ChessVector] = ()):
+        self.rows = rows
+        self.cols = cols
+        self.full = (1 << (rows * cols)) - 1
+        self.vectors = [ChessVector(divmod(sq, cols)) for sq in range(rows * cols)]
+
+        fileA = 0
+        for row in range(rows):
+            fileA |= 1 << (row * cols)
+
+        self.playable = self.full
+        for vec in disabled:
+            self.playable &= ~(1 << self.toSquare(vec))
+
+        # Masks of the columns that can be shifted n steps east/west without wrapping
+        self._eastMasks = [self.full]
+        self._westMasks = [self.full]
+        for n in range(1, cols):
+            self._eastMasks.append(self._eastMasks[-1] & ~(fileA << (cols - n)))
+            self._westMasks.append(self._westMasks[-1] & ~(fileA << (n - 1)))
+
+        self.knightTable = []
+        self.kingTable = []
+        self.rayTable = {offset: [] for offset in _orthogonal + _diagonal}
+        for sq in range(rows * cols):
+            bit = (1 << sq) & self.playable
+            knight = 0
+            for offset in _knightOffsets:
+                knight |= self.shift(bit, *offset)
+            king = 0
+            for offset in _orthogonal + _diagonal:
+                king |= self.shift(bit, *offset)
+                self.rayTable[offset].append(self._buildRay(bit, *offset))
+            self.knightTable.append(knight)
+            self.kingTable.append(king)
+
+        self.squareNames = [toAlpha(col) + str(rows - row) for row in range(rows) for col in range(cols)]
+        self.squareVectors = {name: self.toVector(sq) for sq, name in enumerate(self.squareNames)}
+
+        self.knightTargets = [self._buildTargets(sq, _knightOffsets) for sq in range(rows * cols)]
+        self.kingTargets = [self._buildTargets(sq, _kingOffsets) for sq in range(rows * cols)]
+        self.rayTargets = {}
+        for offset in _orthogonal + _diagonal:
+            self.rayTargets[ChessVector(offset)] = [self._buildRayTargets(sq, *offset) for sq in range(rows * cols)]
+
+    def shift(self, bb: int, dRow: int, dCol: int) -> int:
+        """Shift all bits of bitboard by offset
+
+        Bits shifted past any edge of the board or onto
+        disabled positions are dropped.
+
+        :param bb: Bitboard to shift
+        :param dRow: Rows to shift (positive is down)
+        :param dCol: Columns to shift (positive is right)
+        :returns: Shifted bitboard
+        :rtype: ``int``
+        """
+        if dCol >= self.cols or -dCol >= self.cols:
+            return 0
+        if dCol > 0:
+            bb &= self._eastMasks[dCol]
+        elif dCol < 0:
+            bb &= self._westMasks[-dCol]
+        offset = dRow * self.cols + dCol
+        if offset > 0:
+            return (bb << offset) & self.playable
+        return (bb >> -offset) & self.playable
+
+    def _buildRay(self, bit: int, dRow: int, dCol: int) -> int:
+        ray = 0
+        bb = self.shift(bit, dRow, dCol)
+        while bb:
+            ray |= bb
+            bb = self.shift(bb, dRow, dCol)
+        return ray
+
+    def _buildTargets(self, sq: int, offsets) -> tuple:
+        if not self.isPlayable(sq):
+            return ()
+        row, col = divmod(sq, self.cols)
+        targets = []
+        for dRow, dCol in offsets:
+            if self.isPlayable(row + dRow, col + dCol):
+                targets.append(ChessVector((row + dRow, col + dCol)))
+        return tuple(targets)
+
+    def _buildRayTargets(self, sq: int, dRow: int, dCol: int) -> tuple:
+        if not self.isPlayable(sq):
+            return ()
+        row, col = divmod(sq, self.cols)
+        targets = []
+        row, col = row + dRow, col + dCol
+        while self.isPlayable(row, col):
+            targets.append(ChessVector((row, col)))
+            row, col = row + dRow, col + dCol
+        return tuple(targets)
+
+    def isPlayable(self, *position: int) -> bool:
+        """Check if position is inside board and not disabled
+
+        :param position: Square index, or row and column
+        :returns: True if position is playable, else False
+        :rtype: ``bool``
+        """
+        if len(position) == 2:
+            row, col = position
+            if not (0 <= row < self.rows and 0 <= col < self.cols):
+                return False
+            sq = row * self.cols + col
+        else:
+            sq, = position
+        return bool(self.playable >> sq & 1)
+
+    def toVector(self, sq: int) -> ChessVector:
+        """Convert square index to vector
+
+        :param sq: Square index
+        :returns: Position of square
+        :rtype: ``ChessVector``
+        """
+        return self.vectors[sq]
+
+    def toSquare(self, vec: ChessVector) -> int:
+        """Convert vector to square index
+
+        :param vec: Position to convert
+        :returns: Square index
+        :rtype: ``int``
+        """
+        return vec.row * self.cols + vec.col
+
+
+def getGeometry(rows: int, cols: int, disabled: Iterable[ChessVector] = ()) -> Geometry:
+    """Get the shared geometry of a board size and disabled positions
+
+    Geometries are built once and cached for the lifetime of the process.
+
+    :param rows: Rows of board
+    :param cols: Columns of board
+    :param disabled: Disabled positions of board
+    :returns: Geometry of board
+    :rtype: ``Geometry``
+    """
+    key = (rows, cols, frozenset(vec.tuple() for vec in disabled))
+    if key not in _geometries:
+        _geometries[key] = Geometry(rows, cols, disabled)
+    return _geometries[key]
+
+
+if __name__ == "__main__":
+
+    # Do some testing
+    pass
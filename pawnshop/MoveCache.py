@@ -0,0 +1,88 @@
+# MoveCache.py
+
+from collections import OrderedDict
+from typing import Dict, Hashable, Tuple, Union
+
+from .ChessVector import ChessVector
+
+
+class MoveCache():
+    """Bounded cache of move lists with least recently used eviction
+
+    Keys are built by the caller, typically the position hash of a board
+    with the position of the moving piece and the flags of the query.
+    Values are stored as tuples so cached lists cannot be mutated by callers.
+
+    :param maxsize: Maximum number of move lists to keep
+    """
+
+    def __init__(self, maxsize: int):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable):
+        return key in self._entries
+
+    def get(self, key: Hashable) -> Union[Tuple[ChessVector], None]:
+        """Get cached move list and mark it as recently used
+
+        :param key: Key of move list
+        :returns: Cached move list, None if not cached
+        :rtype: ``tuple`` or None
+        """
+        try:
+            moves = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return moves
+
+    def put(self, key: Hashable, moves) -> None:
+        """Store move list, evicting the least recently used if full
+
+        :param key: Key of move list
+        :param moves: Moves to store
+        """
+        self._entries[key] = tuple(moves)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Remove all move lists and reset statistics
+        """
+        self._entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def getStats(self) -> Dict[str, Union[int, float]]:
+        """Get cache statistics
+
+        :returns: Hits, misses, evictions, size, maxsize and hit rate of cache
+        :rtype: ``dict``
+        """
+        queries = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hitRate": self.hits / queries if queries else 0.0
+        }
+
+
+if __name__ == "__main__":
+
+    # Do some testing
+    pass
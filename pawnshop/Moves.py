@@ -66,7 +66,22 @@ class Standard(Move):
         return piece.getStandardMoves(board)
 
     @classmethod
-    def action(thisMove, startPiece: Piece, targetVec: ChessVector, board: "Board", promote=None, *args, **kwargs) -> str:
+    def promotes(thisMove, piece: Piece, targetVec: ChessVector, board: "Board") -> bool:
+        """Check if piece must be promoted when moving to destination
+
+        :param piece: Piece to be moved
+        :param targetVec: Destination of piece move
+        :param board: Board to move in
+        :returns: If move is a promotion
+        :rtype: ``bool``
+        """
+        for pieceType in board.getPromoteFrom(piece.color):
+            if isinstance(piece, pieceType):
+                return piece.rank + abs((piece.vector - targetVec).tuple()[piece.forwardVec.col]) == board.getPromoteAt(piece.color)
+        return False
+
+    @classmethod
+    def action(thisMove, startPiece: Piece, targetVec: ChessVector, board: "Board", promote=None, *args, notate=True, **kwargs) -> str:
         """Performs the action of move
 
         Moves piece according to standard move rules.
@@ -76,31 +91,28 @@ class Standard(Move):
         :param targetVec: Destination of piece move
         :param board: Board to perform move in
         :param promote: Promotion type of piece (default is None)
-        :returns: Notation of move
+        :param notate: Flag False to skip creating the notation (default is True)
+        :returns: Notation of move, empty if notate is False
         :rtype: ``str``
         """
-        promo = False
-
-        for pieceType in board.getPromoteFrom(startPiece.color):
-            if isinstance(startPiece, pieceType):
+        promo = thisMove.promotes(startPiece, targetVec, board)
 
-                if startPiece.rank + abs((startPiece.vector - targetVec).tuple()[startPiece.forwardVec.col]) == board.getPromoteAt(startPiece.color):
-                    if promote is None:
-                        raise PromotionError
-
-                    if promote not in board.getPromoteTo(startPiece.color):
-                        raise PromotionError(
-                            f"{startPiece.color} cannot promote to {promote}!")
-
-                    promo = True
+        if promo:
+            if promote is None:
+                raise PromotionError
 
-                break
+            if promote not in board.getPromoteTo(startPiece.color):
+                raise PromotionError(
+                    f"{startPiece.color} cannot promote to {promote}!")
 
         targetPiece = board[targetVec]
 
-        notation = createNotation(
-            board, startPiece, targetVec,
-            isPawn=isinstance(startPiece, Pawn), capture=not isinstance(targetPiece, Empty))
+        if notate:
+            notation = createNotation(
+                board, startPiece, targetVec,
+                isPawn=isinstance(startPiece, Pawn), capture=not isinstance(targetPiece, Empty))
+        else:
+            notation = ""
 
         if not isinstance(targetPiece, Empty):
             board[targetVec] = Empty(targetVec)
@@ -111,7 +123,8 @@ class Standard(Move):
             newPiece = promote(startPiece.color)
             newPiece.move(startPiece.vector)
             board[startPiece.vector] = newPiece
-            notation += "=" + newPiece.symbol
+            if notate:
+                notation += "=" + newPiece.symbol
 
         return notation
 
@@ -368,6 +381,8 @@ class EnPassant(Move):
         destList = []
         for diagVec in (piece.lDiagVec, piece.rDiagVec):
             checkVec = (piece.vector - piece.forwardVec) + diagVec
+            if checkVec.row < 0 or checkVec.col < 0:
+                continue
             try:
                 if isinstance(board[checkVec], Pawn) and board[checkVec].passed and board[checkVec].forwardVec == -piece.forwardVec:
                     destList.append(piece.vector + diagVec)
@@ -376,7 +391,7 @@ class EnPassant(Move):
         return destList
 
     @classmethod
-    def action(thisMove, piece: Piece, targetVec: ChessVector, board: "Board", *args, **kwargs) -> str:
+    def action(thisMove, piece: Piece, targetVec: ChessVector, board: "Board", *args, notate=True, **kwargs) -> str:
         """Performs the action of move
 
         Moves piece according to move rules.
@@ -386,11 +401,15 @@ class EnPassant(Move):
         :param startPiece: Piece to be moved
         :param targetVec: Destination of piece move
         :param board: Board to perform move in
-        :returns: Notation of move
+        :param notate: Flag False to skip creating the notation (default is True)
+        :returns: Notation of move, empty if notate is False
         :rtype: str
         """
-        notation = createNotation(board, piece, targetVec,
-            isPawn=True, capture=True)
+        if notate:
+            notation = createNotation(board, piece, targetVec,
+                isPawn=True, capture=True)
+        else:
+            notation = ""
 
         board[targetVec - piece.forwardVec] = Empty(targetVec - piece.forwardVec)
         board.swapPositions(piece.vector, targetVec)
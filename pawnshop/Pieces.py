@@ -1,10 +1,10 @@
 # Pieces.py
 
-from copy import deepcopy
 from abc import ABC, abstractmethod
 from typing import List, Tuple, TYPE_CHECKING
-from .Utils import _positivePos, _catchOutofBounce, removeDupes
+from .Utils import _positivePos, _catchOutofBounce, _bitboardMoves, _bitboardAttacks
 from .ChessVector import ChessVector
+from .Exceptions import CheckMate
 
 if TYPE_CHECKING:
     from .ChessBoard import Board
@@ -26,6 +26,9 @@ class Piece(ABC):
     :param symbol: Char symbol of piece
     """
 
+    # Attacks of sliding pieces depend on the occupancy of their lines
+    sliding = True
+
     def __init__(self, color: str, value: int, symbol: str, *args, **kwargs):
         self.vector = None
         self.color = color
@@ -42,10 +45,24 @@ class Piece(ABC):
         """
         raise NotImplementedError
 
+    def getAttacking(self, board: "Board") -> List[ChessVector]:
+        """Returns the threatened positions of piece in board
+
+        Defaults to the standard destinations of piece.
+
+        :param board: Board to check in
+        :returns: List of threatened positions
+        :rtype: ``list``
+        """
+        return self.getStandardMoves(board)
+
     def getMoves(self, board: "Board", ignoreCheck=False, ignoreMate=False) -> List[ChessVector]:
         """Returns all moves of piece in board
 
         Uses board.getMoves() method to check what moves piece is allowed to.
+        Moves leaving allied kings in check are found by making
+        and unmaking each move on the board.
+        Results are cached if board has a move cache, see Board.getMoveCache().
 
         :param board: Board to move in
         :param **Flags: Flags to pass into move
@@ -56,24 +73,32 @@ class Piece(ABC):
             :ignoreCheck (False): Ignore checks when getting moves
             :ignoreMate (False): Ignore checkmate when getting moves
         """
-        destList = []
-        for move in board.getMoves(self.color):
-            if move.pieceCondition(self):
-                destList.extend(move.getDestinations(self, board))
+        cache = board.getMoveCache()
+        if cache is not None:
+            key = (board._hash, self.vector, ignoreCheck)
+            destList = cache.get(key)
+            if destList is None:
+                destList = self._findMoves(board, ignoreCheck)
+                cache.put(key, destList)
+            destList = list(destList)
+        else:
+            destList = self._findMoves(board, ignoreCheck)
 
-        if not ignoreCheck:
-            remove = []
+        if destList and not ignoreCheck and not ignoreMate and board.getCheckmates(self.color):
+            raise CheckMate
 
-            for dest in destList:
-                testBoard = deepcopy(board)
-                testBoard.movePiece(self.vector, dest, ignoreMate=ignoreMate, checkForMate=False, printout=False, checkMove=False, promote=Queen, ignoreOrder=True)
-                if testBoard.getChecks(self.color):
-                    remove.append(dest)
+        return destList
 
-            for dest in remove:
-                destList.remove(dest)
+    def _findMoves(self, board: "Board", ignoreCheck: bool) -> List[ChessVector]:
+        moveList = []
+        for move in board.getMoves(self.color):
+            if move.pieceCondition(self):
+                moveList.extend((move, dest) for dest in move.getDestinations(self, board))
 
-        return destList
+        if ignoreCheck:
+            return [dest for _, dest in moveList]
+
+        return [dest for move, dest in moveList if board.isLegal(self.vector, dest, move=move)]
 
     def move(self, destVector: ChessVector) -> None:
         """Move piece to destination
@@ -134,6 +159,52 @@ class Piece(ABC):
         except AttributeError:
             return board.isEmpty(vector)
 
+    @_positivePos
+    @_catchOutofBounce
+    def canAttack(self, vector: ChessVector, board: "Board") -> bool:
+        """Check if piece can threaten destination in board
+
+        Any position inside the board that is not disabled can be threatened.
+
+        :param vector: Destination
+        :param board: Board to check in
+        :returns: If piece can threaten
+        :rtype: ``bool``
+        """
+        board[vector]
+        return True
+
+    def _getAttacksInLine(self, iterVector: ChessVector, board: "Board") -> List[ChessVector]:
+        """Get threatened positions in one line
+
+        Return all positions piece threatens iterating with iterVector.
+        Stops at the first occupied position, which is included.
+
+        :param iterVector: Vector to iterate positions with
+        :param board: Board to check in
+        :returns: List of threatened positions
+        :rtype: ``list``
+        """
+        rays = board.getGeometry().rayTargets.get(iterVector)
+        if rays is None:
+            attackList = []
+            newV = self.vector
+            while True:
+                newV += iterVector
+                if not self.canAttack(newV, board):
+                    break
+                attackList.append(newV)
+                if not board.isEmpty(newV):
+                    break
+            return attackList
+
+        attackList = []
+        for vec in rays[self.vector.row * board.getCols() + self.vector.col]:
+            attackList.append(vec)
+            if not isinstance(board[vec], Empty):
+                break
+        return attackList
+
     def _getMovesInLine(self, iterVector: ChessVector, board: "Board") -> List[ChessVector]:
         """Get moves in one line
 
@@ -145,16 +216,29 @@ class Piece(ABC):
         :returns: List of possible destinations
         :rtype: ``list``
         """
+        rays = board.getGeometry().rayTargets.get(iterVector)
+        if rays is None:
+            moveList = []
+            newV = self.vector
+            while True:
+                newV += iterVector
+                if self.canWalk(newV, board):
+                    moveList.append(newV)
+                elif self.canCapture(newV, board):
+                    moveList.append(newV)
+                    break
+                else:
+                    break
+            return moveList
+
         moveList = []
-        newV = self.vector
-        while True:
-            newV += iterVector
-            if self.canWalk(newV, board):
-                moveList.append(newV)
-            elif self.canCapture(newV, board):
-                moveList.append(newV)
-                break
+        for vec in rays[self.vector.row * board.getCols() + self.vector.col]:
+            item = board[vec]
+            if isinstance(item, Empty):
+                moveList.append(vec)
             else:
+                if item.color != self.color:
+                    moveList.append(vec)
                 break
         return moveList
 
@@ -167,6 +251,8 @@ class Pawn(Piece):
     :param rank: Starting rank of pawn, used to calc promote
     """
 
+    sliding = False
+
     def __init__(self, color: str, direction="up", rank=2, *args, **kwargs):
         super().__init__(color, 1, "P")
 
@@ -179,6 +265,7 @@ class Pawn(Piece):
         else:
             raise ValueError(f"Direction is not any of {_directions.keys()}")
 
+    @_bitboardMoves
     def getStandardMoves(self, board: "Board") -> List[ChessVector]:
         """Returns standard destinations of piece in board
 
@@ -223,13 +310,15 @@ class Pawn(Piece):
         """
         self.passed = False
 
-    def getAttacking(self, *args, **kwargs) -> Tuple[ChessVector]:
+    @_bitboardAttacks
+    def getAttacking(self, board: "Board", *args, **kwargs) -> List[ChessVector]:
         """Get the threatened positions of piece
 
-        :returns: Tuple of threatened positions
-        :rType: ´´tuple´´
+        :param board: Board to check in
+        :returns: List of threatened positions
+        :rType: ´´list´´
         """
-        return [self.vector + self.lDiagVec, self.vector + self.rDiagVec]
+        return [vec for vec in (self.vector + self.lDiagVec, self.vector + self.rDiagVec) if self.canAttack(vec, board)]
 
 
 class Rook(Piece):
@@ -241,6 +330,7 @@ class Rook(Piece):
     def __init__(self, color: str, *args, **kwargs):
         super().__init__(color, 5, "R")
 
+    @_bitboardMoves
     def getStandardMoves(self, board: "Board") -> List[ChessVector]:
         """Returns standard destinations of piece in board
 
@@ -254,6 +344,19 @@ class Rook(Piece):
             destList.extend(self._getMovesInLine(forwardVec, board))
         return destList
 
+    @_bitboardAttacks
+    def getAttacking(self, board: "Board") -> List[ChessVector]:
+        """Returns the threatened positions of piece in board
+
+        :param board: Board to check in
+        :returns: List of threatened positions
+        :rtype: ``list``
+        """
+        attackList = []
+        for vecTuple in _directions.values():
+            attackList.extend(self._getAttacksInLine(vecTuple[0], board))
+        return attackList
+
 
 class Knight(Piece):
     """Knight object
@@ -261,9 +364,12 @@ class Knight(Piece):
     :param color: Color of piece
     """
 
+    sliding = False
+
     def __init__(self, color: str, *args, **kwargs):
         super().__init__(color, 3, "N")
 
+    @_bitboardMoves
     def getStandardMoves(self, board: "Board") -> List[ChessVector]:
         """Returns standard destinations of piece in board
 
@@ -271,24 +377,18 @@ class Knight(Piece):
         :returns: List of standard posssible destinations
         :rtype: ``list``
         """
-        destList = []
-        offsetList = [
-            (1, 2),
-            (1, -2),
-            (-1, 2),
-            (-1, -2),
-            (2, 1),
-            (2, -1),
-            (-2, 1),
-            (-2, -1)
-        ]
-        vecList = [ChessVector(offset) for offset in offsetList]
-
-        for offsetVec in vecList:
-            destVec = self.vector + offsetVec
-            if self.canMove(destVec, board):
-                destList.append(destVec)
-        return destList
+        targets = board.getGeometry().knightTargets[self.vector.row * board.getCols() + self.vector.col]
+        return [vec for vec in targets if getattr(board[vec], "color", None) != self.color]
+
+    @_bitboardAttacks
+    def getAttacking(self, board: "Board") -> List[ChessVector]:
+        """Returns the threatened positions of piece in board
+
+        :param board: Board to check in
+        :returns: List of threatened positions
+        :rtype: ``list``
+        """
+        return list(board.getGeometry().knightTargets[self.vector.row * board.getCols() + self.vector.col])
 
 
 class Bishop(Piece):
@@ -300,6 +400,7 @@ class Bishop(Piece):
     def __init__(self, color: str, *args, **kwargs):
         super().__init__(color, 3, "B")
 
+    @_bitboardMoves
     def getStandardMoves(self, board: "Board") -> List[ChessVector]:
         """Returns standard destinations of piece in board
 
@@ -312,6 +413,19 @@ class Bishop(Piece):
             destList.extend(self._getMovesInLine(vecTuple[1], board))
         return destList
 
+    @_bitboardAttacks
+    def getAttacking(self, board: "Board") -> List[ChessVector]:
+        """Returns the threatened positions of piece in board
+
+        :param board: Board to check in
+        :returns: List of threatened positions
+        :rtype: ``list``
+        """
+        attackList = []
+        for vecTuple in _directions.values():
+            attackList.extend(self._getAttacksInLine(vecTuple[1], board))
+        return attackList
+
 
 class King(Piece):
     """King object
@@ -319,9 +433,12 @@ class King(Piece):
     :param color: Color of piece
     """
 
+    sliding = False
+
     def __init__(self, color: str, *args, **kwargs):
         super().__init__(color, int(1e10), "K")
 
+    @_bitboardMoves
     def getStandardMoves(self, board: "Board") -> List[ChessVector]:
         """Returns standard destinations of piece in board
 
@@ -329,12 +446,18 @@ class King(Piece):
         :returns: List of standard posssible destinations
         :rtype: ``list``
         """
-        destList = []
-        for offsetVec in removeDupes([vec for vecList in _directions.values() for vec in vecList]):
-            destVec = self.vector + offsetVec
-            if self.canMove(destVec, board):
-                destList.append(destVec)
-        return destList
+        targets = board.getGeometry().kingTargets[self.vector.row * board.getCols() + self.vector.col]
+        return [vec for vec in targets if getattr(board[vec], "color", None) != self.color]
+
+    @_bitboardAttacks
+    def getAttacking(self, board: "Board") -> List[ChessVector]:
+        """Returns the threatened positions of piece in board
+
+        :param board: Board to check in
+        :returns: List of threatened positions
+        :rtype: ``list``
+        """
+        return list(board.getGeometry().kingTargets[self.vector.row * board.getCols() + self.vector.col])
 
 
 class Queen(Piece):
@@ -346,6 +469,7 @@ class Queen(Piece):
     def __init__(self, color: str, *args, **kwargs):
         super().__init__(color, 9, "Q")
 
+    @_bitboardMoves
     def getStandardMoves(self, board: "Board") -> List[ChessVector]:
         """Returns standard destinations of piece in board
 
@@ -359,6 +483,20 @@ class Queen(Piece):
             destList.extend(self._getMovesInLine(vecTuple[1], board))
         return destList
 
+    @_bitboardAttacks
+    def getAttacking(self, board: "Board") -> List[ChessVector]:
+        """Returns the threatened positions of piece in board
+
+        :param board: Board to check in
+        :returns: List of threatened positions
+        :rtype: ``list``
+        """
+        attackList = []
+        for vecTuple in _directions.values():
+            attackList.extend(self._getAttacksInLine(vecTuple[0], board))
+            attackList.extend(self._getAttacksInLine(vecTuple[1], board))
+        return attackList
+
 
 class Disabled():
     """Disabled object
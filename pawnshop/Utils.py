@@ -29,6 +29,24 @@ def _positivePos(func):
     return wrapper
 
 
+def _bitboardMoves(func):
+    """Decorator for generating standard moves with the bitboards of board, if any"""
+    def wrapper(pInstance, bInstance, *args, **kwargs):
+        if getattr(bInstance, "_bitboards", None) is not None:
+            return bInstance._bitboards.getStandardMoves(pInstance)
+        return func(pInstance, bInstance, *args, **kwargs)
+    return wrapper
+
+
+def _bitboardAttacks(func):
+    """Decorator for generating threatened positions with the bitboards of board, if any"""
+    def wrapper(pInstance, bInstance, *args, **kwargs):
+        if getattr(bInstance, "_bitboards", None) is not None:
+            return bInstance._bitboards.getAttacking(pInstance)
+        return func(pInstance, bInstance, *args, **kwargs)
+    return wrapper
+
+
 def removeDupes(vectorList: List["ChessVector"]) -> List["ChessVector"]:
     """Remove duplicate positions
 
@@ -64,14 +82,13 @@ def createNotation(board: "Board", startPiece: "Piece", targetVec: "ChessVector"
 
     if not isPawn:
         notation = startPiece.symbol
-        for piece in board.iterPieces(startPiece.color):
-            if piece is not startPiece and isinstance(piece, type(startPiece)):
-                if targetVec.matches(piece.getMoves(board, ignoreCheck=True)):
-                    if piece.vector.col == startPiece.vector.col:
-                        notation += inverseIdx(startPiece.vector.row, board)
-                    else:
-                        notation += toAlpha(startPiece.vector.col)
-                    break
+        for piece, _, _ in board.iterMovesTo(targetVec, startPiece.color, type(startPiece)):
+            if piece is not startPiece:
+                if piece.vector.col == startPiece.vector.col:
+                    notation += inverseIdx(startPiece.vector.row, board)
+                else:
+                    notation += toAlpha(startPiece.vector.col)
+                break
     elif capture:
         notation = toAlpha(startPiece.vector.col)
 
@@ -129,18 +146,39 @@ def inverseIdx(idx: int, board: "Board") -> str:
 def toAlpha(num: int) -> str:
     """Convert number to alphabetical
 
-    Counts through all alpha until reaching number.
-    (I tried to make it not have to count through all alphas,
-    however, since my alpha system doesn't match any regular
-    base number system I was not able to.)
+    Counts like countAlpha(), computed in bijective base 26.
+    Boards keep the names of their own columns, see Geometry.squareNames.
 
     :param num: Number to convert
     :returns: Alphabetical string from num
     :rtype: str
     """
-    for n, notation in countAlpha():
-        if num == n:
-            return notation
+    chars = []
+    num += 1
+    while num:
+        num, rest = divmod(num - 1, 26)
+        chars.append(ascii_lowercase[rest])
+    return "".join(reversed(chars))
+
+
+def fromAlpha(alpha: str) -> int:
+    """Convert alphabetical to number
+
+    Inverse of toAlpha().
+
+    :param alpha: Alphabetical string, such as "a" or "aa"
+    :returns: Number of alpha
+    :rtype: ``int``
+    :raises ValueError: If alpha is not alphabetical
+    """
+    alpha = alpha.lower()
+    if not alpha.isalpha() or not alpha.isascii():
+        raise ValueError(f"{alpha} is not alphabetical!")
+    num = 0
+    for char in alpha:
+        num = num * 26 + ord(char) - 96
+    return num - 1
+
 
 def getResourcePath(relative_path):
     """
@@ -0,0 +1,123 @@
+# Variant.py
+
+import json
+import os
+from copy import copy, deepcopy
+from typing import Dict, List
+
+from .Geometry import getGeometry
+from .Pieces import *
+from .configurations import ClassicConfig, FourPlayerConfig
+from .Utils import getResourcePath
+
+# Configurations of the variants available through getVariant()
+VARIANTCONFIGS = {
+    "classic": ClassicConfig.CONFIG,
+    "fourplayer": FourPlayerConfig.CONFIG
+}
+
+_defaultConfigText = None
+_variants = {}
+
+
+def _defaultConfig() -> dict:
+    """Get a new dictionary of the default configuration
+
+    The configuration file is only read the first time.
+    """
+    global _defaultConfigText
+    if _defaultConfigText is None:
+        path = getResourcePath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "configurations/DefaultConfig.JSON"))
+        with open(path, "r") as default:
+            _defaultConfigText = default.read()
+    return json.loads(_defaultConfigText)
+
+
+class Variant():
+    """Board configuration compiled for creating many boards
+
+    The configuration is read once, its pieces are copied as templates
+    and its rules and geometry are shared read-only by every board
+    created from the variant.
+    Creating a board only copies the templates and the per-board containers
+    of the rules, see newConfig().
+    Pass a variant as config of Board to create a board of it.
+
+    :param config: Board configuration, as ClassicConfig.CONFIG
+    :param name: Name of variant (default is None)
+    """
+
+    def __init__(self, config: dict, name: str = None):
+        dConfig = _defaultConfig()
+        self.name = name
+        self.rows = config.get("rows") or dConfig.get("rows")
+        self.cols = config.get("cols") or dConfig.get("cols")
+        self.disabled = tuple(config.get("disabled") or dConfig.get("disabled"))
+        self.geometry = getGeometry(self.rows, self.cols, self.disabled)
+        self.turnorder = tuple(config.get("turnorder") or dConfig.get("turnorder"))
+
+        pieces = deepcopy(config.get("pieces") or dConfig.get("pieces"))
+        self.colors = tuple(pieces.keys())
+        self._templates = {color: tuple(pieceList) for color, pieceList in pieces.items()}
+
+        moves = config.get("moves") or dConfig.get("moves")
+        promoteTo = config.get("promoteTo") or dConfig.get("promoteTo")
+        promoteFrom = config.get("promoteFrom") or dConfig.get("promoteFrom")
+        self.moves = {color: list(rules) for color, rules in moves.items()}
+        self.promoteTo = {color: list(rules) for color, rules in promoteTo.items()}
+        self.promoteFrom = {color: list(rules) for color, rules in promoteFrom.items()}
+        self.promoteAt = dict(config.get("promoteAt") or dConfig.get("promteAt"))
+
+    def __repr__(self):
+        return f"Variant({self.name or '?'}, {self.rows}x{self.cols}, {len(self.colors)} colors)"
+
+    def newPieces(self) -> Dict[str, List[Piece]]:
+        """Get new pieces of the starting position
+
+        :returns: Copies of the piece templates of every color
+        :rtype: ``dict``
+        """
+        return {color: [copy(piece) for piece in templates] for color, templates in self._templates.items()}
+
+    def newConfig(self, pieces: Dict[str, List[Piece]] = None) -> dict:
+        """Get configuration of a new board
+
+        Boards remove the rules of eliminated colors from their own dictionaries,
+        so the dictionaries are new while the rule lists are shared.
+
+        :param pieces: Pieces of board (default is the starting position, see newPieces())
+        :returns: Board configuration with the variant under the key "variant"
+        :rtype: ``dict``
+        """
+        return {
+            "rows": self.rows,
+            "cols": self.cols,
+            "pieces": self.newPieces() if pieces is None else pieces,
+            "moves": dict(self.moves),
+            "promoteTo": dict(self.promoteTo),
+            "promoteFrom": dict(self.promoteFrom),
+            "promoteAt": dict(self.promoteAt),
+            "turnorder": list(self.turnorder),
+            "disabled": self.disabled,
+            "variant": self
+        }
+
+
+def getVariant(name: str) -> Variant:
+    """Get the shared variant of a name in VARIANTCONFIGS
+
+    Variants are compiled once and cached for the lifetime of the process.
+
+    :param name: Name of variant, "classic" or "fourplayer"
+    :returns: Variant of name
+    :rtype: ``Variant``
+    """
+    if name not in _variants:
+        _variants[name] = Variant(VARIANTCONFIGS[name], name)
+    return _variants[name]
+
+
+if __name__ == "__main__":
+
+    # Do some testing
+    pass
@@ -0,0 +1,78 @@
+# Zobrist.py
+
+from hashlib import blake2b
+from .ChessVector import ChessVector
+from .Pieces import *
+
+_keys = {}
+
+# Name of the flag in the key of every piece type, None if the type has no flag
+_flagNames = {}
+
+
+def _key(*fields) -> int:
+    """Get the random 64-bit key of fields
+
+    Keys are derived from the fields themselves,
+    so they are equal across processes and runs.
+    """
+    try:
+        return _keys[fields]
+    except KeyError:
+        key = int.from_bytes(blake2b(repr(fields).encode(), digest_size=8).digest(), "big")
+        _keys[fields] = key
+        return key
+
+
+def pieceKey(piece: Piece, vec: ChessVector) -> int:
+    """Get the Zobrist key of piece at position
+
+    The key of kings and rooks depends on castling eligibility (first move)
+    and the key of pawns on en-passant eligibility (passed).
+
+    :param piece: Piece to get key of
+    :param vec: Position of piece
+    :returns: 64-bit key
+    :rtype: ``int``
+    """
+    pieceType = type(piece)
+    try:
+        flagName = _flagNames[pieceType]
+    except KeyError:
+        if issubclass(pieceType, (King, Rook)):
+            flagName = "firstMove"
+        elif issubclass(pieceType, Pawn):
+            flagName = "passed"
+        else:
+            flagName = None
+        _flagNames[pieceType] = flagName
+    flag = getattr(piece, flagName) if flagName is not None else False
+    return _key(piece.symbol, piece.color, vec.row, vec.col, flag)
+
+
+def rootKey(color: str) -> int:
+    """Get the Zobrist key of the color a search is made for
+
+    Mixed into position hashes of searches whose scores depend on the root color.
+
+    :param color: Color to move at the root of search
+    :returns: 64-bit key
+    :rtype: ``int``
+    """
+    return _key("root", color)
+
+
+def turnKey(color: str) -> int:
+    """Get the Zobrist key of color to move
+
+    :param color: Color to move
+    :returns: 64-bit key
+    :rtype: ``int``
+    """
+    return _key("turn", color)
+
+
+if __name__ == "__main__":
+
+    # Do some testing
+    pass
@@ -2,5 +2,5 @@
 # import pawnshop.ChessVector
 # import pawnshop.Utils
 # import pawnshop.GameNotations
-__all__ = ["ChessVector", "ChessBoard", "GameNotations", "Utils", "Moves", "Utils", "Pieces", "Exceptions"]
+__all__ = ["ChessVector", "ChessBoard", "GameNotations", "Utils", "Moves", "Utils", "Pieces", "Exceptions", "Bitboards", "Compact", "Evaluation", "Geometry", "MoveCache", "Variant", "Zobrist"]
 from . import *
@@ -0,0 +1,492 @@
+# engine.py
+
+"""Alpha-beta search engine
+
+Finds the best move of the current turn with negamax alpha-beta search,
+iterative deepening, a transposition table, quiescence search and
+MVV-LVA, killer and history move ordering.
+Boards of more than two colors are searched paranoid, every other
+color is assumed to play against the color to move at the root.
+Run ``python -m pawnshop.engine --help`` for the command-line interface.
+"""
+
+import argparse
+import sys
+import time
+from typing import Callable, List, Tuple, Union
+
+from .ChessBoard import Board
+from .ChessVector import ChessVector
+from .Evaluation import DEFAULT_VALUES
+from .Pieces import Piece
+from .Zobrist import rootKey
+from .perft import POSITIONS, moveStr
+
+# Scores are in hundredths of a material point
+MATE = 1000000
+INFINITY = MATE + 1
+_MATE_BOUND = MATE - 1000
+_MAXPLY = 64
+
+# Bound types of transposition table entries
+EXACT = 0
+LOWER = 1
+UPPER = 2
+
+# Move ordering scores
+_TT_ORDER = 1 << 30
+_CAPTURE_ORDER = 1 << 24
+_PROMOTE_ORDER = 1 << 23
+_KILLER_ORDER = 1 << 22
+
+# Material value of every piece type met, see _pieceValue()
+_values = {}
+
+
+class _SearchAborted(Exception):
+    pass
+
+
+class TranspositionTable():
+    """Fixed size table of search results keyed by position hash
+
+    Every position hash maps to one of size slots.
+    A slot is replaced unless it holds a deeper result of the same position.
+
+    :param size: Number of slots
+    """
+
+    def __init__(self, size: int = 1 << 16):
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        self.size = size
+        self.probes = 0
+        self.hits = 0
+        self._slots = [None] * size
+
+    def __len__(self):
+        return sum(entry is not None for entry in self._slots)
+
+    def probe(self, key: int) -> Union[tuple, None]:
+        """Get entry of position
+
+        :param key: Position hash
+        :returns: (key, depth, score, bound, move) entry, None if not stored
+        :rtype: ``tuple`` or None
+        """
+        self.probes += 1
+        entry = self._slots[key % self.size]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry
+        return None
+
+    def store(self, key: int, depth: int, score: int, bound: int, move: Union[tuple, None]) -> None:
+        """Store search result of position
+
+        :param key: Position hash
+        :param depth: Depth searched
+        :param score: Score of position
+        :param bound: EXACT, LOWER or UPPER
+        :param move: Best move found as (startVec, targetVec, promote), if any
+        """
+        idx = key % self.size
+        entry = self._slots[idx]
+        if entry is None or entry[0] != key or entry[1] <= depth:
+            self._slots[idx] = (key, depth, score, bound, move)
+
+    def clear(self) -> None:
+        """Remove all entries and reset statistics
+        """
+        self._slots = [None] * self.size
+        self.probes = self.hits = 0
+
+
+class SearchResult():
+    """Result of a search
+
+    :param move: Best move as (piece, startVec, targetVec, promote), None if there are no legal moves
+    :param score: Score of move from the perspective of the searching color
+    :param depth: Depth of the last completed iteration
+    :param nodes: Number of nodes searched
+    :param seconds: Time spent searching
+    :param pv: Principal variation as (startVec, targetVec, promote) tuples
+    """
+
+    def __init__(self, move: Union[tuple, None], score: int, depth: int, nodes: int, seconds: float,
+                 pv: List[Tuple[ChessVector, ChessVector, type]]):
+        self.move = move
+        self.score = score
+        self.depth = depth
+        self.nodes = nodes
+        self.seconds = seconds
+        self.pv = pv
+
+    @property
+    def nps(self) -> float:
+        return self.nodes / self.seconds if self.seconds else 0.0
+
+    def isMate(self) -> bool:
+        """Check if score is a forced mate
+
+        :returns: True if score is a mate score, else False
+        :rtype: ``bool``
+        """
+        return abs(self.score) >= _MATE_BOUND
+
+
+class Engine():
+    """Negamax alpha-beta search of the current turn
+
+    The transposition table is kept between searches,
+    killer moves and history scores are reset for every search.
+    Scores of boards of more than two colors depend on the root color,
+    so their positions are stored under keys mixed with the root color.
+
+    :param tableSize: Number of slots of transposition table (default is 65536)
+    :param quiescence: Flag False to evaluate leaves without searching captures (default is True)
+    :param table: Table to use instead of a new one of tableSize, such as a SharedTranspositionTable (default is None)
+    """
+
+    def __init__(self, tableSize: int = 1 << 16, quiescence=True, table=None):
+        self.table = TranspositionTable(tableSize) if table is None else table
+        self.quiescence = quiescence
+        self._root = None
+        self._rootKey = 0
+        self._nodes = 0
+        self._maxNodes = None
+        self._deadline = None
+        self._stop = None
+        self._killers = []
+        self._history = {}
+        self._rootMove = None
+
+    def search(self, board: Board, depth: int = None, nodes: int = None, seconds: float = None,
+               callback: Callable[[SearchResult], None] = None,
+               stop: Callable[[], bool] = None) -> SearchResult:
+        """Search best move of the current turn
+
+        Iterations deepen until depth is reached or the node or time
+        budget runs out, the result of the last completed iteration is kept.
+        Searches to depth 4 if no limit is given.
+        The board is restored when done.
+
+        :param board: Board to search
+        :param depth: Maximum depth (default is no limit)
+        :param nodes: Maximum number of nodes (default is no limit)
+        :param seconds: Maximum time in seconds (default is no limit)
+        :param callback: Called with the result of every completed iteration (default is None)
+        :param stop: Polled during search, stops search when it returns True (default is None)
+        :returns: Result of search
+        :rtype: ``SearchResult``
+        """
+        if depth is None and nodes is None and seconds is None:
+            depth = 4
+        start = time.perf_counter()
+        self._root = board.currentTurn
+        self._rootKey = rootKey(self._root) if len(board.getColors()) > 2 else 0
+        self._nodes = 0
+        self._maxNodes = nodes
+        self._deadline = None if seconds is None else start + seconds
+        self._stop = stop
+        self._killers = [[] for _ in range(_MAXPLY + 1)]
+        self._history = {}
+
+        rootMoves = board.legalMoves()
+        if not rootMoves:
+            score = self._terminal(board, 0)
+            return SearchResult(None, score, 0, 0, time.perf_counter() - start, [])
+
+        result = SearchResult(rootMoves[0], 0, 0, 0, 0.0, [])
+        for iterDepth in range(1, min(depth or _MAXPLY, _MAXPLY) + 1):
+            try:
+                score = self._negamax(board, iterDepth, -INFINITY, INFINITY, 0)
+            except _SearchAborted:
+                break
+
+            startVec, targetVec, promote = self._rootMove
+            move = next(m for m in rootMoves if m[1:] == (startVec, targetVec, promote))
+            result = SearchResult(move, score, iterDepth, self._nodes, time.perf_counter() - start,
+                                  self._principalVariation(board, iterDepth))
+            if callback is not None:
+                callback(result)
+            if result.isMate():
+                break
+
+        result.nodes = self._nodes
+        result.seconds = time.perf_counter() - start
+        return result
+
+    def _visit(self) -> None:
+        self._nodes += 1
+        if self._maxNodes is not None and self._nodes > self._maxNodes:
+            raise _SearchAborted
+        if not self._nodes & 255:
+            if self._deadline is not None and time.perf_counter() > self._deadline:
+                raise _SearchAborted
+            if self._stop is not None and self._stop():
+                raise _SearchAborted
+
+    def _isRootSide(self, color: str) -> bool:
+        return color == self._root
+
+    def _sameSide(self, color: str, otherColor: str) -> bool:
+        # Scores are negated only when the side to move changes,
+        # consecutive opponents of the root color share one side
+        return (color == self._root) == (otherColor == self._root)
+
+    def _negamax(self, board: Board, depth: int, alpha: int, beta: int, ply: int) -> int:
+        if depth <= 0 or ply >= _MAXPLY:
+            return self._quiesce(board, alpha, beta, ply)
+        self._visit()
+
+        key = hash(board) ^ self._rootKey
+        entry = self.table.probe(key)
+        ttMove = None
+        if entry is not None:
+            _, entryDepth, entryScore, bound, ttMove = entry
+            if ply and entryDepth >= depth:
+                score = _fromTable(entryScore, ply)
+                if bound == EXACT:
+                    return score
+                elif bound == LOWER:
+                    alpha = max(alpha, score)
+                else:
+                    beta = min(beta, score)
+                if alpha >= beta:
+                    return score
+
+        moves = board.legalMoves()
+        if not moves:
+            return self._terminal(board, ply)
+
+        color = board.currentTurn
+        originalAlpha = alpha
+        best = -INFINITY
+        bestMove = None
+        for piece, startVec, targetVec, promote in self._order(board, moves, ttMove, ply):
+            capture = _isCapture(board, piece, targetVec)
+            board.makeMove(startVec, targetVec, promote=promote)
+            try:
+                if self._sameSide(color, board.currentTurn):
+                    score = self._negamax(board, depth - 1, alpha, beta, ply + 1)
+                else:
+                    score = -self._negamax(board, depth - 1, -beta, -alpha, ply + 1)
+            finally:
+                board.unmakeMove()
+
+            if score > best:
+                best = score
+                bestMove = (startVec, targetVec, promote)
+                if not ply:
+                    self._rootMove = bestMove
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                if not capture and promote is None:
+                    self._storeKiller(bestMove, ply)
+                    historyKey = (color, startVec, targetVec)
+                    self._history[historyKey] = self._history.get(historyKey, 0) + depth * depth
+                break
+
+        if best <= originalAlpha:
+            bound = UPPER
+        elif best >= beta:
+            bound = LOWER
+        else:
+            bound = EXACT
+        self.table.store(key, depth, _toTable(best, ply), bound, bestMove)
+        return best
+
+    def _quiesce(self, board: Board, alpha: int, beta: int, ply: int) -> int:
+        self._visit()
+        color = board.currentTurn
+
+        if board.getChecks(color):
+            moves = board.legalMoves()
+            if not moves:
+                return -MATE + ply
+            best = -INFINITY
+        else:
+            best = self._evaluate(board)
+            if best >= beta or not self.quiescence or ply >= _MAXPLY:
+                return best
+            alpha = max(alpha, best)
+            moves = [move for move in board.legalMoves()
+                     if move[3] is not None or _isCapture(board, move[0], move[2])]
+
+        for piece, startVec, targetVec, promote in sorted(moves, key=lambda move: _captureOrder(board, move),
+                                                          reverse=True):
+            board.makeMove(startVec, targetVec, promote=promote)
+            try:
+                if self._sameSide(color, board.currentTurn):
+                    score = self._quiesce(board, alpha, beta, ply + 1)
+                else:
+                    score = -self._quiesce(board, -beta, -alpha, ply + 1)
+            finally:
+                board.unmakeMove()
+
+            if score > best:
+                best = score
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                break
+        return best
+
+    def _terminal(self, board: Board, ply: int) -> int:
+        if board.getChecks(board.currentTurn):
+            return -MATE + ply
+        return 0
+
+    def _evaluate(self, board: Board) -> int:
+        """Material balance from the side of the current turn
+
+        The root color is scored against the average of its opponents.
+        Pieces are valued by DEFAULT_VALUES, which leaves out kings.
+        """
+        material = {color: sum(_pieceValue(piece) for piece in board.iterPieces(color))
+                    for color in board.getColors()}
+        own = material.get(self._root, 0)
+        others = [value for color, value in material.items() if color != self._root]
+        score = 100 * own - (100 * sum(others) // len(others) if others else 0)
+        return score if self._isRootSide(board.currentTurn) else -score
+
+    def _order(self, board: Board, moves: List[tuple], ttMove: Union[tuple, None], ply: int) -> List[tuple]:
+        killers = self._killers[ply]
+
+        def orderKey(move):
+            piece, startVec, targetVec, promote = move
+            key = (startVec, targetVec, promote)
+            if key == ttMove:
+                return _TT_ORDER
+            if _isCapture(board, piece, targetVec) or promote is not None:
+                return _captureOrder(board, move)
+            if key in killers:
+                return _KILLER_ORDER - killers.index(key)
+            return min(self._history.get((piece.color, startVec, targetVec), 0), _KILLER_ORDER - 2)
+
+        return sorted(moves, key=orderKey, reverse=True)
+
+    def _storeKiller(self, move: tuple, ply: int) -> None:
+        killers = self._killers[ply]
+        if move not in killers:
+            killers.insert(0, move)
+            del killers[2:]
+
+    def _principalVariation(self, board: Board, depth: int) -> List[Tuple[ChessVector, ChessVector, type]]:
+        pv = []
+        seen = set()
+        while len(pv) < depth:
+            key = hash(board) ^ self._rootKey
+            entry = self.table.probe(key)
+            if entry is None or entry[4] is None or key in seen:
+                break
+            seen.add(key)
+            if not any(move[1:] == entry[4] for move in board.legalMoves()):
+                break
+            startVec, targetVec, promote = entry[4]
+            board.makeMove(startVec, targetVec, promote=promote)
+            pv.append(entry[4])
+        for _ in pv:
+            board.unmakeMove()
+        return pv
+
+
+def _isCapture(board: Board, piece: Piece, targetVec: ChessVector) -> bool:
+    victim = board[targetVec]
+    return isinstance(victim, Piece) and victim.color != piece.color
+
+
+def _captureOrder(board: Board, move: tuple) -> int:
+    """Most valuable victim, least valuable attacker"""
+    piece, startVec, targetVec, promote = move
+    score = _PROMOTE_ORDER if promote is not None else 0
+    if _isCapture(board, piece, targetVec):
+        score += _CAPTURE_ORDER + _pieceValue(board[targetVec]) * 64 - _pieceValue(piece)
+    return score
+
+
+def _pieceValue(piece: Piece) -> int:
+    """Material value of piece by DEFAULT_VALUES of its type or nearest base type
+
+    Pieces of types not derived from a standard type are valued by their value attribute.
+    """
+    pieceType = type(piece)
+    try:
+        return _values[pieceType]
+    except KeyError:
+        value = next((DEFAULT_VALUES[base] for base in pieceType.__mro__ if base in DEFAULT_VALUES), piece.value)
+        _values[pieceType] = value
+        return value
+
+
+def _toTable(score: int, ply: int) -> int:
+    """Store mate scores relative to the position instead of the root"""
+    if score >= _MATE_BOUND:
+        return score + ply
+    if score <= -_MATE_BOUND:
+        return score - ply
+    return score
+
+
+def _fromTable(score: int, ply: int) -> int:
+    if score >= _MATE_BOUND:
+        return score - ply
+    if score <= -_MATE_BOUND:
+        return score + ply
+    return score
+
+
+def bestMove(board: Board, **kwargs) -> Union[tuple, None]:
+    """Search best move of the current turn with a new engine
+
+    :param board: Board to search
+    :param **kwargs: Limits of Engine.search()
+    :returns: Best move as (piece, startVec, targetVec, promote), None if there are no legal moves
+    :rtype: ``tuple`` or None
+    """
+    return Engine().search(board, **kwargs).move
+
+
+def main(argv: List[str] = None) -> int:
+    """Command-line entry point
+
+    :param argv: Arguments (defaults to sys.argv)
+    :returns: Exit code
+    :rtype: ``int``
+    """
+    parser = argparse.ArgumentParser(prog="python -m pawnshop.engine", description=__doc__.splitlines()[0])
+    parser.add_argument("-p", "--position", choices=POSITIONS.keys(), default="classic",
+                        help="starting position (default is classic)")
+    parser.add_argument("-d", "--depth", type=int, help="maximum depth")
+    parser.add_argument("-n", "--nodes", type=int, help="maximum number of nodes")
+    parser.add_argument("-s", "--seconds", type=float, help="maximum time in seconds")
+    parser.add_argument("--table-size", type=int, default=1 << 16, help="transposition table slots (default is 65536)")
+    parser.add_argument("-b", "--bitboards", action="store_true", help="use the bitboard backend")
+    parser.add_argument("-w", "--workers", type=int, help="search on worker processes with a shared table")
+    args = parser.parse_args(argv)
+
+    board = POSITIONS[args.position]["init"](bitboards=args.bitboards)
+
+    def report(result):
+        pv = " ".join(moveStr(board, *move) for move in result.pv)
+        print(f"depth {result.depth} score {result.score} nodes {result.nodes} "
+              f"time {result.seconds:.3f}s nps {result.nps:.0f} pv {pv}")
+
+    if args.workers:
+        from .parallel import ParallelEngine
+        with ParallelEngine(args.workers, args.table_size) as engine:
+            result = engine.search(board, depth=args.depth, nodes=args.nodes, seconds=args.seconds)
+        report(result)
+    else:
+        engine = Engine(args.table_size)
+        result = engine.search(board, depth=args.depth, nodes=args.nodes, seconds=args.seconds, callback=report)
+    if result.move is not None:
+        print(f"bestmove {moveStr(board, *result.move[1:])}")
+    print(f"{result.nodes} nodes in {result.seconds:.3f}s ({result.nps:.0f} nodes/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,208 @@
+# ingest.py
+
+"""Parallel ingestion and validation of PGN archives
+
+Splits an archive into games by byte offsets, replays the games on a
+process pool and streams one result per game back in archive order.
+Workers are sent offsets only and read their games from the file themselves.
+Run ``python -m pawnshop.ingest --help`` for the command-line interface.
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, Generator, List, Tuple, Union
+
+from .ChessBoard import initClassic
+from .Exceptions import Illegal, PromotionError, EmptyError, DisabledError
+from .GameNotations import SAN2Move, board2FEN, iterPGN, splitPGN
+
+
+class IngestedGame():
+    """Result of replaying one game of an archive
+
+    :param index: Index of game in archive
+    :param offset: Byte offset of game in archive
+    :param tags: Tags of game
+    :param result: Result token of game, the Result tag if the token is missing
+    :param fen: FEN of the position after the last legal move
+    :param plies: Number of moves replayed
+    :param illegal: First move that is not legal, or FEN tag that is not valid, None if all moves are legal
+    """
+
+    def __init__(self, index: int, offset: int, tags: Dict[str, str], result: Union[str, None],
+                 fen: str, plies: int, illegal: Union[str, None]):
+        self.index = index
+        self.offset = offset
+        self.tags = tags
+        self.result = result
+        self.fen = fen
+        self.plies = plies
+        self.illegal = illegal
+
+    def isValid(self) -> bool:
+        """Check if every move of game is legal
+
+        :returns: True if game has no illegal move, else False
+        :rtype: ``bool``
+        """
+        return self.illegal is None
+
+    def toDict(self) -> dict:
+        """Get result as a dictionary, such as for JSON output
+
+        :returns: Attributes of result
+        :rtype: ``dict``
+        """
+        return {
+            "index": self.index,
+            "offset": self.offset,
+            "tags": self.tags,
+            "result": self.result,
+            "fen": self.fen,
+            "plies": self.plies,
+            "illegal": self.illegal
+        }
+
+
+def indexPGN(path: str) -> Generator[Tuple[int, int], None, None]:
+    """Find the byte range of every game in a PGN archive
+
+    :param path: Path of archive
+    :yields: Start and end offset of every game
+    :ytype: ``generator``
+    """
+    with open(path, "rb") as file:
+        for start, end, _, _ in splitPGN(file):
+            yield start, end
+
+
+def replayGame(index: int, offset: int, text: str) -> IngestedGame:
+    """Replay the game of a PGN string
+
+    Moves are replayed from the starting position of the game,
+    see PGNGame.startBoard(), without looking for checks or checkmates,
+    replaying stops at the first illegal move.
+    A FEN tag that is not a valid notation is reported as illegal.
+    Only errors of illegal moves are caught, any other error is raised.
+
+    :param index: Index of game in archive
+    :param offset: Byte offset of game in archive
+    :param text: PGN of game
+    :returns: Result of replay
+    :rtype: ``IngestedGame``
+    """
+    game = next(iterPGN(io.StringIO(text)), None)
+    if game is None:
+        return IngestedGame(index, offset, {}, None, board2FEN(initClassic()), 0, None)
+
+    result = game.result if game.result is not None else game.tags.get("Result")
+    try:
+        board = game.startBoard()
+    except ValueError:
+        return IngestedGame(index, offset, game.tags, result, game.tags["FEN"], 0, game.tags["FEN"])
+    illegal = None
+    plies = 0
+    for notation in game.moves:
+        try:
+            startVec, targetVec, promote = SAN2Move(board, notation)
+            board.movePiece(startVec, targetVec, checkMove=False, ignoreMate=True,
+                            checkForCheck=False, printout=False, promote=promote)
+        except (Illegal, PromotionError, EmptyError, DisabledError):
+            illegal = notation
+            break
+        plies += 1
+
+    return IngestedGame(index, offset, game.tags, result, board2FEN(board), plies, illegal)
+
+
+def _replayBatch(path: str, batch: List[Tuple[int, int, int]]) -> List[IngestedGame]:
+    results = []
+    with open(path, "rb") as file:
+        for index, start, end in batch:
+            file.seek(start)
+            text = file.read(end - start).decode("utf-8", errors="replace")
+            results.append(replayGame(index, start, text))
+    return results
+
+
+def ingest(path: str, workers: int = None, batchSize: int = 32,
+           maxPending: int = None) -> Generator[IngestedGame, None, None]:
+    """Replay every game of a PGN archive on a process pool
+
+    Games are sent to workers in batches of offsets.
+    At most maxPending batches are queued or running at once and results
+    are yielded in archive order, so memory stays bounded however large
+    the archive is and however slowly results are consumed.
+
+    :param path: Path of archive
+    :param workers: Number of worker processes (default is the number of cores)
+    :param batchSize: Number of games per batch (default is 32)
+    :param maxPending: Maximum number of batches in flight (default is 4 per worker)
+    :yields: Result of every game, in archive order
+    :ytype: ``generator``
+    """
+    workers = workers or os.cpu_count() or 1
+    maxPending = maxPending or workers * 4
+    offsets = ((index, start, end) for index, (start, end) in enumerate(indexPGN(path)))
+
+    with ProcessPoolExecutor(workers) as executor:
+        pending = deque()
+        try:
+            while True:
+                while len(pending) < maxPending:
+                    batch = list(islice(offsets, batchSize))
+                    if not batch:
+                        break
+                    pending.append(executor.submit(_replayBatch, path, batch))
+                if not pending:
+                    return
+                yield from pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def main(argv: List[str] = None) -> int:
+    """Command-line entry point
+
+    :param argv: Arguments (defaults to sys.argv)
+    :returns: Exit code, 1 if any game has an illegal move
+    :rtype: ``int``
+    """
+    parser = argparse.ArgumentParser(prog="python -m pawnshop.ingest", description=__doc__.splitlines()[0])
+    parser.add_argument("archive", help="PGN archive to ingest")
+    parser.add_argument("-o", "--output", help="write results to file as JSON lines")
+    parser.add_argument("-w", "--workers", type=int, help="worker processes (default is the number of cores)")
+    parser.add_argument("-b", "--batch-size", type=int, default=32, help="games per batch (default is 32)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    games = illegal = 0
+    output = open(args.output, "w") if args.output else None
+    try:
+        for game in ingest(args.archive, args.workers, args.batch_size):
+            games += 1
+            if not game.isValid():
+                illegal += 1
+                print(f"game {game.index} at byte {game.offset}: illegal move {game.illegal} after {game.plies} plies")
+            if output is not None:
+                output.write(json.dumps(game.toDict()) + "\n")
+    finally:
+        if output is not None:
+            output.close()
+    seconds = time.perf_counter() - start
+
+    print(f"{games} games, {illegal} with illegal moves, in {seconds:.3f}s "
+          f"({games / seconds if seconds else 0:.1f} games/s)")
+    return int(bool(illegal))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
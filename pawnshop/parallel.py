@@ -0,0 +1,249 @@
+# parallel.py
+
+"""Parallel engine search on multiple cores
+
+Lazy SMP: every worker process searches the same position with its own
+Engine, sharing one transposition table in shared memory.
+Workers find each other's results in the table, which lets them skip
+work and makes the main worker reach its depth sooner.
+Positions are sent to workers as CompactBoard objects.
+"""
+
+import multiprocessing
+import os
+import struct
+import time
+from multiprocessing import shared_memory
+from typing import Tuple, Union
+
+from .ChessBoard import Board
+from .ChessVector import ChessVector
+from .Compact import CompactBoard, PIECETYPES, TYPECODES
+from .engine import Engine, SearchResult
+
+_KEYMASK = (1 << 64) - 1
+_HEADER = 64
+_SLOT = struct.Struct("<QQQ")
+
+# Bits of the first data word of a slot
+_VALID = 1 << 57
+_HASMOVE = 1 << 56
+_SCORE_OFFSET = 1 << 31
+
+
+class SharedTranspositionTable():
+    """Transposition table in shared memory
+
+    Same interface as engine.TranspositionTable, usable by several processes at once.
+    Slots are written without locks, every slot stores its key XOR its data
+    so entries torn by concurrent writes are detected and ignored.
+    Only moves with promotions to the standard piece types are stored.
+    The first byte of the block is a stop flag polled by searching workers.
+
+    :param size: Number of slots
+    :param name: Name of an existing block to attach to (default is None, create a new block)
+    """
+
+    def __init__(self, size: int = 1 << 16, name: str = None):
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        self.size = size
+        self.probes = 0
+        self.hits = 0
+        if name is None:
+            self._memory = shared_memory.SharedMemory(create=True, size=_HEADER + size * _SLOT.size)
+            self._memory.buf[:_HEADER + size * _SLOT.size] = bytes(_HEADER + size * _SLOT.size)
+            self._owner = True
+        else:
+            self._memory = shared_memory.SharedMemory(name=name)
+            self._owner = False
+
+    def __len__(self):
+        return sum(self._read(idx)[1] & _VALID != 0 for idx in range(self.size))
+
+    @property
+    def name(self) -> str:
+        return self._memory.name
+
+    def _read(self, idx: int) -> Tuple[int, int, int]:
+        return _SLOT.unpack_from(self._memory.buf, _HEADER + idx * _SLOT.size)
+
+    def probe(self, key: int) -> Union[tuple, None]:
+        """Get entry of position
+
+        :param key: Position hash
+        :returns: (key, depth, score, bound, move) entry, None if not stored
+        :rtype: ``tuple`` or None
+        """
+        self.probes += 1
+        key &= _KEYMASK
+        check, data, move = self._read(key % self.size)
+        if not data & _VALID or check ^ data ^ move != key:
+            return None
+
+        self.hits += 1
+        depth = data & 0xFF
+        bound = data >> 8 & 0b11
+        score = (data >> 16 & 0xFFFFFFFF) - _SCORE_OFFSET
+        if data & _HASMOVE:
+            startVec = ChessVector((move & 0xFF, move >> 8 & 0xFF))
+            targetVec = ChessVector((move >> 16 & 0xFF, move >> 24 & 0xFF))
+            bestMove = (startVec, targetVec, PIECETYPES[data >> 48 & 0xFF])
+        else:
+            bestMove = None
+        return (key, depth, score, bound, bestMove)
+
+    def store(self, key: int, depth: int, score: int, bound: int, move: Union[tuple, None]) -> None:
+        """Store search result of position
+
+        :param key: Position hash
+        :param depth: Depth searched
+        :param score: Score of position
+        :param bound: EXACT, LOWER or UPPER
+        :param move: Best move found as (startVec, targetVec, promote), if any
+        """
+        key &= _KEYMASK
+        idx = key % self.size
+        check, data, packedMove = self._read(idx)
+        if data & _VALID and check ^ data ^ packedMove == key and data & 0xFF > depth:
+            return
+
+        data = _VALID | depth & 0xFF | bound << 8 | (score + _SCORE_OFFSET) << 16
+        packedMove = 0
+        if move is not None and (move[2] is None or move[2] in TYPECODES):
+            startVec, targetVec, promote = move
+            data |= _HASMOVE | (TYPECODES[promote] if promote is not None else 0) << 48
+            packedMove = startVec.row | startVec.col << 8 | targetVec.row << 16 | targetVec.col << 24
+        _SLOT.pack_into(self._memory.buf, _HEADER + idx * _SLOT.size, key ^ data ^ packedMove, data, packedMove)
+
+    def clear(self) -> None:
+        """Remove all entries and reset statistics
+        """
+        self._memory.buf[_HEADER:_HEADER + self.size * _SLOT.size] = bytes(self.size * _SLOT.size)
+        self.probes = self.hits = 0
+
+    def stop(self) -> None:
+        """Set the stop flag, polled by workers through isStopped()
+        """
+        self._memory.buf[0] = 1
+
+    def resume(self) -> None:
+        """Clear the stop flag
+        """
+        self._memory.buf[0] = 0
+
+    def isStopped(self) -> bool:
+        """Check the stop flag
+
+        :returns: True if stop flag is set, else False
+        :rtype: ``bool``
+        """
+        return self._memory.buf[0] == 1
+
+    def close(self) -> None:
+        """Detach from shared memory, the block is freed by the creating table
+
+        Worker processes of a pool share the resource tracker of their parent,
+        so attached blocks are not freed when a worker exits.
+        """
+        self._memory.close()
+        if self._owner:
+            self._memory.unlink()
+
+
+# State of worker processes, set by _initWorker()
+_workerTable = None
+_workerEngine = None
+
+
+def _initWorker(name: str, size: int) -> None:
+    global _workerTable, _workerEngine
+    _workerTable = SharedTranspositionTable(size, name)
+    _workerEngine = Engine(table=_workerTable)
+
+
+def _searchWorker(compact: CompactBoard, depth: Union[int, None], nodes: Union[int, None],
+                  seconds: Union[float, None]) -> tuple:
+    board = compact.toBoard()
+    result = _workerEngine.search(board, depth=depth, nodes=nodes, seconds=seconds, stop=_workerTable.isStopped)
+    move = None if result.move is None else result.move[1:]
+    return (move, result.score, result.depth, result.nodes, result.pv)
+
+
+class ParallelEngine():
+    """Lazy SMP search on a pool of worker processes
+
+    The pool and the shared table are kept between searches,
+    call close() or use as a context manager to free them.
+    Workers store positions of boards of more than two colors under keys
+    mixed with the root color, see Engine, so entries of an earlier search
+    for another color to move are never read.
+    Only boards that can be stored as a CompactBoard can be searched.
+
+    :param workers: Number of worker processes (default is the number of cores)
+    :param tableSize: Number of slots of the shared transposition table (default is 65536)
+    """
+
+    def __init__(self, workers: int = None, tableSize: int = 1 << 16):
+        self.workers = workers or os.cpu_count() or 1
+        self.table = SharedTranspositionTable(tableSize)
+        self._pool = multiprocessing.Pool(self.workers, initializer=_initWorker, initargs=(self.table.name, tableSize))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def search(self, board: Board, depth: int = None, nodes: int = None, seconds: float = None) -> SearchResult:
+        """Search best move of the current turn on all workers
+
+        Worker 0 searches to depth, every other helper one ply deeper
+        to spread the workers over the tree.
+        Helpers are stopped when worker 0 is done and the deepest
+        completed result is returned, preferring worker 0.
+        Limits are as in Engine.search(), nodes is counted per worker.
+        Searches to depth 4 if no limit is given.
+
+        :param board: Board to search
+        :param depth: Maximum depth of worker 0 (default is no limit)
+        :param nodes: Maximum number of nodes per worker (default is no limit)
+        :param seconds: Maximum time in seconds (default is no limit)
+        :returns: Result of search, nodes of all workers summed
+        :rtype: ``SearchResult``
+        """
+        if depth is None and nodes is None and seconds is None:
+            depth = 4
+        start = time.perf_counter()
+        compact = CompactBoard(board)
+        self.table.resume()
+
+        tasks = []
+        for idx in range(self.workers):
+            workerDepth = depth + idx % 2 if depth is not None else None
+            tasks.append(self._pool.apply_async(_searchWorker, (compact, workerDepth, nodes, seconds)))
+        try:
+            results = [tasks[0].get()]
+        finally:
+            self.table.stop()
+        results.extend(task.get() for task in tasks[1:])
+
+        bestIdx = max(range(len(results)), key=lambda idx: (results[idx][2], idx == 0))
+        move, score, resultDepth, _, pv = results[bestIdx]
+        if move is not None:
+            move = next(m for m in board.legalMoves() if m[1:] == move)
+        return SearchResult(move, score, resultDepth, sum(result[3] for result in results),
+                            time.perf_counter() - start, pv)
+
+    def close(self) -> None:
+        """Stop worker processes and free the shared table
+        """
+        self._pool.terminate()
+        self._pool.join()
+        self.table.close()
+
+
+if __name__ == "__main__":
+
+    # Do some testing
+    pass
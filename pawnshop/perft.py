@@ -0,0 +1,203 @@
+# perft.py
+
+"""Perft move generation benchmark and correctness suite
+
+Counts the leaf nodes of the legal move tree to a given depth.
+Run ``python -m pawnshop.perft --help`` for the command-line interface.
+"""
+
+import argparse
+import json
+import sys
+import time
+from functools import partial
+from typing import Dict, List, Tuple
+
+from .ChessBoard import Board, initClassic, init4P
+from .ChessVector import ChessVector
+from .GameNotations import FEN2Board
+from .Pieces import pieceNotations
+
+
+def _FENPosition(FENString: str, counts: List[int]) -> dict:
+    return {
+        "init": partial(FEN2Board, FENString),
+        "fen": FENString,
+        "counts": counts,
+        "published": True
+    }
+
+
+# Reference node counts per depth, starting at depth 1.
+# Classic counts are the published perft results of the initial position,
+# the four player counts are regression counts of this implementation.
+# The FEN positions are the published reference positions
+# testing castling, en-passant, promotion and checks.
+POSITIONS = {
+    "classic": {
+        "init": initClassic,
+        "counts": [20, 400, 8902, 197281, 4865609, 119060324],
+        "published": True
+    },
+    "fourplayer": {
+        "init": init4P,
+        "counts": [20, 395, 7880, 155226],
+        "published": False
+    },
+    "kiwipete": _FENPosition("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+                             [48, 2039, 97862, 4085603, 193690690]),
+    "position3": _FENPosition("8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+                              [14, 191, 2812, 43238, 674624, 11030083]),
+    "position4": _FENPosition("r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+                              [6, 264, 9467, 422333, 15833292]),
+    "position5": _FENPosition("rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+                              [44, 1486, 62379, 2103487, 89941194])
+}
+
+
+def moveStr(board: Board, startVec: ChessVector, targetVec: ChessVector, promote=None) -> str:
+    """Get coordinate notation of move, such as e2e4 or a7a8q
+
+    :param board: Board of move
+    :param startVec: Starting position
+    :param targetVec: Destination
+    :param promote: Promotion type (default is None)
+    :returns: Coordinate notation
+    :rtype: ``str``
+    """
+    notation = startVec.getStr(board) + targetVec.getStr(board)
+    if promote is not None:
+        notation += {pType: symbol for symbol, pType in pieceNotations.items()}[promote].lower()
+    return notation
+
+
+def perft(board: Board, depth: int, table: Dict[Tuple[int, int], int] = None) -> int:
+    """Count leaf nodes of legal move tree
+
+    :param board: Board to count from, restored when done
+    :param depth: Depth to count to
+    :param table: Transposition table to reuse counts of positions (default is None)
+    :returns: Number of leaf nodes
+    :rtype: ``int``
+    """
+    if depth == 0:
+        return 1
+
+    if table is not None:
+        key = (hash(board), depth)
+        if key in table:
+            return table[key]
+
+    moveList = board.legalMoves()
+    if depth == 1:
+        nodes = len(moveList)
+    else:
+        nodes = 0
+        for _, startVec, targetVec, promote in moveList:
+            board.makeMove(startVec, targetVec, promote=promote)
+            nodes += perft(board, depth - 1, table)
+            board.unmakeMove()
+
+    if table is not None:
+        table[key] = nodes
+    return nodes
+
+
+def divide(board: Board, depth: int, table: Dict[Tuple[int, int], int] = None) -> Dict[str, int]:
+    """Count leaf nodes below every legal move
+
+    :param board: Board to count from, restored when done
+    :param depth: Depth to count to, including the divided move
+    :param table: Transposition table to reuse counts of positions (default is None)
+    :returns: Coordinate notation of moves with their leaf node count
+    :rtype: ``dict``
+    """
+    result = {}
+    for _, startVec, targetVec, promote in board.legalMoves():
+        notation = moveStr(board, startVec, targetVec, promote)
+        board.makeMove(startVec, targetVec, promote=promote)
+        result[notation] = perft(board, depth - 1, table)
+        board.unmakeMove()
+    return result
+
+
+def run(position: str, depth: int, useTable=False, bitboards=False, showDivide=False) -> dict:
+    """Run perft on a reference position
+
+    :param position: Name of position in POSITIONS
+    :param depth: Depth to count to
+    :param useTable: Flag True to use a transposition table (default is False)
+    :param bitboards: Flag True to use the bitboard backend (default is False)
+    :param showDivide: Flag True to include divide counts (default is False)
+    :returns: Result with nodes, time, nodes per second and validation
+    :rtype: ``dict``
+    """
+    reference = POSITIONS[position]
+    board = reference["init"](bitboards=bitboards)
+    table = {} if useTable else None
+
+    start = time.perf_counter()
+    if showDivide:
+        divided = divide(board, depth, table)
+        nodes = sum(divided.values())
+    else:
+        divided = None
+        nodes = perft(board, depth, table)
+    seconds = time.perf_counter() - start
+
+    expected = reference["counts"][depth - 1] if depth <= len(reference["counts"]) else None
+    result = {
+        "position": position,
+        "depth": depth,
+        "nodes": nodes,
+        "seconds": seconds,
+        "nps": nodes / seconds if seconds else None,
+        "table": useTable,
+        "bitboards": bitboards,
+        "expected": expected,
+        "published": reference["published"],
+        "valid": None if expected is None else nodes == expected
+    }
+    if divided is not None:
+        result["divide"] = divided
+    return result
+
+
+def main(argv: List[str] = None) -> int:
+    """Command-line entry point
+
+    :param argv: Arguments (defaults to sys.argv)
+    :returns: Exit code, 1 if any count does not match its reference
+    :rtype: ``int``
+    """
+    parser = argparse.ArgumentParser(prog="python -m pawnshop.perft", description=__doc__.splitlines()[0])
+    parser.add_argument("depth", type=int, nargs="?", default=3, help="depth to count to (default is 3)")
+    parser.add_argument("-p", "--position", choices=POSITIONS.keys(), action="append",
+                        help="reference position, may be repeated (default is all)")
+    parser.add_argument("-d", "--divide", action="store_true", help="print leaf node count of every move")
+    parser.add_argument("-t", "--table", action="store_true", help="use a transposition table")
+    parser.add_argument("-b", "--bitboards", action="store_true", help="use the bitboard backend")
+    parser.add_argument("-j", "--json", metavar="FILE", help="write results to JSON file")
+    args = parser.parse_args(argv)
+
+    results = []
+    for position in args.position or POSITIONS.keys():
+        result = run(position, args.depth, useTable=args.table, bitboards=args.bitboards, showDivide=args.divide)
+        results.append(result)
+
+        if args.divide:
+            for notation, nodes in result["divide"].items():
+                print(f"{notation}: {nodes}")
+        status = {None: "unknown", True: "ok", False: f"FAILED, expected {result['expected']}"}[result["valid"]]
+        print(f"{position} depth {args.depth}: {result['nodes']} nodes in {result['seconds']:.3f}s "
+              f"({result['nps'] or 0:.0f} nodes/s) {status}")
+
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(results, file, indent=4)
+
+    return int(any(result["valid"] is False for result in results))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,308 @@
+# selfplay.py
+
+"""Bulk self-play game generator
+
+Plays complete games with random or engine move choice on a pool of
+worker processes and streams them to disk as PGN or a compact binary format.
+Every game is played from its own seed, the seed of the run plus the index
+of the game, so a game and the output of a run are reproducible.
+Run ``python -m pawnshop.selfplay --help`` for the command-line interface.
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import struct
+import sys
+import time
+from typing import BinaryIO, Dict, Generator, List, TextIO, Tuple, Union
+
+from .ChessBoard import Board, initClassic, init4P
+from .ChessVector import ChessVector
+from .Compact import PIECETYPES, TYPECODES
+from .GameNotations import board2PGN
+from .engine import Engine
+
+VARIANTS = {
+    "classic": initClassic,
+    "fourplayer": init4P
+}
+_variantNames = tuple(VARIANTS)
+
+# Reasons a game ended
+CHECKMATE = 0
+STALEMATE = 1
+INSUFFICIENT = 2
+REPETITION = 3
+MAXPLIES = 4
+TERMINATIONS = ("checkmate", "stalemate", "insufficient material", "repetition", "move limit")
+
+# Binary format: MAGIC, then every game as a header followed by its moves
+MAGIC = b"PAWNGAME"
+_HEADER = struct.Struct("<qBBBH")
+_MOVE = struct.Struct("<BBBBB")
+_NOCOLOR = 0xFF
+
+_turnorders = {}
+
+
+def _turnorder(variant: str) -> List[str]:
+    if variant not in _turnorders:
+        _turnorders[variant] = list(VARIANTS[variant]().getTurnorder())
+    return _turnorders[variant]
+
+
+class Game():
+    """Self-play game
+
+    :param seed: Seed the game was played from
+    :param variant: Name of variant in VARIANTS
+    :param moves: Moves as (startVec, targetVec, promote) tuples
+    :param termination: Reason the game ended, one of the termination codes
+    :param loser: Color in checkmate, if any
+    :param board: Final board of game, replayed from moves if not given (default is None)
+    """
+
+    def __init__(self, seed: int, variant: str, moves: List[Tuple[ChessVector, ChessVector, type]],
+                 termination: int, loser: Union[str, None], board: Board = None):
+        self.seed = seed
+        self.variant = variant
+        self.moves = moves
+        self.termination = termination
+        self.loser = loser
+        self._board = board
+
+    def getBoard(self) -> Board:
+        """Get final board of game
+
+        :returns: Board after the last move
+        :rtype: ``Board``
+        """
+        if self._board is None:
+            board = VARIANTS[self.variant]()
+            for startVec, targetVec, promote in self.moves:
+                board.movePiece(startVec, targetVec, printout=False, promote=promote,
+                                checkMove=False, ignoreMate=True)
+            self._board = board
+        return self._board
+
+    def result(self) -> str:
+        """Get PGN result of game
+
+        Checkmate only decides a result in two player games.
+
+        :returns: "1-0", "0-1", "1/2-1/2" or "*"
+        :rtype: ``str``
+        """
+        if self.termination in (STALEMATE, INSUFFICIENT, REPETITION):
+            return "1/2-1/2"
+        if self.termination == CHECKMATE and self.variant == "classic":
+            return "0-1" if self.loser == "white" else "1-0"
+        return "*"
+
+    def toPGN(self, **tags) -> str:
+        """Get Portable Game Notation of game
+
+        :param **tags: Tags added to the notation, see GameNotations.board2PGN()
+        :returns: PGN string
+        :rtype: ``str``
+        """
+        tags.setdefault("Event", f"pawnshop selfplay {self.variant}")
+        tags.setdefault("Round", self.seed)
+        tags.setdefault("Result", self.result())
+        tags.setdefault("PlyCount", len(self.moves))
+        tags.setdefault("Termination", TERMINATIONS[self.termination])
+        return board2PGN(self.getBoard(), **tags)
+
+    def toBytes(self) -> bytes:
+        """Get compact binary record of game
+
+        :returns: Header and moves of game, see readGames()
+        :rtype: ``bytes``
+        """
+        loser = _turnorder(self.variant).index(self.loser) if self.loser is not None else _NOCOLOR
+        record = [_HEADER.pack(self.seed, _variantNames.index(self.variant), self.termination, loser, len(self.moves))]
+        for startVec, targetVec, promote in self.moves:
+            record.append(_MOVE.pack(startVec.row, startVec.col, targetVec.row, targetVec.col,
+                                     TYPECODES[promote] if promote is not None else 0))
+        return b"".join(record)
+
+
+def playGame(seed: int, variant: str = "classic", player: str = "random", depth: int = 1,
+             nodes: int = None, randomPlies: int = 0, maxPlies: int = 400) -> Game:
+    """Play a complete game
+
+    Games end on checkmate of any color, stalemate, insufficient material,
+    the third repetition of a position or after maxPlies.
+
+    :param seed: Seed of random move choice
+    :param variant: Name of variant in VARIANTS (default is "classic")
+    :param player: "random" or "engine" (default is "random")
+    :param depth: Search depth of engine (default is 1)
+    :param nodes: Maximum nodes per engine search (default is no limit)
+    :param randomPlies: Number of opening plies played randomly by the engine player (default is 0)
+    :param maxPlies: Maximum number of plies (default is 400)
+    :returns: Played game
+    :rtype: ``Game``
+    """
+    if player not in ("random", "engine"):
+        raise ValueError(f"Unknown player {player}")
+    board = VARIANTS[variant]()
+    rng = random.Random(seed)
+    # The engine keys table entries of boards of more than two colors by the
+    # color to move at the root, so one engine serves every color of a game
+    engine = Engine(1 << 14) if player == "engine" else None
+    seen = {}
+    moves = []
+    termination = MAXPLIES
+    loser = None
+
+    while len(moves) < maxPlies:
+        key = hash(board)
+        seen[key] = seen.get(key, 0) + 1
+        if seen[key] >= 3:
+            termination = REPETITION
+            break
+        if board.isInsufficientMaterial():
+            termination = INSUFFICIENT
+            break
+
+        legalMoves = board.legalMoves()
+        if not legalMoves:
+            if board.getChecks(board.currentTurn):
+                termination = CHECKMATE
+                loser = board.currentTurn
+            else:
+                termination = STALEMATE
+            break
+
+        if engine is None or len(moves) < randomPlies:
+            _, startVec, targetVec, promote = rng.choice(legalMoves)
+        else:
+            _, startVec, targetVec, promote = engine.search(board, depth=depth, nodes=nodes).move
+        board.movePiece(startVec, targetVec, printout=False, promote=promote, checkMove=False, ignoreMate=True)
+        moves.append((startVec, targetVec, promote))
+
+    return Game(seed, variant, moves, termination, loser, board)
+
+
+def readGames(file: BinaryIO) -> Generator[Game, None, None]:
+    """Read games of the compact binary format
+
+    :param file: Binary file written by generate()
+    :yields: Every game in file, replayed on demand
+    :ytype: ``generator``
+    :raises ValueError: If file is not of the binary format
+    """
+    if file.read(len(MAGIC)) != MAGIC:
+        raise ValueError("Not a pawnshop game file")
+    while True:
+        header = file.read(_HEADER.size)
+        if not header:
+            return
+        seed, variant, termination, loser, plies = _HEADER.unpack(header)
+        moves = []
+        for fields in _MOVE.iter_unpack(file.read(plies * _MOVE.size)):
+            startRow, startCol, targetRow, targetCol, promote = fields
+            moves.append((ChessVector((startRow, startCol)), ChessVector((targetRow, targetCol)), PIECETYPES[promote]))
+        variant = _variantNames[variant]
+        yield Game(seed, variant, moves, termination, None if loser == _NOCOLOR else _turnorder(variant)[loser])
+
+
+def _playWorker(args: tuple) -> Tuple[int, int, float, Union[str, bytes]]:
+    seed, fmt, kwargs = args
+    start = time.perf_counter()
+    game = playGame(seed, **kwargs)
+    payload = game.toPGN() + "\n" if fmt == "pgn" else game.toBytes()
+    return os.getpid(), len(game.moves), time.perf_counter() - start, payload
+
+
+def generate(games: int, file: Union[TextIO, BinaryIO], fmt: str = "pgn", workers: int = None,
+             seed: int = 0, **kwargs) -> Dict[int, Dict[str, float]]:
+    """Play games on a pool of worker processes and write them to file
+
+    Games are written in order of their seeds as they finish,
+    so the output of a run does not depend on the number of workers.
+
+    :param games: Number of games to play
+    :param file: Text file for PGN, binary file for the binary format
+    :param fmt: "pgn" or "binary" (default is "pgn")
+    :param workers: Number of worker processes, 1 plays in this process (default is the number of cores)
+    :param seed: Seed of the first game, game i is played from seed + i (default is 0)
+    :param **kwargs: Keyword arguments of playGame()
+    :returns: Games, plies, seconds and plies per second of every worker process
+    :rtype: ``dict``
+    """
+    if fmt not in ("pgn", "binary"):
+        raise ValueError(f"Unknown format {fmt}")
+    workers = workers or os.cpu_count() or 1
+    tasks = ((seed + idx, fmt, kwargs) for idx in range(games))
+    if fmt == "binary":
+        file.write(MAGIC)
+
+    stats = {}
+    if workers == 1:
+        results = map(_playWorker, tasks)
+        pool = None
+    else:
+        pool = multiprocessing.Pool(workers)
+        results = pool.imap(_playWorker, tasks, chunksize=max(1, min(16, games // (workers * 4))))
+
+    try:
+        for pid, plies, seconds, payload in results:
+            file.write(payload)
+            worker = stats.setdefault(pid, {"games": 0, "plies": 0, "seconds": 0.0})
+            worker["games"] += 1
+            worker["plies"] += plies
+            worker["seconds"] += seconds
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+
+    for worker in stats.values():
+        worker["pliesPerSecond"] = worker["plies"] / worker["seconds"] if worker["seconds"] else 0.0
+    return stats
+
+
+def main(argv: List[str] = None) -> int:
+    """Command-line entry point
+
+    :param argv: Arguments (defaults to sys.argv)
+    :returns: Exit code
+    :rtype: ``int``
+    """
+    parser = argparse.ArgumentParser(prog="python -m pawnshop.selfplay", description=__doc__.splitlines()[0])
+    parser.add_argument("games", type=int, help="number of games to play")
+    parser.add_argument("-o", "--output", required=True, help="file to write games to")
+    parser.add_argument("-f", "--format", choices=("pgn", "binary"), default="pgn", help="output format (default is pgn)")
+    parser.add_argument("-v", "--variant", choices=VARIANTS.keys(), default="classic", help="variant (default is classic)")
+    parser.add_argument("-p", "--player", choices=("random", "engine"), default="random",
+                        help="move choice (default is random)")
+    parser.add_argument("-d", "--depth", type=int, default=1, help="search depth of engine player (default is 1)")
+    parser.add_argument("-n", "--nodes", type=int, help="maximum nodes per engine search")
+    parser.add_argument("-r", "--random-plies", type=int, default=0,
+                        help="opening plies played randomly by the engine player (default is 0)")
+    parser.add_argument("-m", "--max-plies", type=int, default=400, help="maximum plies per game (default is 400)")
+    parser.add_argument("-s", "--seed", type=int, default=0, help="seed of the first game (default is 0)")
+    parser.add_argument("-w", "--workers", type=int, help="worker processes (default is the number of cores)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    with open(args.output, "w" if args.format == "pgn" else "wb") as file:
+        stats = generate(args.games, file, args.format, args.workers, args.seed, variant=args.variant,
+                         player=args.player, depth=args.depth, nodes=args.nodes,
+                         randomPlies=args.random_plies, maxPlies=args.max_plies)
+    seconds = time.perf_counter() - start
+
+    for pid, worker in sorted(stats.items()):
+        print(f"worker {pid}: {worker['games']} games, {worker['plies']} plies "
+              f"in {worker['seconds']:.3f}s ({worker['pliesPerSecond']:.0f} plies/s)")
+    totalGames = sum(worker["games"] for worker in stats.values())
+    print(f"{totalGames} games in {seconds:.3f}s ({totalGames / seconds if seconds else 0:.1f} games/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
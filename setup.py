@@ -22,9 +22,12 @@ setuptools.setup(
         "Operating System :: OS Independent",
     ],
     python_requires='>=3.6',
-    extras_requires={
+    extras_require={
         "dev": [
             "pytest>=3.7",
         ],
+        "numpy": [
+            "numpy>=1.17",
+        ],
     },
 )
@@ -0,0 +1,31 @@
+# test_10.py
+
+import pytest
+
+from pawnshop.ChessVector import ChessVector
+from pawnshop.ChessBoard import initClassic, init4P
+from pawnshop.Compact import CompactBoard
+from pawnshop.Pieces import Knight
+
+np = pytest.importorskip("numpy")
+from pawnshop.Evaluation import Evaluator, stack
+
+
+def test_material():
+    board = initClassic()
+    for start, target in [("e2", "e4"), ("d7", "d5"), ("e4", "d5")]:
+        board.movePiece(ChessVector(start, board), ChessVector(target, board), printout=False)
+
+    evaluator = Evaluator(("black", "white"))
+    scores = evaluator.evaluateBoards([initClassic(), CompactBoard(board)])
+    assert scores.tolist() == [[39, 39], [38, 39]]
+
+
+def test_tables4P():
+    board = init4P()
+    table = np.zeros((board.getRows(), board.getCols()))
+    table[-1, 4] = 1
+    evaluator = Evaluator.forBoard(board, values={}, tables={Knight: table})
+    positions = stack([board], evaluator.colors)
+    assert positions.shape == (1, 14, 14) and positions.dtype == np.int8
+    assert evaluator.evaluate(positions).tolist() == [[1, 1, 1, 1]]
@@ -0,0 +1,53 @@
+# test_11.py
+
+from pawnshop.ChessVector import ChessVector
+from pawnshop.ChessBoard import Board, initClassic
+from pawnshop.Pieces import King, Bishop, Knight
+from pawnshop.Moves import Standard
+
+
+board = initClassic()
+
+
+def move(start, target, **kwargs):
+    board.movePiece(ChessVector(start, board), ChessVector(target, board), printout=False, **kwargs)
+
+
+def endgame(*pieces):
+    placed = {"white": [], "black": []}
+    for piece, position in pieces:
+        piece.vector = ChessVector(position)
+        placed[piece.color].append(piece)
+    return Board({
+        "pieces": placed,
+        "moves": {color: [Standard] for color in placed},
+        "promoteTo": {color: [] for color in placed},
+        "promoteFrom": {color: [] for color in placed},
+        "promoteAt": {color: 8 for color in placed},
+        "turnorder": ["white", "black"]
+    })
+
+
+def test_material():
+    assert board.getMaterialSignature() == "KQRRBBNNPPPPPPPPvKQRRBBNNPPPPPPPP"
+    for m in [("e2", "e4"), ("d7", "d5"), ("e4", "d5"), ("d8", "d5")]:
+        move(*m)
+    assert board.getPieceCounts("white")["P"] == 7
+    assert board.getPieceCounts("black")["P"] == 7
+    assert board.eval("white") == board.eval("black") == sum(p.value for p in board.iterPieces("white"))
+
+    board.makeMove(ChessVector("d5", board), ChessVector("d2", board))
+    assert board.getPieceCounts("white")["P"] == 6
+    board.unmakeMove()
+    assert board.getPieceCounts("white")["P"] == 7
+    assert not board.isInsufficientMaterial()
+
+
+def test_insufficient():
+    assert endgame((King("white"), (7, 4)), (King("black"), (0, 4))).isInsufficientMaterial()
+    assert endgame((King("white"), (7, 4)), (King("black"), (0, 4)), (Knight("black"), (0, 1))).isInsufficientMaterial()
+    sameColor = endgame((King("white"), (7, 4)), (Bishop("white"), (7, 2)), (King("black"), (0, 4)), (Bishop("black"), (0, 5)))
+    assert sameColor.isInsufficientMaterial()
+    assert sameColor.getMaterialSignature() == "KBvKB"
+    otherColor = endgame((King("white"), (7, 4)), (Bishop("white"), (7, 2)), (King("black"), (0, 4)), (Bishop("black"), (0, 2)))
+    assert not otherColor.isInsufficientMaterial()
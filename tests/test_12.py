@@ -0,0 +1,44 @@
+# test_12.py
+
+from pawnshop.ChessVector import ChessVector
+from pawnshop.ChessBoard import initClassic
+
+
+board = initClassic()
+
+
+def move(start, target, **kwargs):
+    return board.movePiece(ChessVector(start, board), ChessVector(target, board), printout=False, **kwargs)
+
+
+def test_lazyChecks():
+    for m in [("f2", "f3"), ("e7", "e5"), ("g2", "g4")]:
+        move(*m, checkForCheck=False)
+    assert board.getChecks("white") is False
+
+    notation = move("d8", "h4", checkForCheck=False)
+    assert not notation.endswith("#")
+    assert board.getChecks("white") is True
+    assert board.getCheckmates("white") is True
+    assert board.getCheckmates("black") is False
+
+    board.makeMove(ChessVector("h4", board), ChessVector("h5", board))
+    assert board.getChecks("white") is False
+    board.unmakeMove()
+    assert board.getCheckmates("white") is True
+
+
+def test_mateSearch():
+    searched = []
+    replay = initClassic()
+    checkForCheck = replay.checkForCheck
+    replay.checkForCheck = lambda **kwargs: searched.append(kwargs.get("checkForMate", True)) or checkForCheck(**kwargs)
+
+    # Without checks, default moves find checks once and never search for checkmates
+    for start, target in [("e2", "e4"), ("e7", "e5"), ("f1", "c4"), ("b8", "c6"), ("d1", "h5"), ("g8", "f6")]:
+        replay.movePiece(ChessVector(start, replay), ChessVector(target, replay), printout=False)
+    assert searched == [True] + [False] * 6
+    assert replay.getCheckmates("black") is False and len(searched) == 7
+
+    notation = replay.movePiece(ChessVector("h5", replay), ChessVector("f7", replay), printout=False)
+    assert notation == "Qxf7#" and searched[-2:] == [False, True]
@@ -0,0 +1,34 @@
+# test_13.py
+
+from pawnshop.ChessVector import ChessVector
+from pawnshop.ChessBoard import Board, initClassic
+
+
+board = initClassic(moveCache=2)
+
+
+def move(start, target, **kwargs):
+    return board.movePiece(ChessVector(start, board), ChessVector(target, board), printout=False, **kwargs)
+
+
+def test_moveCache():
+    cache = board.getMoveCache()
+    knight = board[ChessVector("g1", board)]
+    moves = knight.getMoves(board)
+    assert knight.getMoves(board) == moves
+    assert cache.getStats()["hits"] == 1 and cache.getStats()["misses"] == 1
+
+    moves.clear()
+    assert len(knight.getMoves(board)) == 2
+
+    move("g1", "f3")
+    assert cache.getStats()["hits"] == 3
+    assert set(knight.getMoves(board)) == {ChessVector(vec, board) for vec in ("g1", "h4", "g5", "e5", "d4")}
+
+    board[ChessVector("b1", board)].getMoves(board)
+    assert len(cache) == 2 and cache.getStats()["evictions"] == 1
+
+    cache.clear()
+    assert len(cache) == 0 and cache.getStats()["hits"] == 0
+    assert initClassic().getMoveCache() is None
+    assert Board(moveCache=8).getMoveCache().maxsize == 8
@@ -0,0 +1,84 @@
+# test_14.py
+
+from pawnshop.ChessVector import ChessVector
+from pawnshop.ChessBoard import initClassic, init4P
+from pawnshop.GameNotations import FEN2Board
+from pawnshop.Zobrist import rootKey
+from pawnshop.engine import Engine, TranspositionTable, EXACT, _captureOrder
+
+
+board = initClassic()
+
+
+def move(start, target, **kwargs):
+    return board.movePiece(ChessVector(start, board), ChessVector(target, board), printout=False, **kwargs)
+
+
+def vecs(*moveStrs):
+    return [(ChessVector(s[:2], board), ChessVector(s[2:], board), None) for s in moveStrs]
+
+
+def test_engine():
+    for m in [("e2", "e4"), ("e7", "e5"), ("f1", "c4"), ("b8", "c6"), ("d1", "h5"), ("g8", "f6")]:
+        move(*m)
+    before = hash(board)
+    result = Engine().search(board, depth=2)
+    assert hash(board) == before
+    assert result.isMate() and result.score > 0
+    assert result.pv == vecs("h5f7")
+    assert result.move[1:] == vecs("h5f7")[0]
+
+    move("h5", "f7")
+    result = Engine().search(board, depth=2)
+    assert result.move is None and result.score < 0
+
+    limited = Engine().search(initClassic(), nodes=50)
+    assert limited.nodes <= 51 and limited.move is not None
+
+    fourPlayer = init4P()
+    result = Engine().search(fourPlayer, depth=2)
+    assert result.depth == 2 and result.move[0].color == fourPlayer.currentTurn
+
+
+def test_transpositionTable():
+    table = TranspositionTable(4)
+    table.store(5, 2, 10, EXACT, None)
+    table.store(9, 1, 20, EXACT, None)
+    assert table.probe(5) is None and table.probe(9)[2] == 20
+    table.store(9, 0, 30, EXACT, None)
+    assert table.probe(9)[2] == 20
+    assert len(table) == 1 and table.hits == 2
+
+
+def test_oneColor():
+    single = init4P()
+    for color in list(single.getColors())[1:]:
+        single.removeColor(color)
+    assert len(single.getColors()) == 1
+    single.currentTurn = next(iter(single.getColors()))
+    result = Engine().search(single, depth=1)
+    assert result.move is not None and result.score > 0
+
+
+def test_kingValue():
+    kingBoard = FEN2Board("4k3/3P4/8/8/8/8/8/4K3 w - - 0 1")
+    pawn = kingBoard[ChessVector("d7", kingBoard)]
+    captureKing = (pawn, pawn.vector, ChessVector("e8", kingBoard), None)
+    quiet = (pawn, pawn.vector, ChessVector("d8", kingBoard), None)
+    assert _captureOrder(kingBoard, captureKing) > _captureOrder(kingBoard, quiet) >= 0
+    assert Engine().search(kingBoard, depth=1).score >= 0
+
+
+def test_rootKey():
+    fourPlayer = init4P()
+    engine = Engine()
+    engine.search(fourPlayer, depth=1)
+    assert engine.table.probe(hash(fourPlayer) ^ rootKey(fourPlayer.currentTurn)) is not None
+    assert engine.table.probe(hash(fourPlayer)) is None
+
+    # Entries of another root color are not used
+    fourPlayer.currentTurn = fourPlayer.getTurnorder()[1]
+    key = hash(fourPlayer) ^ rootKey(fourPlayer.currentTurn)
+    assert engine.table.probe(key) is None
+    engine.search(fourPlayer, depth=1)
+    assert engine.table.probe(key) is not None
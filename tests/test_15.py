@@ -0,0 +1,61 @@
+# test_15.py
+
+from pawnshop.ChessVector import ChessVector
+from pawnshop.ChessBoard import initClassic, init4P
+from pawnshop.Pieces import Queen
+from pawnshop.engine import LOWER, MATE
+from pawnshop.parallel import SharedTranspositionTable, ParallelEngine
+from pawnshop.Zobrist import rootKey
+
+
+board = initClassic()
+
+
+def move(start, target, **kwargs):
+    return board.movePiece(ChessVector(start, board), ChessVector(target, board), printout=False, **kwargs)
+
+
+def test_sharedTable():
+    table = SharedTranspositionTable(8)
+    try:
+        other = SharedTranspositionTable(8, table.name)
+        bestMove = (ChessVector("b7", board), ChessVector("a8", board), Queen)
+        table.store(hash(board), 3, -MATE + 2, LOWER, bestMove)
+        assert other.probe(hash(board))[1:] == (3, -MATE + 2, LOWER, bestMove)
+        assert other.probe(hash(board) + 8) is None
+
+        other.store(hash(board), 2, 0, LOWER, None)
+        assert table.probe(hash(board))[2] == -MATE + 2
+        assert len(table) == 1
+
+        table.stop()
+        assert other.isStopped()
+        other.close()
+    finally:
+        table.close()
+
+
+def test_parallelSearch():
+    for m in [("e2", "e4"), ("e7", "e5"), ("f1", "c4"), ("b8", "c6"), ("d1", "h5"), ("g8", "f6")]:
+        move(*m)
+    before = hash(board)
+    with ParallelEngine(2, tableSize=1024) as engine:
+        result = engine.search(board, depth=2)
+    assert hash(board) == before
+    assert result.isMate()
+    assert result.move[1:] == (ChessVector("h5", board), ChessVector("f7", board), None)
+
+
+def test_parallelRoots():
+    fourPlayer = init4P()
+    with ParallelEngine(2, tableSize=4096) as engine:
+        first = fourPlayer.currentTurn
+        engine.search(fourPlayer, depth=1)
+        assert engine.table.probe(hash(fourPlayer) ^ rootKey(first)) is not None
+
+        # Shared entries of the first root are not read for another root
+        fourPlayer.currentTurn = fourPlayer.getTurnorder()[1]
+        assert engine.table.probe(hash(fourPlayer) ^ rootKey(fourPlayer.currentTurn)) is None
+        result = engine.search(fourPlayer, depth=1)
+        assert result.move[0].color == fourPlayer.currentTurn
+        assert engine.table.probe(hash(fourPlayer) ^ rootKey(fourPlayer.currentTurn)) is not None
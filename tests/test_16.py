@@ -0,0 +1,50 @@
+# test_16.py
+
+import io
+
+from pawnshop.selfplay import playGame, generate, readGames, CHECKMATE
+from pawnshop.GameNotations import board2PGN
+
+
+def test_playGame():
+    game = playGame(3, maxPlies=60)
+    assert playGame(3, maxPlies=60).moves == game.moves
+    assert len(game.moves) <= 60
+
+    pgn = game.toPGN()
+    assert "[Round \"3\"]" in pgn and pgn.strip().endswith(game.result())
+    assert board2PGN(game.getBoard()).startswith("1. ")
+
+    engineGame = playGame(1, player="engine", depth=1, randomPlies=2, maxPlies=6)
+    assert len(engineGame.moves) == 6
+
+    engineFourPlayer = playGame(4, variant="fourplayer", player="engine", depth=1, maxPlies=8)
+    assert engineFourPlayer.moves == playGame(4, variant="fourplayer", player="engine", depth=1, maxPlies=8).moves
+    assert len(engineFourPlayer.moves) == 8
+
+    fourPlayer = playGame(2, variant="fourplayer", maxPlies=12)
+    assert "1. " in fourPlayer.toPGN() and fourPlayer.getBoard().currentTurn == fourPlayer.getBoard().getTurnorder()[0]
+
+
+def test_generate():
+    file = io.BytesIO()
+    stats = generate(4, file, fmt="binary", workers=1, seed=10, maxPlies=400)
+    assert sum(worker["games"] for worker in stats.values()) == 4
+
+    file.seek(0)
+    games = list(readGames(file))
+    assert [game.seed for game in games] == [10, 11, 12, 13]
+    for game in games:
+        played = playGame(game.seed)
+        assert game.moves == played.moves
+        assert (game.termination, game.loser) == (played.termination, played.loser)
+        assert game.termination != CHECKMATE or game.loser is not None
+
+    negative = io.BytesIO()
+    generate(2, negative, fmt="binary", workers=1, seed=-5, maxPlies=10)
+    negative.seek(0)
+    assert [game.seed for game in readGames(negative)] == [-5, -4]
+
+    text = io.StringIO()
+    generate(2, text, workers=2, seed=10, maxPlies=20)
+    assert text.getvalue() == "".join(playGame(seed, maxPlies=20).toPGN() + "\n" for seed in (10, 11))
@@ -0,0 +1,70 @@
+# test_17.py
+
+import io
+
+from pawnshop.ChessVector import ChessVector
+from pawnshop.ChessBoard import initClassic
+from pawnshop.Exceptions import IllegalMove
+from pawnshop.GameNotations import iterPGN, PGN2Board, SAN2Move, board2FEN, board2PGN
+
+
+class UnsuccessfulTest(Exception):
+    pass
+
+
+PGN = """[Event "First"]
+[White "A \\"quoted\\" name"]
+
+1. e4 {comment with
+[brackets]} e5 2. Nf3 (2. f4 exf4 3. Nf3) Nc6 $1 ; rest of line
+3. Bb5 a6 4. O-O Nf6 1-0
+
+[Event "Second"]
+1. d4 d5 2. c4 *
+1. e4 e5
+"""
+
+
+def test_iterPGN():
+    games = list(iterPGN(io.StringIO(PGN)))
+    assert [game.tags.get("Event") for game in games] == ["First", "Second", None]
+    assert games[0].tags["White"] == 'A "quoted" name'
+    assert games[0].moves == ["e4", "e5", "Nf3", "Nc6", "Bb5", "a6", "O-O", "Nf6"]
+    assert [game.result for game in games] == ["1-0", "*", None]
+
+    board = games[0].toBoard()
+    assert board.getHistory()[-2:] == ["O-O", "Nf6"]
+    assert PGN2Board(board2PGN(board, Result="1-0")).getHistory() == board.getHistory()
+
+
+def test_SAN2Move():
+    board = initClassic()
+    assert SAN2Move(board, "Nf3") == (ChessVector("g1", board), ChessVector("f3", board), None)
+    for m in ["e4", "d5", "exd5", "Nf6", "Nf3", "Nxd5", "Nc3", "Nb6"]:
+        board.movePiece(*SAN2Move(board, m), printout=False)
+    assert board.getHistory()[2] == "exd5"
+
+    board.movePiece(*SAN2Move(board, "Ne4"), printout=False)
+    board.movePiece(*SAN2Move(board, "a6"), printout=False)
+    assert SAN2Move(board, "Neg5")[0] == ChessVector("e4", board)
+    assert SAN2Move(board, "N3g5")[0] == ChessVector("f3", board)
+    assert SAN2Move(board, "Nf3g5+")[0] == ChessVector("f3", board)
+
+    try:
+        SAN2Move(board, "Ng5")
+        raise UnsuccessfulTest
+    except IllegalMove:
+        pass
+
+
+def test_FENTag():
+    game = next(iterPGN(io.StringIO('[SetUp "1"]\n[FEN "4k3/8/8/8/8/8/4P3/4K3 b - - 0 1"]\n\n1... Kd7 2. e4 *\n')))
+    board = game.toBoard()
+    assert board.getHistory() == ["Kd7", "e4"]
+    assert board2FEN(board) == "8/3k4/8/8/4P3/8/8/4K3 b - e3 0 2"
+
+
+def test_longComment():
+    text = "[Event \"Long\"]\n\n1. e4 {" + "\n".join(["[x] }{ 1-0"] * 2000) + "} e5 *\n"
+    games = list(iterPGN(io.StringIO(text)))
+    assert len(games) == 1 and games[0].moves == ["e4", "e5"]
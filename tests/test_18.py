@@ -0,0 +1,62 @@
+# test_18.py
+
+import os
+import tempfile
+
+from pawnshop.GameNotations import board2FEN
+from pawnshop import ingest as ingestModule
+from pawnshop.ingest import ingest, indexPGN
+from pawnshop.selfplay import generate, playGame
+
+
+class UnsuccessfulTest(Exception):
+    pass
+
+
+def test_ingest():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "archive.pgn")
+        with open(path, "w") as file:
+            generate(5, file, workers=1, seed=20, maxPlies=40)
+            file.write("[Event \"Broken\"]\n\n1. e4 e5 2. Ke3 Nf6 *\n")
+            file.write("[Event \"Off board\"]\n\n1. e4 e0 *\n")
+            file.write("[SetUp \"1\"]\n[FEN \"4k3/8/8/8/8/8/4P3/4K3 b - - 0 1\"]\n\n1... Kd7 2. e4 *\n")
+            file.write("[FEN \"8/8/8 w - - 0 1\"]\n\n1. e4 *\n")
+
+        offsets = list(indexPGN(path))
+        assert len(offsets) == 9
+        assert all(end <= start for (_, end), (start, _) in zip(offsets, offsets[1:]))
+
+        games = list(ingest(path, workers=2, batchSize=2, maxPending=1))
+        assert [game.index for game in games] == list(range(9))
+        assert [game.offset for game in games] == [start for start, _ in offsets]
+
+        for game in games[:5]:
+            played = playGame(game.index + 20, maxPlies=40)
+            assert game.isValid() and game.plies == len(played.moves)
+            assert game.fen == board2FEN(played.getBoard())
+            assert game.result == played.result()
+
+        assert games[5].illegal == "Ke3" and games[5].plies == 2 and games[5].result == "*"
+        assert games[5].tags == {"Event": "Broken"}
+        assert games[6].illegal == "e0" and games[6].plies == 1
+
+        # Games are replayed from their FEN tag
+        assert games[7].isValid() and games[7].plies == 2
+        assert games[7].fen == "8/3k4/8/8/4P3/8/8/4K3 b - e3 0 2"
+        assert games[8].illegal == "8/8/8 w - - 0 1" and games[8].plies == 0
+
+
+def test_internalError():
+    def broken(*args, **kwargs):
+        raise KeyError("internal")
+
+    original = ingestModule.SAN2Move
+    ingestModule.SAN2Move = broken
+    try:
+        ingestModule.replayGame(0, 0, "1. e4 *\n")
+        raise UnsuccessfulTest
+    except KeyError:
+        pass
+    finally:
+        ingestModule.SAN2Move = original
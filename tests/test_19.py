@@ -0,0 +1,65 @@
+# test_19.py
+
+from pawnshop.ChessVector import ChessVector
+from pawnshop.ChessBoard import initClassic
+from pawnshop.Pieces import Knight, King, Pawn
+from pawnshop.Moves import CastleK
+from pawnshop.GameNotations import SAN2Move
+from pawnshop.Exceptions import IllegalMove
+
+
+class UnsuccessfulTest(Exception):
+    pass
+
+
+board = initClassic()
+
+
+def move(start: str, target: str):
+    board.movePiece(ChessVector(start, board), ChessVector(target, board), printout=False)
+
+
+def movesTo(target: str, color: str = None, pieceType=None) -> list:
+    targetVec = ChessVector(target, board)
+    if pieceType is None:
+        return sorted(startVec.tuple() for _, startVec, _ in board.iterMovesTo(targetVec, color))
+    return sorted(startVec.tuple() for _, startVec, _ in board.iterMovesTo(targetVec, color, pieceType))
+
+
+def test_pieceIndex():
+    assert len(board.getPiecesOfType("white", Pawn)) == 8
+    assert len(board.getPiecesOfType("black", Knight)) == 2
+    assert movesTo("e4", "white") == [ChessVector("e2", board).tuple()]
+    assert movesTo("f3", "white", Knight) == [ChessVector("g1", board).tuple()]
+    assert movesTo("e5", "white") == []
+
+
+def test_iterMovesTo():
+    for start, target in [("e2", "e4"), ("e7", "e5"), ("g1", "f3"), ("b8", "c6"),
+                          ("f1", "c4"), ("d7", "d6"), ("f3", "e5"), ("d6", "e5")]:
+        move(start, target)
+    # Captured pieces are removed from the index
+    assert len(board.getPiecesOfType("white", Knight)) == 1
+    assert len(board.getPiecesOfType("black", Pawn)) == 7
+
+    # Castling is found through the king
+    found = [m for p, _, m in board.iterMovesTo(ChessVector("g1", board), "white") if isinstance(p, King)]
+    assert found == [CastleK]
+
+    # Moves that do not answer a check are left out
+    move("c4", "f7")
+    assert movesTo("f7", "black") == [ChessVector("e8", board).tuple()]
+    assert movesTo("a6", "black") == []
+    assert board.isLegal(ChessVector("e8", board), ChessVector("f7", board), simulate=False)
+    assert not board.isLegal(ChessVector("a7", board), ChessVector("a6", board), simulate=False)
+
+
+def test_wrongDisambiguation():
+    start = initClassic()
+    assert SAN2Move(start, "Ngf3")[0] == ChessVector("g1", start)
+    for notation in ["Nzzzzzzzzzzzzc3", "Nkf3", "N9f3", "N12345678901f3", "Nf3333333333"]:
+        try:
+            SAN2Move(start, notation)
+            raise UnsuccessfulTest
+        except IllegalMove:
+            pass
@@ -0,0 +1,50 @@
+# test_20.py
+
+import io
+
+from pawnshop.ChessVector import ChessVector
+from pawnshop.ChessBoard import initClassic
+from pawnshop.GameNotations import board2FEN, board2PGN, iterPGN, readable, writeFEN, writePGN
+
+
+board = initClassic()
+
+
+def move(start: str, target: str):
+    board.movePiece(ChessVector(start, board), ChessVector(target, board), printout=False)
+
+
+def test_writePGN():
+    for start, target in [("e2", "e4"), ("e7", "e5"), ("g1", "f3")]:
+        move(start, target)
+    assert board2PGN(board, Result="*") == "[Result \"*\"]\n\n1. e4 e5\n2. Nf3\n*\n"
+
+    file = io.StringIO()
+    games = [board, (initClassic(), {"White": 'A "quoted" \\ name', "Result": "1/2-1/2"})]
+    assert writePGN(file, games, bufferSize=16, Event="Export", Result="*") == 2
+    read = list(iterPGN(io.StringIO(file.getvalue())))
+    assert [game.tags["Event"] for game in read] == ["Export", "Export"]
+    assert read[0].moves == ["e4", "e5", "Nf3"]
+    assert read[1].tags["White"] == 'A "quoted" \\ name'
+    assert [game.result for game in read] == ["*", "1/2-1/2"]
+
+
+def test_writeFEN():
+    file = io.StringIO()
+    assert writeFEN(file, [initClassic(), board]) == 2
+    assert file.getvalue().splitlines() == [board2FEN(initClassic()), board2FEN(board)]
+    assert board2FEN(board) == "rnbqkbnr/pppp1ppp/8/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R b KQkq - 1 2"
+    assert board2FEN(initClassic()) == "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+    assert board2PGN(initClassic()) == ""
+    assert board2FEN(board, fields=2) == "rnbqkbnr/pppp1ppp/8/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R b"
+
+
+def test_unknownTags():
+    pgn = board2PGN(board, Opening="King's Knight", Result="*", event="Club")
+    assert pgn.startswith("[Event \"Club\"]\n[Result \"*\"]\n[Opening \"King's Knight\"]\n\n")
+    assert next(iterPGN(io.StringIO(pgn))).tags == {"Event": "Club", "Result": "*", "Opening": "King's Knight"}
+
+
+def test_readable():
+    assert readable(["e4", "e5", "Nf3"]) == "1. e4 - e5\n2. Nf3"
+    assert readable(["a", "b", "c", "d", "e"], players=4) == "1. a - b - c - d\n2. e"
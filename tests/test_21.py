@@ -0,0 +1,66 @@
+# test_21.py
+
+from pawnshop.ChessVector import ChessVector
+from pawnshop.ChessBoard import initClassic
+from pawnshop.GameNotations import FEN2Board, board2FEN
+from pawnshop.Pieces import Empty
+
+
+class UnsuccessfulTest(Exception):
+    pass
+
+
+board = FEN2Board("r3k2r/pp3ppp/8/3pP3/8/8/PPP2PPP/R3K2R w Kq d6 0 12")
+
+
+def moves(start: str) -> list:
+    startVec = ChessVector(start, board)
+    return sorted(targetVec.getStr(board) for piece, vec, targetVec, _ in board.legalMoves() if vec is startVec)
+
+
+def test_startPosition():
+    start = FEN2Board("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1")
+    assert start == initClassic()
+    placement = FEN2Board("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR")
+    assert board2FEN(placement) == "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w - - 0 1"
+    assert not placement[ChessVector("e1", placement)].firstMove
+
+
+def test_FEN2Board():
+    assert board.currentTurn == "white"
+    assert board2FEN(board) == "r3k2r/pp3ppp/8/3pP3/8/8/PPP2PPP/R3K2R w Kq d6 0 12"
+
+    # Castling rights
+    assert moves("e1") == ["d1", "d2", "e2", "f1", "g1"]
+    assert board[ChessVector("a1", board)].firstMove is False
+    assert board[ChessVector("a8", board)].firstMove is True
+    assert board[ChessVector("h8", board)].firstMove is False
+
+    # En-passant target and pawns off their starting row
+    assert moves("e5") == ["d6", "e6"]
+    board.movePiece(ChessVector("e5", board), ChessVector("d6", board), printout=False)
+    assert isinstance(board[ChessVector("d5", board)], Empty)
+    assert board.getHistory() == ["exd6"]
+    assert board2FEN(board) == "r3k2r/pp3ppp/3P4/8/8/8/PPP2PPP/R3K2R b Kq - 0 12"
+
+
+def test_roundTrip():
+    for FENString in ["r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+                      "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+                      "rnbqkbnr/ppp1pppp/8/8/3pP3/8/PPPP1PPP/RNBQKBNR b KQkq e3 0 3"]:
+        roundTrip = FEN2Board(FENString)
+        assert board2FEN(roundTrip) == FENString
+        roundTrip.makeMove(*roundTrip.legalMoves()[0][1:])
+        roundTrip.unmakeMove()
+        assert board2FEN(roundTrip) == FENString
+
+
+def test_invalidFEN():
+    for FENString in ["8/8/8", "rnbqkbnr/pppppppp/9/8/8/8/PPPPPPPP/RNBQKBNR w - - 0 1",
+                      "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR x - - 0 1",
+                      "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w - e3 0 1"]:
+        try:
+            FEN2Board(FENString)
+            raise UnsuccessfulTest
+        except ValueError:
+            pass
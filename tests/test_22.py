@@ -0,0 +1,42 @@
+# test_22.py
+
+from pawnshop.ChessVector import ChessVector
+from pawnshop.ChessBoard import Board, initClassic, init4P
+from pawnshop.Variant import Variant, getVariant
+from pawnshop.configurations import ClassicConfig
+
+
+classic = getVariant("classic")
+fourPlayer = getVariant("fourplayer")
+
+
+def test_getVariant():
+    assert getVariant("classic") is classic
+    assert classic.colors == ("black", "white") and classic.turnorder == ("white", "black")
+    assert fourPlayer.rows == fourPlayer.cols == 14 and len(fourPlayer.disabled) == 36
+
+    board = Board(classic)
+    assert board == initClassic()
+    assert board.getVariant() is classic and initClassic().getVariant() is classic
+    assert board.getGeometry() is classic.geometry
+    assert Board(ClassicConfig.CONFIG.copy()).getVariant() is None
+
+
+def test_sharedRules():
+    board1, board2 = init4P(), init4P()
+    assert board1.getMoves("red") is board2.getMoves("red") is fourPlayer.moves["red"]
+    assert not set(map(id, board1.iterPieces())) & set(map(id, board2.iterPieces()))
+
+    board1.movePiece(ChessVector("g2", board1), ChessVector("g4", board1), printout=False)
+    assert board2[ChessVector("g2", board2)].firstMove
+
+    board1.removeColor("blue")
+    assert "blue" not in board1.getTurnorder() and "blue" in board2.getTurnorder()
+    assert "blue" in fourPlayer.moves and "blue" in fourPlayer.turnorder
+
+
+def test_newVariant():
+    variant = Variant(ClassicConfig.CONFIG, "copy")
+    assert repr(variant) == "Variant(copy, 8x8, 2 colors)"
+    assert Board(variant) == Board(classic)
+    assert Board(variant).getGeometry() is classic.geometry
@@ -0,0 +1,85 @@
+# test_23.py
+
+import random
+
+from pawnshop.ChessVector import ChessVector
+from pawnshop.ChessBoard import initClassic
+from pawnshop.GameNotations import FEN2Board
+from pawnshop.Pieces import Queen
+
+
+def vec(board, position: str) -> ChessVector:
+    return ChessVector(position, board)
+
+
+def assertMaps(board):
+    """Compare the incremental attack maps of board with maps built from scratch"""
+    board.isThreatened(vec(board, "a1"), None)
+    attacks = {color: list(counts) for color, counts in board._attacks.items() if any(counts)}
+    attackers = [set(pieces) for pieces in board._attackers]
+    board._buildAttacks()
+    assert {color: counts for color, counts in board._attacks.items() if any(counts)} == attacks
+    assert board._attackers == attackers
+
+
+def makeAndUnmake(board, start: str, target: str, promote=None):
+    assertMaps(board)
+    board.makeMove(vec(board, start), vec(board, target), promote=promote)
+    assertMaps(board)
+    board.unmakeMove()
+    assertMaps(board)
+
+
+def test_specialMoves():
+    castling = FEN2Board("r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1")
+    makeAndUnmake(castling, "e1", "g1")
+    makeAndUnmake(castling, "e1", "c1")
+
+    enPassant = FEN2Board("4k3/8/8/3pP3/8/8/8/4K3 w - d6 0 1")
+    makeAndUnmake(enPassant, "e5", "d6")
+
+    promotion = FEN2Board("1n2k3/P7/8/8/8/8/8/4K3 w - - 0 1")
+    makeAndUnmake(promotion, "a7", "b8", promote=Queen)
+    makeAndUnmake(promotion, "a7", "a8", promote=Queen)
+
+    capture = FEN2Board("4k3/8/8/3q4/8/8/3R4/4K3 w - - 0 1")
+    makeAndUnmake(capture, "d2", "d5")
+
+
+def test_randomGame():
+    random.seed(7)
+    board = initClassic()
+    for _ in range(120):
+        moves = board.legalMoves()
+        if not moves:
+            break
+        _, startVec, targetVec, promote = random.choice(moves)
+        board.makeMove(startVec, targetVec, promote=promote)
+        assertMaps(board)
+    while board._undoStack:
+        board.unmakeMove()
+    assertMaps(board)
+    assert board == initClassic()
+
+
+def test_getAttackers():
+    board = initClassic()
+    assert sorted(p.vector.getStr(board) for p in board.getAttackers(vec(board, "f3"))) == ["e2", "g1", "g2"]
+    assert board.getAttackers(vec(board, "e4")) == []
+
+    # Pawn pushes do not threaten
+    assert board.isThreatened(vec(board, "d3"), "black")
+    assert not board.isThreatened(vec(board, "e4"), "black")
+    assert not board.isThreatened(vec(board, "e5"), "white")
+
+
+def test_castlingBothKings():
+    board = FEN2Board("r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1")
+    assert {m[2].getStr(board) for m in board.legalMoves() if m[1] == vec(board, "e1")} >= {"c1", "g1"}
+    board.makeMove(vec(board, "e1"), vec(board, "g1"))
+    blackKing = {m[2].getStr(board) for m in board.legalMoves() if m[1] == vec(board, "e8")}
+
+    # The rook on f1 guards f8, so black may only castle queenside
+    assert "c8" in blackKing and "g8" not in blackKing
+    assert board.isThreatened(vec(board, "f8"), "black")
+    assertMaps(board)
@@ -0,0 +1,63 @@
+# test_3.py
+
+from pawnshop.ChessVector import ChessVector
+from pawnshop.ChessBoard import initClassic
+from pawnshop.Pieces import Queen, Pawn
+
+
+board = initClassic()
+
+
+def move(start, target, **kwargs):
+    board.movePiece(ChessVector(start, board), ChessVector(target, board), printout=False, **kwargs)
+
+
+def snapshot():
+    return [(str(p), getattr(p, "firstMove", None), getattr(p, "passed", None), getattr(p, "rank", None)) for p in board], board.currentTurn
+
+
+def test_unmake():
+    for m in [("e2", "e4"), ("d7", "d5"), ("e4", "d5"), ("c7", "c5")]:
+        move(*m)
+
+    before = snapshot()
+    for piece in list(board.iterPieces(board.currentTurn)):
+        for dest in piece.getMoves(board):
+            board.makeMove(piece.vector, dest, promote=Queen)
+            board.unmakeMove()
+            assert snapshot() == before
+
+    record = board.makeMove(ChessVector("d5", board), ChessVector("c6", board))
+    assert isinstance(record.captured, Pawn)
+    assert board.isEmpty(ChessVector("c5", board))
+    board.unmakeMove()
+    assert snapshot() == before
+
+
+def test_promotion():
+    for m in [("d5", "c6"), ("g8", "f6"), ("c6", "b7"), ("e8", "d7")]:
+        move(*m)
+
+    before = snapshot()
+    board.makeMove(ChessVector("b7", board), ChessVector("a8", board), promote=Queen)
+    assert isinstance(board[ChessVector("a8", board)], Queen)
+    board.unmakeMove()
+    assert snapshot() == before
+
+
+def test_hash():
+    board1, board2 = initClassic(), initClassic()
+    assert board1 == board2 and len({board1, board2}) == 1
+
+    for start, target in [("g1", "f3"), ("g8", "f6"), ("f3", "g1")]:
+        board2.movePiece(ChessVector(start, board2), ChessVector(target, board2), printout=False)
+        assert board1 != board2
+
+    before = hash(board2)
+    board2.makeMove(ChessVector("e7", board2), ChessVector("e5", board2))
+    assert hash(board2) != before
+    board2.unmakeMove()
+    assert hash(board2) == before
+
+    board2.movePiece(ChessVector("f6", board2), ChessVector("g8", board2), printout=False)
+    assert board1 == board2 and hash(board1) == hash(board2)
@@ -0,0 +1,44 @@
+# test_4.py
+
+from pawnshop.ChessBoard import initClassic, init4P
+from pawnshop.ChessVector import ChessVector
+
+
+boards = [initClassic(), initClassic(bitboards=True)]
+
+
+def standardMoves(board):
+    return sorted((p.vector.tuple(), v.tuple()) for p in board.iterPieces() for v in p.getStandardMoves(board))
+
+
+def test_bitboards():
+    movelist = [
+        ("e2", "e4"),
+        ("d7", "d5"),
+        ("e4", "d5"),
+        ("g8", "f6"),
+        ("f1", "b5"),
+        ("c7", "c6"),
+        ("d5", "c6"),
+        ("d8", "d2")
+    ]
+    for start, target in movelist:
+        for board in boards:
+            board.movePiece(ChessVector(start, board), ChessVector(target, board), printout=False)
+        assert standardMoves(boards[0]) == standardMoves(boards[1])
+
+
+def test_bitboards4P():
+    fourPlayer = [init4P(), init4P(bitboards=True)]
+    movelist = [
+        ("h2", "h4"),
+        ("b7", "d7"),
+        ("g13", "g11"),
+        ("m8", "k8"),
+        ("i1", "e5"),
+        ("a5", "c4")
+    ]
+    for start, target in movelist:
+        for board in fourPlayer:
+            board.movePiece(ChessVector(start, board), ChessVector(target, board), printout=False)
+        assert standardMoves(fourPlayer[0]) == standardMoves(fourPlayer[1])
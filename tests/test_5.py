@@ -0,0 +1,31 @@
+# test_5.py
+
+from pawnshop.ChessBoard import initClassic, init4P
+from pawnshop.GameNotations import board2FEN
+from pawnshop.perft import perft, divide, POSITIONS
+
+
+def test_perft():
+    board = initClassic()
+    before = hash(board)
+    for depth in (1, 2):
+        assert perft(board, depth) == POSITIONS["classic"]["counts"][depth - 1]
+    assert hash(board) == before
+
+
+def test_perft4P():
+    board = init4P(bitboards=True)
+    assert sum(divide(board, 2).values()) == POSITIONS["fourplayer"]["counts"][1]
+
+
+def test_FENPositions():
+    for position in ("kiwipete", "position3", "position4", "position5"):
+        board = POSITIONS[position]["init"](bitboards=position == "kiwipete")
+        assert board2FEN(board) == POSITIONS[position]["fen"]
+        for depth in (1, 2):
+            assert perft(board, depth) == POSITIONS[position]["counts"][depth - 1]
+
+
+def test_table():
+    board = initClassic()
+    assert perft(board, 3, table={}) == POSITIONS["classic"]["counts"][2]
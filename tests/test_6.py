@@ -0,0 +1,70 @@
+# test_6.py
+
+from pawnshop.ChessVector import ChessVector
+from pawnshop.ChessBoard import initClassic
+from pawnshop.Moves import Standard
+
+
+board = initClassic()
+
+
+def move(start, target, **kwargs):
+    return board.movePiece(ChessVector(start, board), ChessVector(target, board), printout=False, **kwargs)
+
+
+def simulated(color):
+    moveList = []
+    for piece in list(board.iterPieces(color)):
+        for dest in piece.getMoves(board, ignoreMate=True):
+            if Standard.promotes(piece, dest, board):
+                moveList.extend((piece.vector.tuple(), dest.tuple(), p) for p in board.getPromoteTo(color))
+            else:
+                moveList.append((piece.vector.tuple(), dest.tuple(), None))
+    return sorted(moveList, key=str)
+
+
+def legal(color):
+    return sorted(((s.tuple(), t.tuple(), p) for _, s, t, p in board.legalMoves(color)), key=str)
+
+
+def test_legalMoves():
+    movelist = [
+        ("e2", "e4"),
+        ("e7", "e5"),
+        ("g1", "f3"),
+        ("d7", "d6"),
+        ("f1", "b5"),
+        ("b8", "c6"),
+        ("b1", "c3")
+    ]
+    for m in movelist:
+        move(*m)
+        for color in board.getColors():
+            assert legal(color) == simulated(color)
+
+    pinned = board[ChessVector("c6", board)]
+    assert not any(piece is pinned for piece, *_ in board.legalMoves("black"))
+
+
+def test_notation():
+    global board
+    board = initClassic()
+    for m in [("a2", "a4"), ("h7", "h6"), ("h2", "h4"), ("h6", "h5"), ("a1", "a3"), ("a7", "a6"), ("h1", "h3"), ("a6", "a5")]:
+        move(*m)
+    assert move("a3", "e3") == "Rae3"
+
+
+def test_evasions():
+    global board
+    board = initClassic()
+    for m in [("e2", "e4"), ("f7", "f6"), ("d2", "d4"), ("g7", "g5"), ("d1", "h5")]:
+        move(*m)
+    assert board.getCheckmates("black")
+    assert not list(board.iterEvasions("black"))
+
+    board = initClassic()
+    for m in [("e2", "e4"), ("e7", "e5"), ("f1", "c4"), ("d7", "d6"), ("c4", "f7")]:
+        move(*m)
+    evasions = sorted((s.tuple(), t.tuple()) for _, s, t, _ in board.iterEvasions("black"))
+    assert evasions == sorted((s.tuple(), t.tuple()) for _, s, t, _ in board.legalMoves("black"))
+    assert evasions == [((0, 4), (1, 3)), ((0, 4), (1, 4)), ((0, 4), (1, 5))]
@@ -0,0 +1,45 @@
+# test_7.py
+
+import pickle
+from copy import deepcopy
+from pawnshop import ChessVector as ChessVectorModule
+from pawnshop.ChessVector import ChessVector, POOLBOUND
+from pawnshop.ChessBoard import initClassic
+
+
+board = initClassic()
+
+
+class UnsuccessfulTest(Exception):
+    pass
+
+
+def test_interned():
+    vec = ChessVector("e4", board)
+    assert vec is ChessVector((4, 4))
+    assert vec + ChessVector((1, 0)) is ChessVector("e3", board)
+    assert vec.copy() is vec
+    assert deepcopy(vec) is vec
+    assert pickle.loads(pickle.dumps(vec)) is vec
+    assert vec.matches({ChessVector((4, 4))})
+    assert not vec.matches([ChessVector((4, 5))])
+
+
+def test_immutable():
+    vec = ChessVector((0, 0))
+    try:
+        vec.row = 1
+        raise UnsuccessfulTest
+    except AttributeError:
+        pass
+    assert len({vec, ChessVector((0, 0)), ChessVector((0, 1))}) == 2
+
+
+def test_poolBound():
+    ChessVector((POOLBOUND - 1, 0))
+    size = len(ChessVectorModule._pool)
+    far = ChessVector((POOLBOUND * 10, 3)) + ChessVector((1, 1))
+    assert far == ChessVector((POOLBOUND * 10 + 1, 4)) and far != ChessVector((1, 4))
+    assert ChessVector((POOLBOUND * 10 + 1, 4)) in {far}
+    assert len(ChessVectorModule._pool) == size
+    assert ChessVector((POOLBOUND - 1, 0)) is ChessVector((POOLBOUND - 1, 0))
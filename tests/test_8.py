@@ -0,0 +1,39 @@
+# test_8.py
+
+from pawnshop.ChessBoard import init4P
+from pawnshop.ChessVector import ChessVector
+from pawnshop.Utils import toAlpha, fromAlpha
+
+
+board = init4P()
+
+
+def test_tables():
+    geometry = board.getGeometry()
+    assert geometry is init4P().getGeometry()
+
+    corner = geometry.toSquare(ChessVector("d4", board))
+    knight = [vec.getStr(board) for vec in geometry.knightTargets[corner]]
+    assert sorted(knight) == ["b5", "c6", "e2", "e6", "f3", "f5"]
+
+    ray = geometry.rayTargets[ChessVector((1, 1))][geometry.toSquare(ChessVector("a11", board))]
+    assert [vec.getStr(board) for vec in ray] == ["b10", "c9", "d8", "e7", "f6", "g5", "h4", "i3", "j2", "k1"]
+
+    assert not geometry.knightTargets[geometry.toSquare(ChessVector((0, 0)))]
+    assert len(geometry.kingTargets[geometry.toSquare(ChessVector("d4", board))]) == 7
+
+
+def test_squareNames():
+    geometry = board.getGeometry()
+    for sq, name in enumerate(geometry.squareNames):
+        vec = geometry.toVector(sq)
+        assert vec.getStr(board) == name
+        assert ChessVector(name.upper(), board) is vec
+    assert ChessVector("aa1", board) is ChessVector((13, 26))
+    assert ChessVector((13, 26)).getStr(board) == "aa1"
+
+
+def test_alpha():
+    for num, alpha in [(0, "a"), (25, "z"), (26, "aa"), (701, "zz"), (702, "aaa")]:
+        assert toAlpha(num) == alpha and fromAlpha(alpha) == num
+    assert fromAlpha("zzzzzzzzzzzz") == 99246114928149461
@@ -0,0 +1,48 @@
+# test_9.py
+
+from pawnshop.ChessVector import ChessVector
+from pawnshop.ChessBoard import initClassic, init4P
+from pawnshop.Compact import CompactBoard
+from pawnshop.GameNotations import FEN2Board, board2FEN
+
+
+board = initClassic()
+
+
+def move(start, target, **kwargs):
+    board.movePiece(ChessVector(start, board), ChessVector(target, board), printout=False, **kwargs)
+
+
+def state(b):
+    return [(str(p), p.vector.tuple(), getattr(p, "firstMove", None), getattr(p, "passed", None), getattr(p, "rank", None)) for p in b]
+
+
+def test_compact():
+    for m in [("e2", "e4"), ("g8", "f6"), ("e4", "e5"), ("d7", "d5")]:
+        move(*m)
+
+    compact = CompactBoard(board)
+    pawn = compact[ChessVector("d5", board)]
+    assert (pawn.color, pawn.symbol, pawn.passed, pawn.rank) == ("black", "P", True, 4)
+    assert compact[ChessVector("d4", board)] is None
+    assert len(list(compact.iterPieces("white"))) == 16
+
+    restored = compact.toBoard()
+    assert state(restored) == state(board)
+    assert hash(restored) == hash(board)
+    assert restored.getHistory() == board.getHistory()
+    assert compact.getClocks() == restored.getClocks() == board.getClocks() == (0, 3)
+    assert CompactBoard(restored) == compact
+
+    restored.movePiece(ChessVector("e5", board), ChessVector("d6", board), printout=False)
+    assert restored.isEmpty(ChessVector("d5", board))
+
+    midgame = FEN2Board("r3k2r/8/8/8/8/8/8/R3K2R b KQkq - 17 42")
+    assert board2FEN(CompactBoard(midgame).toBoard()) == "r3k2r/8/8/8/8/8/8/R3K2R b KQkq - 17 42"
+
+
+def test_compact4P():
+    fourPlayer = init4P()
+    restored = CompactBoard(fourPlayer).toBoard()
+    assert state(restored) == state(fourPlayer)
+    assert restored.getTurnorder() == fourPlayer.getTurnorder()